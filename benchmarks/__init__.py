@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Sudoku solver.
+Run each one as a module from the repository root, e.g.:
+
+    python -m benchmarks.candidates
+"""
@@ -0,0 +1,81 @@
+"""
+Benchmark of branching in the search - deepcopy vs. SudokuBoard.copy vs. SudokuGrid.branch.
+
+For an analyzed demo board, times creating every child board, and measures the
+objects and bytes newly allocated for each child (memory shared with the parent
+board is not counted).
+
+    python -m benchmarks.branching [board number] [repeat]
+"""
+
+import gc
+import sys
+from copy import deepcopy
+from timeit import default_timer
+
+from sudoku.board import SudokuBoard
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+
+
+def _reachable(obj):
+    """
+    Returns a dict of id -> object for all objects reachable from obj, except classes.
+    """
+    seen = {}
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen[id(obj)] = obj
+        stack.extend(gc.get_referents(obj))
+    return seen
+
+
+def allocation(child, parent):
+    """
+    Returns the number of objects and bytes reachable from child but not from parent.
+    """
+    shared = _reachable(parent)
+    new_objects = [obj for obj_id, obj in _reachable(child).iteritems() if obj_id not in shared]
+    return len(new_objects), sum(sys.getsizeof(obj) for obj in new_objects)
+
+
+def _deepcopy_branch(board, position, number):
+    block_num, cell_num = position
+    board_copy = deepcopy(board)
+    board_copy.set_number((block_num, cell_num), number)
+    return board_copy
+
+
+def main(board_num=3, repeat=20):
+    brdstring = DEMO_BOARDS[board_num].split('\n')
+    board = SudokuBoard()
+    board.populate_from_brdstring(brdstring)
+    board.analyze()
+    grid = SudokuGrid()
+    grid.populate_from_brdstring(brdstring)
+    grid.analyze()
+
+    methods = [
+        ('deepcopy', board, _deepcopy_branch),
+        ('SudokuBoard.copy', board, SudokuBoard.branch),
+        ('SudokuGrid.branch', grid, SudokuGrid.branch),
+    ]
+    print 'Board {}: {} moves'.format(board_num, len(board.moves()))
+    print '{:>18} {:>14} {:>10} {:>10}'.format('method', 'us per child', 'objects', 'bytes')
+    for name, parent, branch in methods:
+        moves = parent.moves()
+        start = default_timer()
+        for __ in range(repeat):
+            for position, number in moves:
+                branch(parent, position, number)
+        elapsed = (default_timer() - start) / (repeat * len(moves))
+        position, number = moves[0]
+        objects, size = allocation(branch(parent, position, number), parent)
+        print '{:>18} {:>14.1f} {:>10} {:>10}'.format(name, elapsed * 1e6, objects, size)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,76 @@
+"""
+Benchmark of the possibles engines - list-based SudokuCell vs. BitmaskCell.
+
+Times the cell operations used by set_possibles() and set_obvious() - elimination,
+counting and single detection - then a full analyze() of each demo board with each cell class.
+
+    python -m benchmarks.candidates [repeat]
+"""
+
+import sys
+from timeit import default_timer
+
+from sudoku.board import SudokuBoard, InvalidBoard
+from sudoku.cell import SudokuCell, BitmaskCell
+from sudoku.puzzles import DEMO_BOARDS
+
+
+def time_analyze(brdstring, cell_class, repeat):
+    """
+    Returns the best time taken to load and analyze a board over a number of runs.
+    """
+    best = None
+    for __ in range(repeat):
+        start = default_timer()
+        board = SudokuBoard(cell_class=cell_class)
+        board.populate_from_brdstring(brdstring.split('\n'))
+        try:
+            board.analyze()
+        except InvalidBoard:
+            pass
+        elapsed = default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def time_cell_ops(cell_class, repeat):
+    """
+    Returns the time taken to eliminate numbers from a fresh cell down to a single,
+    counting the possibles and checking for a single after each elimination.
+    """
+    start = default_timer()
+    for __ in range(repeat):
+        cell = cell_class()
+        for number in range(1, 9):
+            cell.eliminate_possibles(frozenset([number]))
+            if len(cell.possibles) == 1:
+                cell.number = cell.possibles[0]
+    return default_timer() - start
+
+
+def main(repeat=20):
+    list_time = time_cell_ops(SudokuCell, repeat * 1000)
+    mask_time = time_cell_ops(BitmaskCell, repeat * 1000)
+    print 'Cell operations ({} cells):'.format(repeat * 1000)
+    print '{:>12} {:>12} {:>8}'.format('list (ms)', 'bitmask (ms)', 'speedup')
+    print '{:>12.3f} {:>12.3f} {:>7.2f}x'.format(list_time * 1000, mask_time * 1000, list_time / mask_time)
+    print
+    print 'Board analyze():'
+    print '{:>5} {:>12} {:>12} {:>8}'.format('board', 'list (ms)', 'bitmask (ms)', 'speedup')
+    totals = [0.0, 0.0]
+    for board_num, brdstring in enumerate(DEMO_BOARDS):
+        list_time = time_analyze(brdstring, SudokuCell, repeat)
+        mask_time = time_analyze(brdstring, BitmaskCell, repeat)
+        totals[0] += list_time
+        totals[1] += mask_time
+        print '{:>5} {:>12.3f} {:>12.3f} {:>7.2f}x'.format(
+            board_num, list_time * 1000, mask_time * 1000, list_time / mask_time
+        )
+    print '{:>5} {:>12.3f} {:>12.3f} {:>7.2f}x'.format(
+        'total', totals[0] * 1000, totals[1] * 1000, totals[0] / totals[1]
+    )
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
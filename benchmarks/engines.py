@@ -0,0 +1,47 @@
+"""
+Benchmark of the solving engines - search nodes and time per demo board for each engine.
+Nodes are not comparable between engines: the search engine counts boards analyzed,
+Dancing Links counts candidates selected.
+
+    python -m benchmarks.engines [repeat]
+"""
+
+import sys
+
+from sudoku.engines import ENGINES, make_solver
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+
+
+def time_engine(engine, board, repeat):
+    """
+    Returns the node count and the best time taken to solve a board over a number of runs.
+    """
+    best = None
+    for __ in range(repeat):
+        result = make_solver(engine).solve(board)
+        if best is None or result.elapsed < best.elapsed:
+            best = result
+    return best.nodes, best.elapsed
+
+
+def main(repeat=5):
+    engines = sorted(ENGINES)
+    print '{:>5}'.format('board') + ''.join(
+        ' {:>12} {:>10}'.format(engine + ' nodes', engine + ' ms') for engine in engines
+    )
+    totals = dict((engine, 0.0) for engine in engines)
+    for board_num, brdstring in enumerate(DEMO_BOARDS):
+        board = SudokuGrid()
+        board.populate_from_brdstring(brdstring.split('\n'))
+        line = '{:>5}'.format(board_num)
+        for engine in engines:
+            nodes, elapsed = time_engine(engine, board, repeat)
+            totals[engine] += elapsed
+            line += ' {:>12} {:>10.2f}'.format(nodes, elapsed * 1000)
+        print line
+    print '{:>5}'.format('total') + ''.join(' {:>12} {:>10.2f}'.format('', totals[engine] * 1000) for engine in engines)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
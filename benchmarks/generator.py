@@ -0,0 +1,58 @@
+"""
+Benchmark of the puzzle generator - puzzles per second for each uniqueness engine and
+clue target, and for a pool of worker processes.
+
+    python -m benchmarks.generator [count] [workers]
+"""
+
+import multiprocessing
+import random
+import sys
+from timeit import default_timer
+
+from sudoku.generator import generate, random_solution, remove_clues
+
+
+def time_generate(count, workers=1, **options):
+    """
+    Returns the puzzles per second and the mean clue count of a seeded run.
+    """
+    start = default_timer()
+    puzzles = list(generate(count, seed=1, workers=workers, **options))
+    elapsed = default_timer() - start
+    return count / elapsed, sum(81 - puzzle.count('.') for puzzle in puzzles) / float(count)
+
+
+def time_steps(count):
+    """
+    Returns the time to make count solved boards, and to empty their cells.
+    """
+    rng = random.Random(1)
+    start = default_timer()
+    solutions = [random_solution(rng) for __ in range(count)]
+    solution_time = default_timer() - start
+    start = default_timer()
+    for solution in solutions:
+        remove_clues(solution, rng=rng)
+    return solution_time, default_timer() - start
+
+
+def main(count=50, workers=None):
+    workers = workers or multiprocessing.cpu_count()
+    solution_time, removal_time = time_steps(count)
+    print 'Per puzzle: {:.2f} ms for the solved board, {:.2f} ms emptying cells'.format(
+        solution_time * 1000 / count, removal_time * 1000 / count
+    )
+    print
+    print '{:>8} {:>7} {:>8} {:>12} {:>6}'.format('engine', 'clues', 'workers', 'puzzles/s', 'clues')
+    for engine in ('dlx', 'search'):
+        for clues in (None, 30, 25):
+            rate, mean_clues = time_generate(count, clues=clues, engine=engine)
+            print '{:>8} {:>7} {:>8} {:>12.1f} {:>6.1f}'.format(engine, clues or 'min', 1, rate, mean_clues)
+    if workers > 1:
+        rate, mean_clues = time_generate(count * workers, workers=workers)
+        print '{:>8} {:>7} {:>8} {:>12.1f} {:>6.1f}'.format('dlx', 'min', workers, rate, mean_clues)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,64 @@
+"""
+Benchmark of nogood learning in the search - nodes, time and branches pruned per board,
+without and with a NogoodStore, on the demo boards of solver.py and boards which are hard
+for the search engine. Each board is searched both as a SudokuGrid and as a SudokuBoard,
+and the times are the best of repeat runs.
+
+    python -m benchmarks.nogoods [capacity] [repeat]
+
+Learning prunes about 8-9% of the nodes of the hard boards, but the time saved is small
+next to the cost of finding the nogoods: measured gains are modest and only on the board
+with no solution, and the other boards run about as fast or slower with learning - the
+SudokuGrid searches of the hard board and the small demo boards noticeably slower.
+"""
+
+import sys
+
+from sudoku.cache import NogoodStore
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS, HARD_BOARDS
+from sudoku.solver import Solver
+
+
+def boards():
+    """
+    Returns the benchmark boards as (name, SudokuGrid) pairs.
+    """
+    named = []
+    for board_num, brdstring in enumerate(DEMO_BOARDS):
+        grid = SudokuGrid()
+        grid.populate_from_brdstring(brdstring.split('\n'))
+        named.append(('demo {}'.format(board_num), grid))
+    named.extend((name, SudokuGrid.from_string(puzzle)) for name, puzzle in HARD_BOARDS)
+    return named
+
+
+def best_of(repeat, capacity, start):
+    """
+    Searches a board repeat times, with a fresh NogoodStore each time if a capacity is passed.
+    Returns the last SolveResult, Solver and NogoodStore, and the least elapsed time.
+    """
+    elapsed = []
+    for __ in range(repeat):
+        nogoods = None if capacity is None else NogoodStore(capacity)
+        solver = Solver(nogoods=nogoods)
+        result = solver.solve(start)
+        elapsed.append(result.elapsed)
+    return result, solver, nogoods, min(elapsed)
+
+
+def main(capacity=10000, repeat=3):
+    print '{:>12} {:>6} {:>8} {:>10} {:>12} {:>10} {:>8} {:>8} {:>10}'.format(
+        'board', 'type', 'nodes', 'ms', 'learn nodes', 'learn ms', 'learned', 'pruned', 'evictions'
+    )
+    for name, grid in boards():
+        for board_type, start in (('grid', grid), ('board', grid.to_board())):
+            plain, __, __, plain_elapsed = best_of(repeat, None, start)
+            learning, solver, nogoods, learning_elapsed = best_of(repeat, capacity, start)
+            print '{:>12} {:>6} {:>8} {:>10.1f} {:>12} {:>10.1f} {:>8} {:>8} {:>10}'.format(
+                name, board_type, plain.nodes, plain_elapsed * 1000, learning.nodes, learning_elapsed * 1000,
+                nogoods.learned, solver.pruned, nogoods.evictions
+            )
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
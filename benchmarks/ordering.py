@@ -0,0 +1,37 @@
+"""
+Benchmark of the branching strategies - search nodes and time per demo board.
+
+    python -m benchmarks.ordering
+"""
+
+from timeit import default_timer
+
+import solver
+from sudoku.grid import SudokuGrid
+from sudoku.ordering import block_order, min_remaining
+from sudoku.puzzles import DEMO_BOARDS
+
+
+def run(brdstring, ordering):
+    """
+    Solves a board and returns the node count, whether it was solved, and the time taken.
+    """
+    board = SudokuGrid()
+    board.populate_from_brdstring(brdstring.split('\n'))
+    start = default_timer()
+    __, solved, __, count = solver.solve_board(board, False, set(), 0, ordering)
+    return count, solved, default_timer() - start
+
+
+def main():
+    solver.DEBUG_PRINT = False
+    strategies = [('block order', block_order), ('min remaining', min_remaining)]
+    print '{:>5} {:>15} {:>8} {:>7} {:>10}'.format('board', 'strategy', 'nodes', 'solved', 'time (ms)')
+    for board_num, brdstring in enumerate(DEMO_BOARDS):
+        for name, ordering in strategies:
+            count, solved, elapsed = run(brdstring, ordering)
+            print '{:>5} {:>15} {:>8} {:>7} {:>10.1f}'.format(board_num, name, count, str(solved), elapsed * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark of splitting the search of one board across worker processes - time and nodes
+of the serial search and of ParallelSolver with a growing number of workers, on the
+near-empty demo boards and boards which are hard for the search engine.
+
+    python -m benchmarks.parallel [max workers]
+"""
+
+import multiprocessing
+import sys
+
+from sudoku.engines import make_solver
+from sudoku.grid import SudokuGrid
+from sudoku.parallel import ParallelSolver
+from sudoku.puzzles import DEMO_BOARDS, HARD_BOARDS
+
+
+def boards():
+    """
+    Returns the benchmark boards as (name, SudokuGrid) pairs.
+    """
+    named = []
+    for board_num in (4, 5):
+        grid = SudokuGrid()
+        grid.populate_from_brdstring(DEMO_BOARDS[board_num].split('\n'))
+        named.append(('demo {}'.format(board_num), grid))
+    named.extend((name, SudokuGrid.from_string(puzzle)) for name, puzzle in HARD_BOARDS)
+    return named
+
+
+def main(max_workers=None):
+    max_workers = max_workers or multiprocessing.cpu_count()
+    worker_counts = sorted(set([1, 2, max_workers]))
+    print '{:>12} {:>16}'.format('board', 'serial ms/nodes') + ''.join(
+        ' {:>16}'.format('{} workers'.format(workers)) for workers in worker_counts
+    )
+    for name, grid in boards():
+        result = make_solver('search').solve(grid)
+        line = '{:>12} {:>9.1f}/{:<6}'.format(name, result.elapsed * 1000, result.nodes)
+        for workers in worker_counts:
+            result = ParallelSolver(workers).solve(grid)
+            line += ' {:>9.1f}/{:<6}'.format(result.elapsed * 1000, result.nodes)
+        print line
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,32 @@
+"""
+Benchmark of the deduction pipeline - search nodes and time per demo board with the
+default analyze() rules and with the pipeline, followed by the pipeline's per-rule counters.
+
+    python -m benchmarks.rules
+"""
+
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.rules import DeductionPipeline
+from sudoku.solver import Solver
+
+
+def main():
+    pipeline = DeductionPipeline()
+    print '{:>5} {:>12} {:>10} {:>12} {:>10}'.format('board', 'basic nodes', 'basic ms', 'rules nodes', 'rules ms')
+    for board_num, brdstring in enumerate(DEMO_BOARDS):
+        board = SudokuGrid()
+        board.populate_from_brdstring(brdstring.split('\n'))
+        basic = Solver().solve(board)
+        deduced = Solver(pipeline=pipeline).solve(board)
+        print '{:>5} {:>12} {:>10.1f} {:>12} {:>10.1f}'.format(
+            board_num, basic.nodes, basic.elapsed * 1000, deduced.nodes, deduced.elapsed * 1000
+        )
+    print
+    print '{:>20} {:>8} {:>13} {:>10}'.format('rule', 'calls', 'eliminations', 'ms')
+    for name, calls, eliminations, elapsed in pipeline.stats():
+        print '{:>20} {:>8} {:>13} {:>10.1f}'.format(name, calls, eliminations, elapsed * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark of an interactive solving session - microseconds per call of each operation,
+against copying and analyzing the board after every move.
+
+    python -m benchmarks.session [repeats]
+"""
+
+import sys
+import timeit
+
+from sudoku.board import SudokuBoard
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.session import SolvingSession
+
+
+def time_call(function, repeats):
+    """
+    Returns the microseconds per call of a function.
+    """
+    return timeit.timeit(function, number=repeats) * 1e6 / repeats
+
+
+def main(repeats=20000):
+    board = SudokuBoard()
+    board.populate_from_brdstring(DEMO_BOARDS[3].split('\n'))
+    session = SolvingSession(board)
+    index = min(index for index in range(81) if not session.cells[index])
+    number = session.candidates(index)[0]
+
+    def place_undo():
+        session.place(index, number)
+        session.undo()
+
+    print '{:>22} {:>10}'.format('operation', 'us/call')
+    for name, function in [
+        ('new session', lambda: SolvingSession(board)),
+        ('place + undo', place_undo),
+        ('candidates', lambda: session.candidates(index)),
+        ('is_consistent', session.is_consistent),
+        ('hint', session.hint),
+    ]:
+        print '{:>22} {:>10.2f}'.format(name, time_call(function, repeats))
+    print '{:>22} {:>10.2f}'.format('board copy + analyze', time_call(lambda: board.copy().analyze(), repeats // 100))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,69 @@
+"""
+Benchmark of each board size - 4x4, 9x9, 16x16 and 25x25. Solves shuffled boards
+with clues removed, as SudokuGrids and as SudokuBoards, and reports the boards solved,
+mean search nodes and mean time, with the bytes copied by each SudokuGrid branch.
+
+    python -m benchmarks.sizes [count] [time_limit]
+"""
+
+import random
+import sys
+
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import shuffled_solution
+from sudoku.solver import Solver
+
+# The fraction of cells emptied for each box size - larger boards need more clues
+# for the search to stay practical.
+EMPTIED = {2: 0.6, 3: 0.6, 4: 0.5, 5: 0.4}
+
+
+def make_puzzles(box_size, count, rng):
+    """
+    Returns boards made by emptying cells of shuffled solutions.
+    """
+    puzzles = []
+    for __ in range(count):
+        cells = list(shuffled_solution(box_size, rng))
+        for index in rng.sample(range(len(cells)), int(len(cells) * EMPTIED[box_size])):
+            cells[index] = '.'
+        puzzles.append(''.join(cells))
+    return puzzles
+
+
+def run(boards, time_limit):
+    """
+    Returns the number of boards solved, the mean nodes and the mean time of solving them.
+    """
+    results = [Solver(time_limit=time_limit).solve(board) for board in boards]
+    solved = sum(1 for result in results if result.solved)
+    nodes = sum(result.nodes for result in results) / float(len(results))
+    elapsed = sum(result.elapsed for result in results) / len(results)
+    return solved, nodes, elapsed
+
+
+def main(count=10, time_limit=10.0):
+    rng = random.Random(1234)
+    print '{:>7} {:>7} {:>12} {:>10} {:>10} {:>12} {:>11} {:>10} {:>12}'.format(
+        'size', 'boards', 'grid solved', 'grid nodes', 'grid ms', 'board solved', 'board nodes', 'board ms',
+        'branch bytes'
+    )
+    for box_size in sorted(EMPTIED):
+        puzzles = make_puzzles(box_size, count, rng)
+        grids = [SudokuGrid.from_string(puzzle) for puzzle in puzzles]
+        grid_solved, grid_nodes, grid_elapsed = run(grids, time_limit)
+        board_solved, board_nodes, board_elapsed = run([grid.to_board() for grid in grids], time_limit)
+        grid = grids[0].copy()
+        grid.analyze()
+        branch_bytes = sum(
+            len(values) * values.itemsize for values in (grid.cells, grid.possibles, grid.masks)
+        )
+        size = box_size * box_size
+        print '{:>7} {:>7} {:>12} {:>10.1f} {:>10.2f} {:>12} {:>11.1f} {:>10.2f} {:>12}'.format(
+            '{}x{}'.format(size, size), count, grid_solved, grid_nodes, grid_elapsed * 1000,
+            board_solved, board_nodes, board_elapsed * 1000, branch_bytes
+        )
+
+
+if __name__ == '__main__':
+    main(*[float(arg) if index else int(arg) for index, arg in enumerate(sys.argv[1:])])
@@ -0,0 +1,264 @@
+"""
+Benchmark suite - solves a tiered corpus of boards and reports throughput, latency,
+search nodes and peak memory per tier, optionally comparing against a saved baseline.
+
+The corpus is seeded, so runs with the same options solve the same boards:
+- easy: the first three demo boards, plus solutions with 40-50 cells emptied.
+- hard: the fourth demo board, plus solutions with 56-60 cells emptied.
+- near-empty: the last two demo boards, plus solutions with 68-74 cells emptied.
+
+    python -m benchmarks.suite [--count N] [--engine search|dlx] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.1] [--profile]
+
+Each tier runs in a fresh worker process, so its peak memory is its own - the peak
+resident memory of a process never goes down, so tiers sharing one process would all
+report the largest peak so far.
+
+With --profile, the phases of each tier are profiled - see sudoku.profiling - and
+reported after the results. Profiling slows the search, so don't compare profiled
+runs against a baseline.
+
+With a baseline, each metric which got worse by more than the threshold (a fraction)
+is reported as a regression and the command exits with status 1.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import random
+import sys
+from timeit import default_timer
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from sudoku.engines import ENGINES, DEFAULT_ENGINE, make_solver
+from sudoku.grid import SudokuGrid
+from sudoku.profiling import PhaseProfiler
+from sudoku.puzzles import DEMO_BOARDS, shuffled_solution
+
+FORMAT_VERSION = 1
+
+# Each tier's demo boards and the range of cells emptied in its generated boards.
+TIERS = [
+    ('easy', DEMO_BOARDS[0:3], (40, 50)),
+    ('hard', DEMO_BOARDS[3:4], (56, 60)),
+    ('near-empty', DEMO_BOARDS[4:6], (68, 74)),
+]
+
+# The metrics compared against a baseline, and whether a higher value is better.
+METRICS = [
+    ('puzzles_per_sec', True),
+    ('p50_ms', False),
+    ('p95_ms', False),
+    ('p99_ms', False),
+    ('nodes_mean', False),
+    ('peak_memory_kb', False),
+]
+
+
+def make_tier(demo_boards, emptied, count, rng):
+    """
+    Returns a tier's boards as 81-character strings - its demo boards, then generated
+    boards up to count in all.
+    """
+    puzzles = []
+    for brdstring in demo_boards:
+        grid = SudokuGrid()
+        grid.populate_from_brdstring(brdstring.split('\n'))
+        puzzles.append(grid.to_string())
+    while len(puzzles) < count:
+        cells = list(shuffled_solution(3, rng))
+        for index in rng.sample(range(81), rng.randint(*emptied)):
+            cells[index] = '.'
+        puzzles.append(''.join(cells))
+    return puzzles[:max(count, len(demo_boards))]
+
+
+def percentile(values, fraction):
+    """
+    Returns the nearest-rank percentile of a list of values.
+    """
+    ordered = sorted(values)
+    rank = max(int(math.ceil(fraction * len(ordered))) - 1, 0)
+    return ordered[rank]
+
+
+def peak_memory_kb():
+    """
+    Returns the peak resident memory of this process in kilobytes - or None where unknown.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_tier(puzzles, engine, profiler=None, **options):
+    """
+    Solves a tier's boards one by one and returns its metrics - with the counters
+    of each phase if a PhaseProfiler is passed.
+    """
+    if profiler is not None:
+        profiler.reset()
+        profiler.enable()
+    latencies = []
+    nodes = []
+    solved = exhausted = 0
+    start = default_timer()
+    for puzzle in puzzles:
+        board = SudokuGrid.from_string(puzzle)
+        board_start = default_timer()
+        result = make_solver(engine, **options).solve(board)
+        latencies.append(default_timer() - board_start)
+        nodes.append(result.nodes)
+        solved += result.solved
+        exhausted += result.budget_exhausted
+    elapsed = default_timer() - start
+    metrics = {
+        'puzzles': len(puzzles),
+        'solved': solved,
+        'budget_exhausted': exhausted,
+        'elapsed_sec': elapsed,
+        'puzzles_per_sec': len(puzzles) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'nodes_mean': sum(nodes) / float(len(nodes)),
+        'nodes_max': max(nodes),
+        'peak_memory_kb': peak_memory_kb(),
+    }
+    if profiler is not None:
+        profiler.disable()
+        metrics['phases'] = profiler.summary()
+    return metrics
+
+
+def _run_tier_task(puzzles, engine, profile, options):
+    """
+    Run a tier in a worker process.
+    """
+    return run_tier(puzzles, engine, PhaseProfiler() if profile else None, **options)
+
+
+def run_tier_isolated(puzzles, engine, profile=False, **options):
+    """
+    Runs a tier in a fresh worker process and returns its metrics - see run_tier.
+    The phases are profiled in the worker if profile is set.
+    """
+    pool = multiprocessing.Pool(1)
+    try:
+        return pool.apply(_run_tier_task, (puzzles, engine, profile, options))
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def run_suite(count=50, engine=DEFAULT_ENGINE, seed=1234, profile=False, **options):
+    """
+    Runs every tier, each in a fresh worker process, and returns the results,
+    ready to be saved as JSON.
+    """
+    rng = random.Random(seed)
+    results = {
+        'version': FORMAT_VERSION,
+        'engine': engine,
+        'count': count,
+        'seed': seed,
+        'options': options,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'tiers': {},
+    }
+    for name, demo_boards, emptied in TIERS:
+        puzzles = make_tier(demo_boards, emptied, count, rng)
+        results['tiers'][name] = run_tier_isolated(puzzles, engine, profile, **options)
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Returns the regressions of results against a baseline, as a list of
+    (tier, metric, baseline value, value, relative change) tuples.
+    """
+    regressions = []
+    for tier, metrics in sorted(results['tiers'].items()):
+        base_metrics = baseline.get('tiers', {}).get(tier)
+        if not base_metrics:
+            continue
+        for metric, higher_is_better in METRICS:
+            value = metrics.get(metric)
+            base = base_metrics.get(metric)
+            if not value or not base:
+                continue
+            change = (value - base) / float(base)
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append((tier, metric, base, value, change))
+    return regressions
+
+
+def print_results(results):
+    print '{:>11} {:>7} {:>7} {:>10} {:>9} {:>9} {:>9} {:>10} {:>10}'.format(
+        'tier', 'boards', 'solved', 'boards/s', 'p50 ms', 'p95 ms', 'p99 ms', 'nodes', 'peak KB'
+    )
+    for name, __, __ in TIERS:
+        metrics = results['tiers'][name]
+        print '{:>11} {:>7} {:>7} {:>10.1f} {:>9.2f} {:>9.2f} {:>9.2f} {:>10.1f} {:>10}'.format(
+            name, metrics['puzzles'], metrics['solved'], metrics['puzzles_per_sec'], metrics['p50_ms'],
+            metrics['p95_ms'], metrics['p99_ms'], metrics['nodes_mean'], metrics['peak_memory_kb']
+        )
+    for name, __, __ in TIERS:
+        phases = results['tiers'][name].get('phases')
+        if phases is not None:
+            print
+            print '{} phases:'.format(name)
+            print PhaseProfiler().report(phases)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite over a tiered corpus of boards.")
+    parser.add_argument('--count', type=int, default=50, help="boards per tier")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE, help="solving engine")
+    parser.add_argument('--seed', type=int, default=1234, help="seed of the generated boards")
+    parser.add_argument('--max-nodes', type=int, default=None, help="node budget per board")
+    parser.add_argument('--time-limit', type=float, default=None, help="time budget per board, in seconds")
+    parser.add_argument('--output', help="file to write the results to, as JSON")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="relative change of a metric reported as a regression (default: 0.1)")
+    parser.add_argument('--profile', action='store_true', help="profile the phases of each tier")
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        count=args.count, engine=args.engine, seed=args.seed, profile=args.profile,
+        max_nodes=args.max_nodes, time_limit=args.time_limit
+    )
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(results, outfile, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as infile:
+            baseline = json.load(infile)
+        regressions = compare(results, baseline, args.threshold)
+        print
+        if (baseline.get('engine'), baseline.get('count'), baseline.get('seed')) != \
+                (results['engine'], results['count'], results['seed']):
+            print 'The baseline was run with another engine, count or seed.'
+        if not regressions:
+            print 'No regressions against {}.'.format(args.baseline)
+            return 0
+        print 'Regressions against {}:'.format(args.baseline)
+        for tier, metric, base, value, change in regressions:
+            print '{:>11} {:>16} {:>12.3f} -> {:>12.3f} ({:+.1%})'.format(tier, metric, base, value, change)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Benchmark of the NumPy backend - time to analyze a corpus of boards one by one with
+SudokuGrid.analyze(incremental=False) and all at once with analyze_array(), and
+the time to solve them with and without the vectorized pre-pass.
+
+    python -m benchmarks.vectorized [count]
+"""
+
+import random
+import sys
+from timeit import default_timer
+
+from sudoku.batch import solve_string
+from sudoku.board import InvalidBoard
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.solver import Solver
+from sudoku.vectorized import HAVE_NUMPY
+
+
+def make_corpus(count, seed=1234):
+    """
+    Returns boards made by removing random clues from the solutions of the demo boards.
+    """
+    rng = random.Random(seed)
+    solutions = []
+    for brdstring in DEMO_BOARDS[:4]:
+        grid = SudokuGrid()
+        grid.populate_from_brdstring(brdstring.split('\n'))
+        solutions.append(Solver().solve(grid).board.to_string())
+    corpus = []
+    for __ in range(count):
+        numbers = list(rng.choice(solutions))
+        for index in rng.sample(range(81), rng.randint(45, 60)):
+            numbers[index] = '.'
+        corpus.append(''.join(numbers))
+    return corpus
+
+
+def main(count=2000):
+    if not HAVE_NUMPY:
+        print 'NumPy is not installed.'
+        return
+    from sudoku.vectorized import to_array, analyze_array, solve_vectorized
+
+    corpus = make_corpus(count)
+    start = default_timer()
+    for puzzle in corpus:
+        try:
+            SudokuGrid.from_string(puzzle).analyze(incremental=False)
+        except InvalidBoard:
+            pass
+    per_board = default_timer() - start
+    cells = to_array(corpus)
+    start = default_timer()
+    cells, possibles, dead = analyze_array(cells)
+    vectorized = default_timer() - start
+    unresolved = ((cells == 0).any(axis=1) & ~dead).sum()
+
+    print 'Analyze {} boards ({} left unresolved):'.format(count, unresolved)
+    print '{:>14} {:>16} {:>8}'.format('per board (ms)', 'vectorized (ms)', 'speedup')
+    print '{:>14.1f} {:>16.1f} {:>7.2f}x'.format(per_board * 1000, vectorized * 1000, per_board / vectorized)
+
+    start = default_timer()
+    for puzzle in corpus:
+        solve_string(puzzle)
+    searched = default_timer() - start
+    start = default_timer()
+    for __ in solve_vectorized(corpus):
+        pass
+    prepass = default_timer() - start
+    print
+    print 'Solve {} boards:'.format(count)
+    print '{:>14} {:>16} {:>8}'.format('search (ms)', 'vectorized (ms)', 'speedup')
+    print '{:>14.1f} {:>16.1f} {:>7.2f}x'.format(searched * 1000, prepass * 1000, searched / prepass)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,111 @@
+"""
+Solving many boards at once over a pool of worker processes.
+
+Boards cross the process boundary as 81-character strings (see SudokuGrid.to_string),
+never as pickled board objects.
+"""
+
+import multiprocessing
+import threading
+from collections import namedtuple
+
+from board import SudokuBoard
+from grid import SudokuGrid
+from engines import make_solver
+
+
+# The result of solving one board of a batch:
+# - index: the position of the board in the batch.
+# - puzzle: the board as an 81-character string.
+# - solution: the solved board as an 81-character string, or None if no solution was found.
+# - nodes, elapsed, budget_exhausted: as in SolveResult.
+BatchResult = namedtuple('BatchResult', ['index', 'puzzle', 'solution', 'nodes', 'elapsed', 'budget_exhausted'])
+
+
+def to_string(board):
+    """
+    Returns an 81-character string for a board string, SudokuGrid or SudokuBoard.
+    """
+    if isinstance(board, basestring):
+        return board
+    if isinstance(board, SudokuBoard):
+        board = SudokuGrid.from_board(board)
+    return board.to_string()
+
+
+def solve_string(puzzle, **options):
+    """
+    Solve a board given as an 81-character string and return a BatchResult with index 0.
+    The options are passed to make_solver() - engine selects the engine, see sudoku.engines.
+    """
+    result = make_solver(**options).solve(SudokuGrid.from_string(puzzle))
+    solution = result.board.to_string() if result.solved else None
+    return BatchResult(0, puzzle, solution, result.nodes, result.elapsed, result.budget_exhausted)
+
+
+# The make_solver() options of a worker process, set once by _init_worker.
+_worker_options = {}
+
+
+def _init_worker(options):
+    """
+    Keep the make_solver() options of a batch in a worker process.
+    """
+    global _worker_options
+    _worker_options = options
+
+
+def _solve_task(task):
+    """
+    Solve one board in a worker process.
+    """
+    index, puzzle = task
+    return solve_string(puzzle, **_worker_options)._replace(index=index)
+
+
+def _read_ahead(tasks, slots, stopped):
+    """
+    Yields each task once one of the slots is free - a slot is released as each result
+    is taken - until the tasks run out or stopped is set.
+    """
+    for task in tasks:
+        slots.acquire()
+        if stopped.is_set():
+            return
+        yield task
+
+
+def solve_batch(boards, workers=None, chunksize=16, ordered=True, **options):
+    """
+    Solve an iterable of boards (strings, SudokuGrids or SudokuBoards) in a pool of
+    worker processes and return an iterator of BatchResults.
+
+    workers is the number of processes - None for one per CPU. Boards are sent to the
+    workers chunksize at a time, and only a bounded window of boards is read from the
+    iterable ahead of the results, so arbitrarily long streams can be solved. The window
+    slides with each result taken, so the workers are never left waiting for a slow board.
+    With ordered=True, results come in the same order as the boards. Otherwise they
+    come as they complete - use each result's index to match it to its board.
+    The other options are passed to make_solver() in each worker.
+    """
+    window = (workers or multiprocessing.cpu_count()) * chunksize * 4
+    slots = threading.Semaphore(window)
+    stopped = threading.Event()
+    tasks = _read_ahead(((index, to_string(board)) for index, board in enumerate(boards)), slots, stopped)
+    pool = multiprocessing.Pool(workers, _init_worker, (options,))
+    try:
+        if ordered:
+            results = pool.imap(_solve_task, tasks, chunksize)
+        else:
+            results = pool.imap_unordered(_solve_task, tasks, chunksize)
+        for result in results:
+            slots.release()
+            yield result
+        pool.close()
+    finally:
+        # Also stops the workers if the caller stops iterating early - the pool's
+        # task thread may be waiting for a slot, so free one for it to see stopped.
+        stopped.set()
+        slots.release()
+        pool.terminate()
+        pool.join()
@@ -2,7 +2,7 @@
 Representation of a Sudoku 3x3 block.
 """
 
-from cell import SudokuCell, POSSIBLE_NUMBERS, POSSIBLE_SET
+from cell import SudokuCell, POSSIBLE_NUMBERS
 
 
 class SudokuBlock(object):
@@ -11,17 +11,32 @@ class SudokuBlock(object):
     A board is made up of 9 SudokuBlock objects.
     Rows are addressed as 0, 1, 2 for top, middle, and bottom rows respectively.
     Columns are addressed as 0, 1, 2 for left, middle, and right columns respectively.
+
+    Blocks of other sizes have box_size rows and columns, and box_size * box_size cells.
     """
-    __slots__ = ['cells']
+    __slots__ = ['cells', 'box_size']
 
-    def __init__(self, numbers=None):
-        self.cells = [ SudokuCell() for __ in range(9) ]
+    def __init__(self, numbers=None, cell_class=SudokuCell, box_size=3):
+        self.box_size = box_size
+        if box_size == 3:
+            self.cells = [ cell_class() for __ in range(9) ]
+        else:
+            self.cells = [ cell_class(self.possible_numbers) for __ in range(box_size * box_size) ]
         if numbers:
             self.populate(numbers)
 
+    @property
+    def possible_numbers(self):
+        """
+        All the numbers of a block of this size.
+        """
+        if self.box_size == 3:
+            return POSSIBLE_NUMBERS
+        return range(1, self.box_size * self.box_size + 1)
+
     def populate(self, numbers):
         """
-        Takes a list of nine numbers and populates cells.
+        Takes a list of nine numbers (one per cell) and populates cells.
         """
         for i, x in enumerate(numbers):
             if isinstance(x, basestring):
@@ -31,13 +46,22 @@ class SudokuBlock(object):
                     x = None
             self.cells[i].number = x
 
+    def copy(self, changed=None):
+        """
+        Returns a copy of the block and its cells, for a board with the changed flag if passed.
+        """
+        block = SudokuBlock.__new__(SudokuBlock)
+        block.box_size = self.box_size
+        block.cells = [cell.copy(changed) for cell in self.cells]
+        return block
+
     def reset_possibles(self):
         """
         Reset the possible values in each empty cell.
         """
         for cell in self.cells:
             if cell.empty:
-                cell.possibles = POSSIBLE_NUMBERS
+                cell.possibles = self.possible_numbers
             else:
                 cell.possibles = None
 
@@ -46,10 +70,10 @@ class SudokuBlock(object):
         Returns a row of SudokuCells, optionally as numbers.
         """
         cells = []
-        for i in range(3):
-            cells.append(self.cells[row_num * 3 + i])
+        for i in range(self.box_size):
+            cells.append(self.cells[row_num * self.box_size + i])
         if as_numbers:
-            return [x.number for x in cells]
+            return [x._number for x in cells]
         else:
             return cells
 
@@ -58,10 +82,10 @@ class SudokuBlock(object):
         Returns a column of SudokuCells, optionally as numbers.
         """
         cells = []
-        for i in range(3):
-            cells.append(self.cells[col_num + 3 * i])
+        for i in range(self.box_size):
+            cells.append(self.cells[col_num + self.box_size * i])
         if as_numbers:
-            return [x.number for x in cells]
+            return [x._number for x in cells]
         else:
             return cells
 
@@ -69,13 +93,13 @@ class SudokuBlock(object):
         """
         Returns a list of all numbers currently in the block.
         """
-        return [cell.number for cell in self.cells if not cell.empty ]
+        return [cell._number for cell in self.cells if not cell.empty ]
 
     def remaining(self):
         """
         Returns a list of numbers not yet present in block.
         """
-        return sorted(list(POSSIBLE_SET - set(self.numbers())))
+        return sorted(list(set(self.possible_numbers) - set(self.numbers())))
 
     def empty_cells(self):
         """
@@ -100,7 +124,7 @@ class SudokuBlock(object):
 
     def __unicode__(self):
         s = ""
-        for row_num in range(3):
+        for row_num in range(self.box_size):
             row = self.row(row_num, as_numbers=False)
             s += ' '.join([cell.to_string() for cell in row])
             s += '\n'
@@ -34,6 +34,9 @@ The "minor" (cell) index will be sequenced as below:
 3 4 5 | 3 4 5 | 3 4 5
 6 7 8 | 6 7 8 | 6 7 8
 
+Boards of other sizes - 4x4, 16x16 or 25x25 - are made of box_size x box_size blocks
+numbered the same way. See sudoku.layout.
+
 Notes:
 - Don't get lured in to using list of numbers and basic types.
     - Stay with classes and keep algorithms general.
@@ -43,12 +46,14 @@ Notes:
 import os
 import unittest
 import csv
+from array import array
 from itertools import chain
 from collections import defaultdict, Counter
-from copy import deepcopy
 
-from cell import POSSIBLE_NUMBERS
+from cell import SudokuCell
 from block import SudokuBlock
+from layout import get_layout, layout_for_size
+from ordering import min_remaining
 
 
 class InvalidBoard(Exception):
@@ -58,18 +63,73 @@ class BoardParseError(Exception):
     pass
 
 
+def _row_layout(row):
+    """
+    Returns the layout of a board with rows like this one.
+    """
+    try:
+        return layout_for_size(len(row))
+    except ValueError:
+        raise BoardParseError("Row number 0 does not have 4, 9, 16 or 25 values - it has {} values. Row: {}".format(
+            len(row), row
+        ))
+
+
+def _parse_numbers(layout, values, row_num):
+    """
+    Returns the numbers of BRD/CSV values, with None for an empty cell.
+    """
+    numbers = []
+    for value in values:
+        number = layout.parse_number(value)
+        if number is None:
+            raise BoardParseError("Row number {} has an invalid value {!r}.".format(row_num, value))
+        numbers.append(number or None)
+    return numbers
+
+
 class SudokuBoard(object):
     """
     An entire Sudoku board.
     """
-    def __init__(self, block_nums=None):
+    def __init__(self, block_nums=None, cell_class=SudokuCell, box_size=3):
         """
         Initialize the board.
+        The cell class selects the possibles engine - SudokuCell keeps possibles as lists
+        and BitmaskCell keeps them as bitmasks.
+        The box size selects the board size - 3 for a 9x9 board.
+
+        The board tracks the numbers placed in each block, row and column as bitmasks, so
+        verify() and solved() don't walk the cells. Numbers set with set_number() keep the
+        bitmasks up to date - numbers set on the cells directly make the board recount once,
+        on the next check.
         """
-        self.blocks = [ SudokuBlock() for __ in range(9) ]
+        self._set_layout(get_layout(box_size), cell_class)
         if block_nums:
             self.populate(block_nums)
 
+    def _set_layout(self, layout, cell_class):
+        """
+        Empty the board and give it a layout, with new cells of the cell class.
+        """
+        box_size = layout.box_size
+        self.box_size = box_size
+        self.layout = layout
+        # Set by the cells of the board when a number is set on them directly.
+        self.changed = [False]
+        self.blocks = [ SudokuBlock(cell_class=cell_class, box_size=box_size) for __ in range(box_size * box_size) ]
+        for block in self.blocks:
+            for cell in block.cells:
+                cell.changed = self.changed
+        self.recount()
+
+    @property
+    def size(self):
+        """
+        The number of cells in each row, column and block.
+        """
+        return self.box_size * self.box_size
+
     def populate(self, block_nums):
         """
         Populate an entire SudokuBoard with numbers.
@@ -78,30 +138,41 @@ class SudokuBoard(object):
         """
         for i, one_block in enumerate(block_nums):
             self.blocks[i].populate(one_block)
+        self.recount()
 
     def _populate_from_numdata(self, numdata):
         """
         Populate an entire Sudoku board from BRD line data.
+        The length of the first row sets the board size. Values are numbers or digit strings -
+        BRD lines of boards larger than 9x9 write numbers above 9 as letters.
         """
         blocks = defaultdict(list)
+        layout = None
         row_num = 0
         for row in numdata:
             if isinstance(row, basestring):
                 row = list(row.strip())
             if len(row) == 0:
                 continue
-            if len(row) != 9:
+            if layout is None:
+                layout = _row_layout(row)
+                if layout.box_size != self.box_size:
+                    self._set_layout(layout, type(self.blocks[0].cells[0]))
+            if len(row) != layout.size:
                 raise BoardParseError(
-                    "Row number {} does not have 9 values - it has {} values. Row: {}".format(
-                    row_num, len(row), row
+                    "Row number {} does not have {} values - it has {} values. Row: {}".format(
+                    row_num, layout.size, len(row), row
                 ))
-            base_block_num = (row_num / 3) * 3
-            blocks[base_block_num].extend(row[0:3])
-            blocks[base_block_num + 1].extend(row[3:6])
-            blocks[base_block_num + 2].extend(row[6:9])
+            box_size = layout.box_size
+            base_block_num = (row_num / box_size) * box_size
+            for i in range(box_size):
+                blocks[base_block_num + i].extend(
+                    _parse_numbers(layout, row[i * box_size:(i + 1) * box_size], row_num)
+                )
             row_num += 1
-        for block_num in range(9):
+        for block_num in range(len(self.blocks)):
             self.blocks[block_num].populate(blocks[block_num])
+        self.recount()
 
     def populate_from_csvfile(self, filename):
         """
@@ -141,6 +212,82 @@ class SudokuBoard(object):
         """
         self._populate_from_numdata(brdstring)
 
+    def recount(self):
+        """
+        Rebuild the occupancy of each house from the cells.
+        Done automatically after numbers are set on the cells directly - see _refresh().
+        """
+        self.changed[0] = False
+        # occupied[house] has a bit set for each number in the house - houses numbered as layout.houses.
+        self.occupied = [0] * len(self.layout.houses)
+        # (house, number) -> the number of extra times the number appears in the house.
+        self.duplicates = {}
+        self.filled_count = 0
+        boxes = self.layout.boxes
+        for block_num, block in enumerate(self.blocks):
+            for cell_num, cell in enumerate(block.cells):
+                if cell._number is not None:
+                    self._occupy(boxes[block_num][cell_num], cell._number)
+
+    def _refresh(self):
+        """
+        Recount the occupancy of each house if any cell's number was set directly,
+        outside set_number().
+        """
+        if self.changed[0]:
+            self.recount()
+
+    def _occupy(self, index, number):
+        """
+        Count a number placed in the cell at a row-major index.
+        Returns False if a house of the cell already has the number.
+        """
+        bit = self.layout.number_bits[number]
+        occupied = self.occupied
+        consistent = True
+        for house in self.layout.cell_houses[index]:
+            if occupied[house] & bit:
+                self.duplicates[(house, number)] = self.duplicates.get((house, number), 0) + 1
+                consistent = False
+            else:
+                occupied[house] |= bit
+        self.filled_count += 1
+        return consistent
+
+    def _vacate(self, index, number):
+        """
+        Uncount a number removed from the cell at a row-major index.
+        """
+        bit = self.layout.number_bits[number]
+        occupied = self.occupied
+        for house in self.layout.cell_houses[index]:
+            extra = self.duplicates.get((house, number))
+            if extra:
+                if extra == 1:
+                    del self.duplicates[(house, number)]
+                else:
+                    self.duplicates[(house, number)] = extra - 1
+            else:
+                occupied[house] &= ~bit
+        self.filled_count -= 1
+
+    def set_number(self, position, number):
+        """
+        Set the number of the cell in the (major, minor) position - None empties the cell.
+        Returns False if the number is already in the cell's block, row or column.
+        The board is still changed - verify() then raises InvalidBoard.
+        """
+        self._refresh()
+        block_num, cell_num = position
+        cell = self.blocks[block_num].cells[cell_num]
+        index = self.layout.boxes[block_num][cell_num]
+        if cell._number is not None:
+            self._vacate(index, cell._number)
+        cell._number = number
+        if number is None:
+            return True
+        return self._occupy(index, number)
+
     def _reduce_filter(self, lists, set_cells=False, unset_cells=False):
         """
         Reduces multiple lists of SudokuCells to a single list of SudokuCells.
@@ -152,15 +299,16 @@ class SudokuBoard(object):
         for a_list in lists:
             for cell in a_list:
                 if set_cells:
-                    if cell.number is not None:
+                    if cell._number is not None:
                         cells.append(cell)
                 if unset_cells:
-                    if cell.number is None:
+                    if cell._number is None:
                         cells.append(cell)
         return cells
 
     def _row_blocks(self, row_num):
-        return [self.blocks[(row_num / 3) * 3 + i] for i in range(3)]
+        box_size = self.box_size
+        return [self.blocks[(row_num / box_size) * box_size + i] for i in range(box_size)]
 
     def row(self, row_num, as_numbers=True, set_cells=True, unset_cells=True):
         """
@@ -168,10 +316,10 @@ class SudokuBoard(object):
         If a row has a number more than once, it returns all instances of the number.
         """
         blocks = self._row_blocks(row_num)
-        block_row_cells = [block.row(row_num % 3, as_numbers=False) for block in blocks]
+        block_row_cells = [block.row(row_num % self.box_size, as_numbers=False) for block in blocks]
         block_row_cells = self._reduce_filter(block_row_cells, set_cells=set_cells, unset_cells=unset_cells)
         if as_numbers:
-            block_row_numbers = [cell.number for cell in block_row_cells]
+            block_row_numbers = [cell._number for cell in block_row_cells]
             return sorted(block_row_numbers)
         else:
             return block_row_cells
@@ -180,17 +328,18 @@ class SudokuBoard(object):
         """
         Return all numbers remaining to be set in a board row (0-based).
         """
-        return sorted(list(POSSIBLE_SET - set(self.row(row_num))))
+        return sorted(list(set(self.blocks[0].possible_numbers) - set(self.row(row_num))))
 
     def col(self, col_num, as_numbers=True, set_cells=True, unset_cells=True):
         """
         Return all numbers currently set in the board column (0-based).
         """
-        blocks = [self.blocks[(col_num / 3) + 3 * i] for i in range(3)]
-        block_col_cells = [block.col(col_num % 3, as_numbers=False) for block in blocks]
+        box_size = self.box_size
+        blocks = [self.blocks[(col_num / box_size) + box_size * i] for i in range(box_size)]
+        block_col_cells = [block.col(col_num % box_size, as_numbers=False) for block in blocks]
         block_col_cells = self._reduce_filter(block_col_cells, set_cells=set_cells, unset_cells=unset_cells)
         if as_numbers:
-            block_col_numbers = [cell.number for cell in block_col_cells]
+            block_col_numbers = [cell._number for cell in block_col_cells]
             return sorted(block_col_numbers)
         else:
             return block_col_cells
@@ -199,7 +348,7 @@ class SudokuBoard(object):
         """
         Return all numbers remaining to be set in a board column (0-based).
         """
-        return sorted(list(POSSIBLE_SET - set(self.col(col_num))))
+        return sorted(list(set(self.blocks[0].possible_numbers) - set(self.col(col_num))))
 
     def reset_possibles(self):
         """
@@ -220,18 +369,18 @@ class SudokuBoard(object):
                 cell.eliminate_possibles(values_set)
 
         # Go through each board row, ...
-        for row_num in range(9):
+        for row_num in range(self.size):
             row_cells = self.row(row_num, as_numbers=False)
-            row_values = [ cell.number for cell in row_cells if not cell.empty ]
+            row_values = [ cell._number for cell in row_cells if not cell.empty ]
             row_values_set = set(row_values)
             for cell in row_cells:
                 if cell.empty:
                     cell.eliminate_possibles(row_values_set)
 
         # Go through each board column, ...
-        for col_num in range(9):
+        for col_num in range(self.size):
             col_cells = self.col(col_num, as_numbers=False)
-            col_values = [ cell.number for cell in col_cells if not cell.empty ]
+            col_values = [ cell._number for cell in col_cells if not cell.empty ]
             col_values_set = set(col_values)
             for cell in col_cells:
                 if cell.empty:
@@ -250,7 +399,7 @@ class SudokuBoard(object):
                         if list(possibles) != cell.possibles:
                             cell.eliminate_possibles(set(possibles))
 
-        for row_num in range(9):
+        for row_num in range(self.size):
             possibles_count.clear()
             row_cells = self.row(row_num, as_numbers=False)
             for cell in row_cells:
@@ -262,7 +411,7 @@ class SudokuBoard(object):
                         if cell.empty and list(possibles) != cell.possibles:
                             cell.eliminate_possibles(set(possibles))
 
-        for col_num in range(9):
+        for col_num in range(self.size):
             possibles_count.clear()
             col_cells = self.col(col_num, as_numbers=False)
             for cell in col_cells:
@@ -277,41 +426,25 @@ class SudokuBoard(object):
 
     def verify(self):
         """
-        Eliminate the impossible values in each block, row, and column.
+        Check that no number appears more than once in any block, row, or column.
         """
-        # Go through each block, find remaining values, and reduce possible cell values.
-        for i, block in enumerate(self.blocks):
-            values = block.numbers()
-            if len(values) and len(values) != len(set(values)):
-                # Duplicate values in this block.
-                raise InvalidBoard('Block {} has duplicate values.\nBoard:\n{}'.format(i, self))
-
-        # Go through each board row, ...
-        for row_num in range(9):
-            row_cells = self.row(row_num, as_numbers=False)
-            row_values = [ cell.number for cell in row_cells if not cell.empty ]
-            if len(row_values) and len(row_values) != len(set(row_values)):
-                # Duplicate values in this row.
-                raise InvalidBoard('Row {} has duplicate values.\nBoard:\n{}'.format(i, self))
-
-        # Go through each board column, ...
-        for col_num in range(9):
-            col_cells = self.col(col_num, as_numbers=False)
-            col_values = [ cell.number for cell in col_cells if not cell.empty ]
-            if len(col_values) and len(col_values) != len(set(col_values)):
-                # Duplicate values in this column.
-                raise InvalidBoard('Column {} has duplicate values.\nBoard:\n{}'.format(i, self))
+        self._refresh()
+        if self.duplicates:
+            # Report the first house with a duplicate - blocks, then rows, then columns.
+            house_num = min(house for house, __ in self.duplicates)
+            raise InvalidBoard('{} {} has duplicate values.\nBoard:\n{}'.format(
+                self.layout.house_names[house_num], house_num % self.size, self
+            ))
 
     def set_obvious(self):
         """
         If any cells have only one possible number, set the cell to that number.
         """
         cells_set = False
-        for block in self.blocks:
-            empty_cells = block.empty_cells()
-            for cell in empty_cells:
-                if len(cell.possibles) == 1:
-                    cell.number = cell.possibles[0]
+        for block_num, block in enumerate(self.blocks):
+            for cell_num, cell in enumerate(block.cells):
+                if cell.empty and len(cell.possibles) == 1:
+                    self.set_number((block_num, cell_num), cell.possibles[0])
                     cell.possibles = None
                     cells_set = True
         return cells_set
@@ -343,40 +476,83 @@ class SudokuBoard(object):
         """
         Returns whether all cells are filled.
         """
-        for block in self.blocks:
-            empty_cells = block.empty_cells()
-            if len(empty_cells) != 0:
-                return False
-        return True
+        self._refresh()
+        return self.filled_count == self.layout.cell_count
 
     def solved(self):
         """
         Returns whether a board has been completely filled with a valid solution.
         """
-        if not self.filled():
-            return False
+        return self.filled() and not self.duplicates
 
-        try:
-            self.verify()
-        except InvalidBoard:
-            return False
+    def copy(self):
+        """
+        Returns a copy of the board - much cheaper than a deepcopy.
+        """
+        self._refresh()
+        board = SudokuBoard.__new__(SudokuBoard)
+        board.box_size = self.box_size
+        board.layout = self.layout
+        board.changed = [False]
+        board.blocks = [block.copy(board.changed) for block in self.blocks]
+        board.occupied = self.occupied[:]
+        board.duplicates = self.duplicates.copy()
+        board.filled_count = self.filled_count
+        return board
 
-        return True
+    def branch_cells(self):
+        """
+        Returns a list of all empty cells in block order, each as a ((major, minor), possibles) pair.
+        """
+        cells = []
+        for block_num, block in enumerate(self.blocks):
+            for cell_num, cell in enumerate(block.cells):
+                if cell.empty:
+                    cells.append(((block_num, cell_num), cell.possibles))
+        return cells
+
+    def moves(self, ordering=min_remaining):
+        """
+        Returns a list of the possible next moves in sequence, each as a ((major, minor), number) pair.
+        The ordering strategy chooses the cells to branch on - see sudoku.ordering.
+        """
+        return [
+            (position, possible)
+            for position, possibles in ordering(self.branch_cells())
+            for possible in possibles
+        ]
 
-    def next_moves(self):
+    def branch(self, position, number):
+        """
+        Returns a copy of the board with the number set in the (major, minor) position.
+        """
+        block_num, cell_num = position
+        board_copy = self.copy()
+        board_copy.set_number((block_num, cell_num), number)
+        return board_copy
+
+    def next_moves(self, ordering=min_remaining):
         """
         Return an iterator that yields SudokuBoard objects that represent
-        all possible next moves in sequence.
+        the possible next moves in sequence.
         """
-        # Iterate over all the blocks and cells.
+        for position, number in self.moves(ordering):
+            yield self.branch(position, number)
+
+    def key(self):
+        """
+        Returns a canonical key for the board's numbers - an 81-byte string holding
+        each cell's number (0 for empty) in row-major order (one byte per cell for other sizes).
+        Boards are equal exactly when their keys are equal.
+        """
+        boxes = self.layout.boxes
+        numbers = array('B', [0]) * (self.size * self.size)
         for block_num, block in enumerate(self.blocks):
+            box = boxes[block_num]
             for cell_num, cell in enumerate(block.cells):
-                if cell.empty:
-                    # For each cell's possible values, create a new board and yield it.
-                    for possible in cell.possibles:
-                        board_copy = deepcopy(self)
-                        board_copy[block_num][cell_num].number = possible
-                        yield board_copy
+                if cell._number is not None:
+                    numbers[box[cell_num]] = cell._number
+        return numbers.tostring()
 
     def __getitem__(self, index):
         return self.blocks[index]
@@ -390,19 +566,31 @@ class SudokuBoard(object):
                 return False
         return True
 
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """
+        Hash by value, consistent with equality. Boards are mutable - use key() to
+        remember a board's state, since the hash changes when a number is set.
+        """
+        return hash(self.key())
+
     def __unicode__(self):
+        box_size = self.box_size
+        separator = '+'.join(['-' * (box_size * 2 + 1)] * box_size)[1:-1] + '\n'
         board = ""
-        for board_row in range(3):
-            for block_row in range(3):
+        for board_row in range(box_size):
+            for block_row in range(box_size):
                 s = []
-                for x in range(3):
-                    s.append(self.blocks[board_row * 3 + x].row(block_row, as_numbers=False))
+                for x in range(box_size):
+                    s.append(self.blocks[board_row * box_size + x].row(block_row, as_numbers=False))
                 conv = []
                 for row in s:
                     conv.append(' '.join([cell.to_string() for cell in row ]))
                 board += '{}\n'.format(' | '.join(conv))
-            if board_row < 2:
-                board += '------+-------+------\n'
+            if board_row < box_size - 1:
+                board += separator
         return board
 
     def __repr__(self):
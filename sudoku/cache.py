@@ -0,0 +1,137 @@
+"""
+Bounded caches used by the search.
+"""
+
+from collections import OrderedDict
+
+
+class TranspositionTable(object):
+    """
+    A set of board keys with a fixed capacity, evicting the least recently used key when full.
+    Counts hits and misses of membership checks.
+    """
+
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        """
+        Returns whether the key is in the table, marking it as recently used.
+        """
+        try:
+            value = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return False
+        self.entries[key] = value
+        self.hits += 1
+        return True
+
+    def add(self, key):
+        """
+        Adds a key to the table, evicting the least recently used key if the table is full.
+        """
+        entries = self.entries
+        if key in entries:
+            del entries[key]
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = True
+
+    def clear(self):
+        """
+        Removes all keys - the counters are kept.
+        """
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return "TranspositionTable - {}/{} keys, {} hits, {} misses, {} evictions".format(
+            len(self.entries), self.capacity, self.hits, self.misses, self.evictions
+        )
+
+
+class NogoodStore(object):
+    """
+    A set of nogoods with a fixed capacity, evicting the least recently used nogood when full.
+    A nogood is a set of moves - (position, number) pairs - which together lead the search
+    to an invalid board, so no branch holding all of them has a solution. Nogoods only hold
+    for the board they were learned on: the search clears the store when it starts.
+    Counts the nogoods learned, the branches pruned and the evictions.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        # The nogoods holding each move.
+        self.move_nogoods = {}
+        self.learned = 0
+        self.pruned = 0
+        self.evictions = 0
+
+    def add(self, nogood):
+        """
+        Adds a nogood, evicting the least recently used nogood if the store is full.
+        """
+        nogood = frozenset(nogood)
+        entries = self.entries
+        if nogood in entries:
+            del entries[nogood]
+        else:
+            if len(entries) >= self.capacity:
+                self._discard(entries.popitem(last=False)[0])
+                self.evictions += 1
+            for move in nogood:
+                self.move_nogoods.setdefault(move, set()).add(nogood)
+            self.learned += 1
+        entries[nogood] = True
+
+    def _discard(self, nogood):
+        move_nogoods = self.move_nogoods
+        for move in nogood:
+            nogoods = move_nogoods[move]
+            nogoods.discard(nogood)
+            if not nogoods:
+                del move_nogoods[move]
+
+    def prunes(self, moves):
+        """
+        Returns whether the branch of a list of moves holds a nogood with its last move,
+        marking the nogood as recently used. Nogoods without the last move were already
+        checked on the shorter branches.
+        """
+        nogoods = self.move_nogoods.get(moves[-1])
+        if nogoods:
+            branch = None
+            for nogood in nogoods:
+                if len(nogood) <= len(moves):
+                    if branch is None:
+                        branch = set(moves)
+                    if nogood <= branch:
+                        entries = self.entries
+                        entries[nogood] = entries.pop(nogood)
+                        self.pruned += 1
+                        return True
+        return False
+
+    def clear(self):
+        """
+        Removes all nogoods - the counters are kept.
+        """
+        self.entries.clear()
+        self.move_nogoods.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return "NogoodStore - {}/{} nogoods, {} learned, {} pruned, {} evictions".format(
+            len(self.entries), self.capacity, self.learned, self.pruned, self.evictions
+        )
@@ -0,0 +1,302 @@
+"""
+Canonical forms of 9x9 boards under the Sudoku symmetries, and a persistent cache of
+solutions keyed by them.
+
+Two boards are equivalent when one becomes the other by relabeling the numbers, swapping
+rows within a band, swapping bands, swapping columns within a stack, swapping stacks or
+transposing. The canonical form of a board is the smallest key (see SudokuGrid.key) of
+all the boards equivalent to it - with 0 for an empty cell, so empty cells come first.
+Equivalent boards have the same canonical form, and the Transform found with it maps
+a board to its canonical form and the solutions of the canonical form back to the board.
+
+The form is found row by row: every transformation giving the smallest rows so far is
+extended by the rows and column orders which give the smallest next row, until all nine
+rows are placed. Columns which are empty in all the rows placed so far are interchangeable,
+so they are only ordered once a row fills them.
+"""
+
+import sqlite3
+from collections import namedtuple
+from itertools import permutations, product
+from timeit import default_timer
+
+from board import SudokuBoard
+from engines import DEFAULT_ENGINE, make_solver
+from grid import SudokuGrid
+from solver import SolveResult
+
+# The rows of each band - and the columns of each stack.
+BANDS = ((0, 1, 2), (3, 4, 5), (6, 7, 8))
+
+
+class Transform(namedtuple('Transform', ['transposed', 'rows', 'cols', 'labels'])):
+    """
+    Maps a board to its canonical form. Cell (row, col) of the canonical form is cell
+    (rows[row], cols[col]) of the board - transposed first if transposed is True - with
+    its number n relabeled as labels[n]. labels is a tuple of 10 numbers with labels[0] == 0.
+    """
+    __slots__ = ()
+
+    def _sources(self):
+        """
+        Returns the board index of each cell of the canonical form, in row-major order.
+        """
+        rows, cols = self.rows, self.cols
+        if self.transposed:
+            return [cols[col] * 9 + rows[row] for row in range(9) for col in range(9)]
+        return [rows[row] * 9 + cols[col] for row in range(9) for col in range(9)]
+
+    def apply(self, key):
+        """
+        Returns the key of the canonical form of a board key.
+        """
+        numbers = bytearray(key)
+        labels = self.labels
+        return str(bytearray(labels[numbers[source]] for source in self._sources()))
+
+    def invert(self, key):
+        """
+        Returns the board key of a key of the canonical form - such as its solution.
+        """
+        numbers = bytearray(key)
+        inverse = [0] * 10
+        for number, label in enumerate(self.labels):
+            inverse[label] = number
+        board = bytearray(81)
+        for index, source in enumerate(self._sources()):
+            board[source] = inverse[numbers[index]]
+        return str(board)
+
+
+def _relabel(row, labels):
+    """
+    Returns a row with its numbers relabeled, and the labels extended with the numbers
+    seen first in the row - labels is a dictionary of number to label, copied if extended.
+    """
+    relabeled = []
+    extended = False
+    for number in row:
+        if number:
+            label = labels.get(number)
+            if label is None:
+                if not extended:
+                    labels = dict(labels)
+                    extended = True
+                label = labels[number] = len(labels) + 1
+            number = label
+        relabeled.append(number)
+    return tuple(relabeled), labels
+
+
+def _stack_orders(row, empty_cols, filled_cols):
+    """
+    Returns the ways to order a stack's columns for a new row, as (empty columns, filled
+    columns) pairs - the columns still empty stay first and unordered, and the columns
+    filled by the row are ordered every way after them.
+    """
+    still_empty = frozenset(col for col in empty_cols if not row[col])
+    numbered = [col for col in empty_cols if row[col]]
+    return [(still_empty, order + filled_cols) for order in permutations(numbered)]
+
+
+def _arrangements(row, empty_stacks, stacks):
+    """
+    Yields the column arrangements which can give the smallest relabeled row, as
+    (row values in column order, empty stacks, stacks).
+
+    Columns empty in every row placed so far always come first in their stack, and
+    stacks empty so far before the others, so they are kept as unordered sets until
+    a row fills them. empty_stacks is the set of stacks still empty, and stacks the
+    other stacks in order, each as an (empty columns, filled columns) pair.
+    """
+    still_empty = frozenset(stack for stack in empty_stacks if not any(row[col] for col in BANDS[stack]))
+    numbered = [stack for stack in empty_stacks if stack not in still_empty]
+    leading = [0] * (3 * len(still_empty))
+    for stack_order in permutations(numbered):
+        choices = [_stack_orders(row, frozenset(BANDS[stack]), ()) for stack in stack_order]
+        choices.extend(_stack_orders(row, empty_cols, filled_cols) for empty_cols, filled_cols in stacks)
+        for arrangement in product(*choices):
+            values = list(leading)
+            for empty_cols, filled_cols in arrangement:
+                values.extend([0] * len(empty_cols))
+                values.extend(row[col] for col in filled_cols)
+            yield values, still_empty, arrangement
+
+
+def _next_rows(rows):
+    """
+    Returns the rows which can follow the rows placed so far - the rest of the band of
+    the last row, or any row of a band not placed yet.
+    """
+    if len(rows) % 3:
+        return [row for row in BANDS[rows[-1] // 3] if row not in rows]
+    return [row for band in BANDS if band[0] not in rows for row in band]
+
+
+def canonical_form(board):
+    """
+    Returns the canonical form of a 9x9 board (a SudokuBoard or a SudokuGrid) as a key,
+    and the Transform mapping the board to it. Raises ValueError for other sizes.
+    """
+    key = board.key()
+    if len(key) != 81:
+        raise ValueError("Canonical forms are only found for 9x9 boards.")
+    numbers = bytearray(key)
+    grids = (
+        [numbers[row * 9:row * 9 + 9] for row in range(9)],
+        [numbers[col::9] for col in range(9)],
+    )
+
+    # Each state is a transformation giving the smallest rows so far:
+    # (transposed, rows, empty stacks, stacks, labels) - see _arrangements().
+    states = [(transposed, (), frozenset(range(3)), (), {}) for transposed in range(2)]
+    canonical = []
+    for __ in range(9):
+        best = None
+        next_states = []
+        seen = set()
+        for transposed, rows, empty_stacks, stacks, labels in states:
+            grid = grids[transposed]
+            for row_num in _next_rows(rows):
+                for values, row_empty_stacks, row_stacks in _arrangements(grid[row_num], empty_stacks, stacks):
+                    relabeled, row_labels = _relabel(values, labels)
+                    if best is None or relabeled < best:
+                        best = relabeled
+                        next_states = []
+                        seen = set()
+                    if relabeled == best:
+                        # States with the same placed rows, columns and labels have the same future.
+                        signature = (transposed, frozenset(rows + (row_num,)), row_num // 3, row_empty_stacks,
+                                     row_stacks, tuple(sorted(row_labels.items())))
+                        if signature not in seen:
+                            seen.add(signature)
+                            next_states.append(
+                                (transposed, rows + (row_num,), row_empty_stacks, row_stacks, row_labels)
+                            )
+        states = next_states
+        canonical.extend(best)
+
+    transposed, rows, empty_stacks, stacks, labels = states[0]
+    # Columns still empty can go in any order.
+    cols = tuple(col for stack in sorted(empty_stacks) for col in BANDS[stack])
+    for empty_cols, filled_cols in stacks:
+        cols += tuple(sorted(empty_cols)) + filled_cols
+    # Numbers missing from the board take the unused labels in order.
+    missing_labels = iter(range(len(labels) + 1, 10))
+    full_labels = [0] + [labels[number] if number in labels else next(missing_labels) for number in range(1, 10)]
+    return str(bytearray(canonical)), Transform(bool(transposed), rows, cols, tuple(full_labels))
+
+
+class SolutionCache(object):
+    """
+    A persistent cache of solutions keyed by the canonical form of their boards, so a board
+    equivalent to one solved before is answered without a search. Holds at most capacity
+    solutions, evicting the least recently used. Stored in an SQLite database - open it
+    from one process at a time.
+    """
+
+    def __init__(self, filename, capacity=100000):
+        self.filename = filename
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS solutions (canonical BLOB PRIMARY KEY, solution BLOB NOT NULL, '
+                'used INTEGER NOT NULL)'
+            )
+            self.connection.execute('CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used)')
+        self.count, last_used = self.connection.execute('SELECT COUNT(*), MAX(used) FROM solutions').fetchone()
+        # Increases with each use - the least recently used solution has the smallest value.
+        self.clock = last_used or 0
+
+    def _tick(self):
+        self.clock += 1
+        return self.clock
+
+    def get(self, board):
+        """
+        Returns the cached solution of the board - the same board type - or None.
+        """
+        canonical, transform = canonical_form(board)
+        row = self.connection.execute(
+            'SELECT solution FROM solutions WHERE canonical = ?', (buffer(canonical),)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.connection:
+            self.connection.execute(
+                'UPDATE solutions SET used = ? WHERE canonical = ?', (self._tick(), buffer(canonical))
+            )
+        solution = SudokuGrid.from_key(transform.invert(str(row[0])))
+        return solution.to_board() if isinstance(board, SudokuBoard) else solution
+
+    def put(self, board, solution):
+        """
+        Cache the solution of a board, evicting the least recently used solutions if the cache is full.
+        """
+        canonical, transform = canonical_form(board)
+        with self.connection:
+            known = self.connection.execute(
+                'SELECT 1 FROM solutions WHERE canonical = ?', (buffer(canonical),)
+            ).fetchone()
+            self.connection.execute(
+                'INSERT OR REPLACE INTO solutions (canonical, solution, used) VALUES (?, ?, ?)',
+                (buffer(canonical), buffer(transform.apply(solution.key())), self._tick())
+            )
+            if not known:
+                self.count += 1
+            excess = self.count - self.capacity
+            if excess > 0:
+                self.connection.execute(
+                    'DELETE FROM solutions WHERE canonical IN (SELECT canonical FROM solutions ORDER BY used LIMIT ?)',
+                    (excess,)
+                )
+                self.count -= excess
+                self.evictions += excess
+
+    def solve(self, board, engine=DEFAULT_ENGINE, **options):
+        """
+        Return the cached solution of the board as a SolveResult with no nodes - or search for
+        one with the named engine and cache it. The options are passed to make_solver().
+        For a board with several solutions, the cached one may differ from the one a search finds.
+        """
+        start = default_timer()
+        solution = self.get(board)
+        if solution is not None:
+            return SolveResult(solution, True, 0, default_timer() - start, False)
+        result = make_solver(engine, **options).solve(board)
+        if result.solved:
+            self.put(board, result.board)
+        return result._replace(elapsed=default_timer() - start)
+
+    def clear(self):
+        """
+        Removes all solutions - the counters are kept.
+        """
+        with self.connection:
+            self.connection.execute('DELETE FROM solutions')
+        self.count = 0
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return "SolutionCache {} - {}/{} solutions, {} hits, {} misses, {} evictions".format(
+            self.filename, self.count, self.capacity, self.hits, self.misses, self.evictions
+        )
@@ -2,23 +2,92 @@
 Representation of a single Sudoku cell.
 """
 
+from operator import attrgetter
+
 # Possible cell numbers - list and set.
 POSSIBLE_NUMBERS = range(1, 10)
 POSSIBLE_SET = frozenset(POSSIBLE_NUMBERS)
 
+# Characters for each number - boards larger than 9x9 write numbers above 9 as letters.
+NUMBER_CHARS = '123456789ABCDEFGHIJKLMNOP'
+
+# Possible cell numbers as a bitmask - bit (n - 1) is set when n is possible.
+NUMBER_BITS = [0] + [1 << (n - 1) for n in POSSIBLE_NUMBERS]
+FULL_MASK = (1 << len(POSSIBLE_NUMBERS)) - 1
+
+# Lookup tables indexed by mask: the possible numbers, their count,
+# and the number itself when only one is possible (otherwise None).
+MASK_NUMBERS = [
+    [n for n in POSSIBLE_NUMBERS if mask & NUMBER_BITS[n]] for mask in range(FULL_MASK + 1)
+]
+MASK_COUNTS = [len(numbers) for numbers in MASK_NUMBERS]
+MASK_SINGLES = [numbers[0] if len(numbers) == 1 else None for numbers in MASK_NUMBERS]
+
+
+def numbers_to_mask(numbers):
+    """
+    Converts a collection of numbers to a bitmask.
+    """
+    mask = 0
+    for number in numbers:
+        mask |= 1 << (number - 1)
+    return mask
+
+
+# The lookup tables cover masks of up to 9 numbers - these also decode wider masks.
+
+def mask_numbers(mask):
+    """
+    Returns the list of numbers in a bitmask.
+    """
+    if mask <= FULL_MASK:
+        return MASK_NUMBERS[mask]
+    return [n for n in range(1, mask.bit_length() + 1) if mask & (1 << (n - 1))]
+
+
+def mask_count(mask):
+    """
+    Returns the count of numbers in a bitmask.
+    """
+    if mask <= FULL_MASK:
+        return MASK_COUNTS[mask]
+    return bin(mask).count('1')
+
+
+def mask_single(mask):
+    """
+    Returns the number in a bitmask holding exactly one - otherwise None.
+    """
+    if mask <= FULL_MASK:
+        return MASK_SINGLES[mask]
+    if mask & (mask - 1):
+        return None
+    return mask.bit_length()
+
 
 class SudokuCell(object):
     """
     A single Sudoku cell.
     """
-    __slots__ = ['number', 'possibles']
+    __slots__ = ['_number', 'possibles', 'changed']
 
-    def __init__(self):
+    def __init__(self, possible_numbers=None):
         # Filled-in number for cell. None means empty.
-        self.number = None
+        self._number = None
         # List of possible numbers for this cell.
-        # Begins with all possible numbers.
-        self.possibles = POSSIBLE_NUMBERS
+        # Begins with all possible numbers - 1 to 9 unless the board is another size.
+        self.possibles = POSSIBLE_NUMBERS if possible_numbers is None else possible_numbers
+        # The changed flag of the board holding the cell, or None - see SudokuBoard.recount().
+        self.changed = None
+
+    def _set_number(self, number):
+        self._number = number
+        if self.changed is not None:
+            self.changed[0] = True
+
+    # Reading the number needs no Python call - only setting it tells the board.
+    # SudokuBoard and SudokuBlock read _number in their loops, to skip the property.
+    number = property(attrgetter('_number'), _set_number)
 
     def set_possibles(self, possibles):
         """
@@ -32,12 +101,23 @@ class SudokuCell(object):
         """
         self.possibles = sorted(list(set(self.possibles) - set(impossibles)))
 
+    def copy(self, changed=None):
+        """
+        Returns a copy of the cell, for a board with the changed flag if passed.
+        Possibles lists are replaced - never changed in place - so the copy shares the list.
+        """
+        cell = SudokuCell.__new__(SudokuCell)
+        cell._number = self._number
+        cell.possibles = self.possibles
+        cell.changed = changed
+        return cell
+
     @property
     def empty(self):
-        return self.number is None
+        return self._number is None
 
     def to_string(self):
-        return '-' if self.empty else '{}'.format(self.number)
+        return '-' if self.empty else NUMBER_CHARS[self.number - 1]
 
     def __eq__(self, other):
         return other.number == self.number
@@ -53,3 +133,65 @@ class SudokuCell(object):
         return "{} - Possibles: {}".format(value, self.possibles)
 
 
+class BitmaskCell(SudokuCell):
+    """
+    A single Sudoku cell which stores its possible numbers as a bitmask.
+    Elimination, counting and single detection are done with bit operations.
+    The possibles list is still available as a read-only view of the mask.
+    """
+    __slots__ = ['mask']
+
+    def __init__(self, possible_numbers=None):
+        self._number = None
+        self.changed = None
+        # Bitmask of possible numbers. None means no possibles are tracked.
+        self.mask = FULL_MASK if possible_numbers is None else numbers_to_mask(possible_numbers)
+
+    def copy(self, changed=None):
+        """
+        Returns a copy of the cell, for a board with the changed flag if passed.
+        """
+        cell = BitmaskCell.__new__(BitmaskCell)
+        cell._number = self._number
+        cell.mask = self.mask
+        cell.changed = changed
+        return cell
+
+    @property
+    def possibles(self):
+        if self.mask is None:
+            return None
+        return mask_numbers(self.mask)
+
+    @possibles.setter
+    def possibles(self, possibles):
+        if possibles is None:
+            self.mask = None
+        else:
+            self.mask = numbers_to_mask(possibles)
+
+    def eliminate_possibles(self, impossibles):
+        """
+        Eliminates all the passed-in numbers from the possible numbers.
+        """
+        self.mask &= ~numbers_to_mask(impossibles)
+
+    def eliminate_mask(self, mask):
+        """
+        Eliminates all the numbers in the passed-in bitmask from the possible numbers.
+        """
+        self.mask &= ~mask
+
+    @property
+    def count(self):
+        """
+        Number of possible numbers left for this cell.
+        """
+        return mask_count(self.mask)
+
+    @property
+    def single(self):
+        """
+        The only possible number for this cell - or None if there is not exactly one.
+        """
+        return mask_single(self.mask)
@@ -0,0 +1,285 @@
+"""
+Solving Sudoku as an exact cover problem with Dancing Links (Knuth's Algorithm X).
+
+Each of the 729 candidates - a number in a cell - is a row covering four of 324 columns:
+its cell, its number in its row, its number in its column and its number in its box.
+A solution is a set of 81 rows which covers every column exactly once. The rows and
+columns are kept in circular doubly-linked lists stored as flat arrays of node indexes,
+so covering and uncovering a column only relinks nodes.
+
+The links are built once at import time and copied for each search.
+"""
+
+from array import array
+from timeit import default_timer
+
+from board import SudokuBoard
+from grid import SudokuGrid, CELL_ROW, CELL_COL, CELL_BOX
+from layout import STANDARD
+from solver import SolveResult
+
+COLUMNS = 324
+ROOT = 0
+
+
+def _candidate_columns(index, number):
+    """
+    Returns the four columns (1-based - node 0 is the root) covered by a number in a cell.
+    """
+    digit = number - 1
+    return (
+        1 + index,
+        1 + 81 + CELL_ROW[index] * 9 + digit,
+        1 + 162 + CELL_COL[index] * 9 + digit,
+        1 + 243 + CELL_BOX[index] * 9 + digit,
+    )
+
+
+def _build_links():
+    """
+    Returns the left, right, up, down, column and candidate arrays of the full matrix,
+    the size of each column, and the first node of each candidate's row.
+    Candidates are numbered index * 9 + number - 1.
+    """
+    left = [ROOT] + list(range(COLUMNS))
+    right = list(range(1, COLUMNS + 1)) + [ROOT]
+    up = list(range(COLUMNS + 1))
+    down = list(range(COLUMNS + 1))
+    column = list(range(COLUMNS + 1))
+    candidate = [None] * (COLUMNS + 1)
+    sizes = [0] * (COLUMNS + 1)
+    row_starts = []
+    for index in range(81):
+        for number in range(1, 10):
+            first = len(left)
+            row_starts.append(first)
+            for offset, col in enumerate(_candidate_columns(index, number)):
+                node = first + offset
+                left.append(first + (offset - 1) % 4)
+                right.append(first + (offset + 1) % 4)
+                # Append the node at the bottom of its column.
+                up.append(up[col])
+                down.append(col)
+                down[up[col]] = node
+                up[col] = node
+                column.append(col)
+                candidate.append(index * 9 + number - 1)
+                sizes[col] += 1
+    return (left, right, up, down, column, candidate), sizes, row_starts
+
+
+LINKS, SIZES, ROW_STARTS = _build_links()
+
+
+class DLXSolver(object):
+    """
+    Searches for solutions with Dancing Links - an alternative to sudoku.solver.Solver
+    with the same solve() API. Each search node selects one candidate: the search always
+    branches on the column with the fewest candidates left.
+    """
+
+    def __init__(self, max_nodes=None, time_limit=None, stop=None):
+        """
+        max_nodes and time_limit (in seconds) bound the search - None means no limit.
+        stop is a callable checked with the budget at each node - the search gives up,
+        as if out of budget, once it returns True.
+        """
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.stop = stop
+        # The number of candidates selected and whether the budget ran out, in the last search.
+        self.nodes = 0
+        self.budget_exhausted = False
+
+    def solve(self, board):
+        """
+        Search for a solution of the board and return a SolveResult.
+        The solution is the same board type as the passed-in board, which is not changed.
+        """
+        start = default_timer()
+        solution = next(self.solutions(board), None)
+        return SolveResult(solution, solution is not None, self.nodes, default_timer() - start, self.budget_exhausted)
+
+    def solutions(self, board):
+        """
+        Yields each solution of the board, until the search space or the budget is exhausted.
+        After the search, the nodes and budget_exhausted attributes tell how far it went.
+        """
+        deadline = None if self.time_limit is None else default_timer() + self.time_limit
+        search = _Search(board, self.max_nodes, deadline, self.stop)
+        self.nodes = 0
+        self.budget_exhausted = False
+        try:
+            for solution in search.solutions():
+                self.nodes = search.nodes
+                yield solution.to_board() if isinstance(board, SudokuBoard) else solution
+        finally:
+            self.nodes = search.nodes
+            self.budget_exhausted = search.budget_exhausted
+
+    def count_solutions(self, board, limit=None):
+        """
+        Returns the number of solutions of the board, stopping early once limit are found.
+        """
+        count = 0
+        for __ in self.solutions(board):
+            count += 1
+            if count == limit:
+                break
+        return count
+
+
+class _Search(object):
+    """
+    The state of one Dancing Links search over a board.
+    """
+
+    def __init__(self, board, max_nodes=None, deadline=None, stop=None):
+        self.grid = SudokuGrid.from_board(board) if isinstance(board, SudokuBoard) else board
+        if self.grid.layout is not STANDARD:
+            raise ValueError("The Dancing Links engine only solves 9x9 boards.")
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.stop = stop
+        self.nodes = 0
+        self.budget_exhausted = False
+        self.links = [links[:] for links in LINKS]
+        self.sizes = SIZES[:]
+
+    def cover(self, col):
+        left, right, up, down, column, __ = self.links
+        sizes = self.sizes
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        row = down[col]
+        while row != col:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                sizes[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, col):
+        left, right, up, down, column, __ = self.links
+        sizes = self.sizes
+        row = up[col]
+        while row != col:
+            node = left[row]
+            while node != row:
+                sizes[column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def select(self, row):
+        """
+        Cover the other columns of a row whose own column is already covered.
+        """
+        right, column = self.links[1], self.links[4]
+        node = right[row]
+        while node != row:
+            self.cover(column[node])
+            node = right[node]
+
+    def unselect(self, row):
+        left, column = self.links[0], self.links[4]
+        node = left[row]
+        while node != row:
+            self.uncover(column[node])
+            node = left[node]
+
+    def _cover_clues(self):
+        """
+        Select the row of each number already on the board.
+        Returns False if two of them cover the same column.
+        """
+        covered = set()
+        cells = self.grid.cells
+        for index in range(81):
+            if cells[index]:
+                columns = _candidate_columns(index, cells[index])
+                if covered.intersection(columns):
+                    return False
+                covered.update(columns)
+                row = ROW_STARTS[index * 9 + cells[index] - 1]
+                self.cover(columns[0])
+                self.select(row)
+        return True
+
+    def _choose_column(self):
+        """
+        Returns the uncovered column with the fewest rows left.
+        """
+        right, sizes = self.links[1], self.sizes
+        best = None
+        col = right[ROOT]
+        while col != ROOT:
+            if best is None or sizes[col] < sizes[best]:
+                best = col
+                if sizes[col] <= 1:
+                    break
+            col = right[col]
+        return best
+
+    def _solution(self, rows):
+        """
+        Returns the board with the numbers of the selected rows filled in.
+        """
+        grid = SudokuGrid.from_key(self.grid.key())
+        candidate = self.links[5]
+        for row in rows:
+            index, digit = divmod(candidate[row], 9)
+            grid.cells[index] = digit + 1
+        grid.possibles = array('H', [0]) * 81
+        return grid
+
+    def _out_of_budget(self):
+        if (self.max_nodes is not None and self.nodes >= self.max_nodes) or \
+                (self.deadline is not None and default_timer() >= self.deadline) or \
+                (self.stop is not None and self.stop()):
+            self.budget_exhausted = True
+            return True
+        return False
+
+    def solutions(self):
+        """
+        Yields each solution of the board as a SudokuGrid, until the search space
+        or the budget is exhausted.
+        """
+        if not self._cover_clues():
+            return
+        right, down = self.links[1], self.links[3]
+        # The column and selected row of each level of the search.
+        stack = []
+        descend = True
+        while True:
+            if descend:
+                if right[ROOT] == ROOT:
+                    yield self._solution([row for __, row in stack])
+                    descend = False
+                    continue
+                col = self._choose_column()
+                self.cover(col)
+                row = down[col]
+            else:
+                if not stack:
+                    return
+                col, row = stack.pop()
+                self.unselect(row)
+                row = down[row]
+            if row == col:
+                # No rows left in the column - backtrack.
+                self.uncover(col)
+                descend = False
+                continue
+            if self._out_of_budget():
+                return
+            self.nodes += 1
+            self.select(row)
+            stack.append((col, row))
+            descend = True
@@ -0,0 +1,50 @@
+"""
+The solving engines, by name. Every engine is a class whose instances have a
+solve(board) method returning a SolveResult, a solutions(board) generator and a
+count_solutions(board, limit) method:
+
+- 'search': depth-first search over analyzed boards - see sudoku.solver.Solver.
+- 'dlx': exact cover with Dancing Links - see sudoku.dlx.DLXSolver.
+"""
+
+from dlx import DLXSolver
+from solver import Solver
+
+ENGINES = {
+    'search': Solver,
+    'dlx': DLXSolver,
+}
+DEFAULT_ENGINE = 'search'
+
+
+def make_solver(engine=DEFAULT_ENGINE, **options):
+    """
+    Returns a solver of the named engine, created with the options.
+    """
+    try:
+        engine_class = ENGINES[engine]
+    except KeyError:
+        raise ValueError("Unknown engine '{}' - expected one of {}.".format(engine, ', '.join(sorted(ENGINES))))
+    return engine_class(**options)
+
+
+def solve(board, engine=DEFAULT_ENGINE, **options):
+    """
+    Search for a solution of the board with the named engine and return a SolveResult.
+    """
+    return make_solver(engine, **options).solve(board)
+
+
+def solutions(board, engine=DEFAULT_ENGINE, **options):
+    """
+    Yields each solution of the board found by the named engine.
+    """
+    return make_solver(engine, **options).solutions(board)
+
+
+def count_solutions(board, limit=None, engine=DEFAULT_ENGINE, **options):
+    """
+    Returns the number of solutions of the board, stopping early once limit are found -
+    count_solutions(board, limit=2) == 1 checks that a board has a unique solution.
+    """
+    return make_solver(engine, **options).count_solutions(board, limit)
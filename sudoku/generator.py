@@ -0,0 +1,203 @@
+"""
+Generating 9x9 puzzles with a unique solution.
+
+A puzzle starts from a random solved board: the three boxes on the diagonal share no
+row or column, so they are filled with random permutations and the rest is solved with
+Dancing Links. Cells are then emptied in random order, and each removal is kept only if
+the puzzle still has a unique solution. A cell whose number follows from the numbers
+left - a naked or hidden single - can always be emptied, so only the other removals need
+a uniqueness check: the count_solutions(limit=2) of an engine, which is where the time goes.
+
+Generation is seeded: the puzzle at each position of a run depends only on the seed and
+the position, so the same seed gives the same puzzles however many workers share the work.
+
+    python -m sudoku.generator 100 --clues 26 --seed 1 --workers 4
+    python -m sudoku.generator 10 --difficulty hard
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+
+from engines import make_solver
+from grid import SudokuGrid, BOXES, HOUSES, PEERS
+from layout import STANDARD
+from solver import Solver
+
+# The search nodes needed to solve puzzles of each difficulty, up to and including the bound.
+# The search engine analyzes each board, so an easy puzzle is solved by the rules alone.
+DIFFICULTIES = [
+    ('easy', 1),
+    ('medium', 5),
+    ('hard', None),
+]
+DIGITS = '123456789'
+CELL_HOUSES = STANDARD.cell_houses
+
+
+class GenerationError(Exception):
+    pass
+
+
+def random_solution(rng=None):
+    """
+    Returns a random solved board as an 81-character string.
+    """
+    rng = rng or random.Random()
+    cells = ['.'] * 81
+    for box in (BOXES[0], BOXES[4], BOXES[8]):
+        for index, number in zip(box, rng.sample(DIGITS, 9)):
+            cells[index] = number
+    return make_solver('dlx').solve(SudokuGrid.from_string(''.join(cells))).board.to_string()
+
+
+def _deducible(cells, index, number):
+    """
+    Returns whether the number of an emptied cell follows from the other numbers - its
+    peers hold all the other numbers, or no other empty cell of one of its houses can
+    take the number.
+    """
+    peer_numbers = set(cells[peer] for peer in PEERS[index])
+    peer_numbers.discard('.')
+    if len(peer_numbers) == 8 and number not in peer_numbers:
+        return True
+    for house in CELL_HOUSES[index]:
+        for other in HOUSES[house]:
+            if other != index and cells[other] == '.' and \
+                    not any(cells[peer] == number for peer in PEERS[other]):
+                break
+        else:
+            return True
+    return False
+
+
+def remove_clues(solution, clues=None, rng=None, engine='dlx'):
+    """
+    Empty the cells of a solved board (an 81-character string) in random order while the
+    puzzle keeps a unique solution, and return the puzzle as a string. Stops once clues
+    numbers are left - with clues=None, or when no more can be emptied, the puzzle is
+    minimal: emptying any other cell would allow a second solution.
+    """
+    rng = rng or random.Random()
+    solver = make_solver(engine)
+    cells = list(solution)
+    order = range(81)
+    rng.shuffle(order)
+    filled = 81
+    for index in order:
+        if clues is not None and filled <= clues:
+            break
+        number = cells[index]
+        cells[index] = '.'
+        if _deducible(cells, index, number) or \
+                solver.count_solutions(SudokuGrid.from_string(''.join(cells)), 2) == 1:
+            filled -= 1
+        else:
+            cells[index] = number
+    return ''.join(cells)
+
+
+def rate(puzzle):
+    """
+    Returns the difficulty of a puzzle (an 81-character string) - see DIFFICULTIES - and the
+    number of nodes the search engine needs to solve it.
+    """
+    nodes = Solver().solve(SudokuGrid.from_string(puzzle)).nodes
+    for difficulty, max_nodes in DIFFICULTIES:
+        if max_nodes is None or nodes <= max_nodes:
+            return difficulty, nodes
+
+
+def make_puzzle(rng=None, clues=None, difficulty=None, attempts=100, engine='dlx'):
+    """
+    Returns a puzzle with a unique solution as an 81-character string.
+
+    Solved boards are tried until one gives a puzzle with at most clues numbers and of
+    the difficulty, if given. After attempts boards, the puzzle with the fewest numbers
+    is returned - or GenerationError raised if none was of the difficulty.
+    engine is the engine checking uniqueness.
+    """
+    if difficulty is not None and difficulty not in dict(DIFFICULTIES):
+        raise ValueError("Unknown difficulty '{}' - expected one of {}.".format(
+            difficulty, ', '.join(name for name, __ in DIFFICULTIES)
+        ))
+    rng = rng or random.Random()
+    best = None
+    for __ in range(attempts):
+        puzzle = remove_clues(random_solution(rng), clues, rng, engine)
+        if difficulty is not None and rate(puzzle)[0] != difficulty:
+            continue
+        if clues is None or 81 - puzzle.count('.') <= clues:
+            return puzzle
+        # Another solved board may allow fewer clues.
+        if best is None or puzzle.count('.') > best.count('.'):
+            best = puzzle
+    if best is not None:
+        return best
+    raise GenerationError("No {} puzzle found in {} attempts.".format(difficulty, attempts))
+
+
+def _puzzle_rng(seed, index):
+    """
+    Returns the random generator of the puzzle at a position of a seeded run.
+    """
+    return random.Random(seed * 1000003 + index)
+
+
+def _make_task(task):
+    """
+    Make one puzzle in a worker process.
+    """
+    seed, index, options = task
+    return make_puzzle(_puzzle_rng(seed, index), **options)
+
+
+def generate(count, clues=None, difficulty=None, seed=None, workers=1, as_boards=False, **options):
+    """
+    Returns an iterator of count puzzles with unique solutions, as 81-character strings -
+    or SudokuBoards with as_boards=True. See make_puzzle() for clues, difficulty and the
+    other options.
+
+    The same seed always gives the same puzzles - a seed of None picks one at random.
+    workers is the number of processes making puzzles - None for one per CPU.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    options.update(clues=clues, difficulty=difficulty)
+    tasks = ((seed, index, options) for index in range(count))
+    if workers == 1:
+        puzzles = (_make_task(task) for task in tasks)
+    else:
+        puzzles = _generate_pool(tasks, workers)
+    for puzzle in puzzles:
+        yield SudokuGrid.from_string(puzzle).to_board() if as_boards else puzzle
+
+
+def _generate_pool(tasks, workers):
+    pool = multiprocessing.Pool(workers)
+    try:
+        for puzzle in pool.imap(_make_task, tasks):
+            yield puzzle
+        pool.close()
+    finally:
+        # Also stops the workers if the caller stops iterating early.
+        pool.terminate()
+        pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate puzzles with a unique solution, one per line.")
+    parser.add_argument('count', type=int, help="number of puzzles")
+    parser.add_argument('--clues', type=int, default=None, help="numbers left in each puzzle (default: minimal)")
+    parser.add_argument('--difficulty', choices=[name for name, __ in DIFFICULTIES], default=None,
+                        help="difficulty of each puzzle")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the puzzles (default: random)")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (0 for one per CPU)")
+    args = parser.parse_args(argv)
+    for puzzle in generate(args.count, args.clues, args.difficulty, args.seed, args.workers or None):
+        sys.stdout.write(puzzle + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,611 @@
+"""
+Compact representation of a Sudoku board as a flat array of 81 numbers.
+
+Each cell is referenced using a single index in row-major order:
+
+ 0  1  2 |  3  4  5 |  6  7  8
+ 9 10 11 | 12 13 14 | 15 16 17
+18 19 20 | 21 22 23 | 24 25 26
+------------------------------
+27 28 29 | 30 31 32 | 33 34 35
+...
+
+The cell indexes of each row, column and box - and the peers of each cell - are
+computed once at import time, so walking the board never builds lists of cells.
+Boxes are numbered like the "major" blocks of a SudokuBoard.
+
+Grids of other sizes - 4x4, 16x16 or 25x25 - take their tables from their layout,
+see sudoku.layout. The module tables below are those of the 9x9 board.
+"""
+
+import os
+import csv
+from array import array
+from collections import Counter
+
+from board import SudokuBoard, InvalidBoard, BoardParseError
+from layout import STANDARD, BLANKS, get_layout, layout_for_cells, layout_for_size
+from ordering import min_remaining
+
+
+ROWS = STANDARD.rows
+COLS = STANDARD.cols
+BOXES = STANDARD.boxes
+# All houses, in the order SudokuBoard walks them: blocks, rows, then columns.
+HOUSES = STANDARD.houses
+HOUSE_NAMES = STANDARD.house_names
+
+CELL_ROW = STANDARD.cell_row
+CELL_COL = STANDARD.cell_col
+CELL_BOX = STANDARD.cell_box
+
+# The 20 other cells which share a row, column or box with each cell.
+PEERS = STANDARD.peers
+
+# The character for each number in board strings.
+CELL_CHARS = STANDARD.cell_chars
+
+# Cell indexes in SudokuBoard (major, minor) order.
+BLOCK_ORDER = STANDARD.block_order
+
+
+def _eliminate_naked_subsets(cells, possibles, layout=STANDARD):
+    """
+    If two/three/four cells have the same two/three/four possibles in a block/row/column,
+    eliminate those possibles from the other cells' possibles in that block/row/column.
+    """
+    mask_counts = layout.mask_counts
+    possibles_count = Counter()
+    for house in layout.houses:
+        possibles_count.clear()
+        for index in house:
+            if not cells[index]:
+                possibles_count[possibles[index]] += 1
+        for mask, cnt in possibles_count.iteritems():
+            if mask_counts[mask] == cnt:
+                for index in house:
+                    if not cells[index] and possibles[index] != mask:
+                        possibles[index] &= ~mask
+
+
+class SudokuGrid(object):
+    """
+    An entire Sudoku board stored as a flat array of numbers, with 0 for an empty cell.
+    The possible numbers of each cell are stored as bitmasks in a second flat array,
+    with 0 for a filled cell.
+
+    Once analyzed, the grid also tracks the possibles left by basic elimination in
+    a third array, so numbers set with place() are propagated incrementally to the
+    20 peers of their cell instead of recomputing the whole board.
+
+    The layout holds the tables of the board size - see sudoku.layout.
+    """
+    __slots__ = ['layout', 'cells', 'possibles', 'masks', 'pending']
+
+    def __init__(self, numbers=None, box_size=3):
+        """
+        Initialize the board.
+        The box size selects the board size - 3 for a 9x9 board. Populating the board
+        with the numbers of another size changes its size.
+        """
+        self._set_layout(get_layout(box_size))
+        # Possibles after basic elimination - None until the board is first analyzed.
+        # A filled cell has a mask of 0 once its number has been propagated.
+        self.masks = None
+        # Indexes of cells set with place() whose number has not been propagated yet.
+        self.pending = []
+        if numbers:
+            self.populate(numbers)
+
+    def _set_layout(self, layout):
+        """
+        Empty the board and give it a layout.
+        """
+        self.layout = layout
+        self.cells = array('B', [0]) * layout.cell_count
+        self.possibles = array(layout.mask_type, [layout.full_mask]) * layout.cell_count
+        self.masks = None
+        self.pending = []
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Create a grid with the numbers of a SudokuBoard.
+        """
+        grid = cls(box_size=board.box_size)
+        for block_num, box in enumerate(grid.layout.boxes):
+            for cell_num, index in enumerate(box):
+                grid.cells[index] = board[block_num][cell_num].number or 0
+        return grid
+
+    @classmethod
+    def from_string(cls, string):
+        """
+        Create a grid from an 81-character string of the cells in row-major order,
+        with '.', '0' or '-' for an empty cell.
+        Strings of 16, 256 or 625 characters are 4x4, 16x16 or 25x25 boards, with
+        letters for numbers above 9 - see sudoku.layout.
+        """
+        if len(string) == 81:
+            layout = STANDARD
+        else:
+            try:
+                layout = layout_for_cells(len(string))
+            except ValueError:
+                raise BoardParseError("Board string does not have 81 values - it has {} values. Board: {}".format(
+                    len(string), string
+                ))
+        grid = cls(box_size=layout.box_size)
+        cells = grid.cells
+        char_numbers = layout.char_numbers
+        for index, char in enumerate(string):
+            if char in BLANKS:
+                continue
+            number = char_numbers.get(char)
+            if number is None:
+                raise BoardParseError("Invalid value {!r} in cell {}. Board: {}".format(char, index, string))
+            cells[index] = number
+        return grid
+
+    @classmethod
+    def from_key(cls, key):
+        """
+        Create a grid from a board key - see key().
+        """
+        grid = cls(box_size=layout_for_cells(len(key)).box_size)
+        grid.cells = array('B')
+        grid.cells.fromstring(key)
+        return grid
+
+    def to_string(self):
+        """
+        Returns the board as an 81-character string of the cells in row-major order,
+        with '.' for an empty cell - one character per cell for other sizes.
+        """
+        cell_chars = self.layout.cell_chars
+        return ''.join([cell_chars[number] for number in self.cells])
+
+    def to_board(self):
+        """
+        Create a SudokuBoard with the numbers of this grid.
+        """
+        layout = self.layout
+        return SudokuBoard(
+            [[self.cells[index] or None for index in box] for box in layout.boxes], box_size=layout.box_size
+        )
+
+    def populate(self, numbers):
+        """
+        Populate the board from 81 numbers in row-major order.
+        Empty cells are None, 0 or a blank string - see sudoku.layout.BLANKS.
+        16, 256 or 625 numbers populate a 4x4, 16x16 or 25x25 board, where numbers
+        above 9 may also be letters.
+        """
+        numbers = list(numbers)
+        if len(numbers) != self.layout.cell_count:
+            try:
+                self._set_layout(layout_for_cells(len(numbers)))
+            except ValueError:
+                # Fewer numbers fill the first cells of the board.
+                if len(numbers) > self.layout.cell_count:
+                    raise BoardParseError("Board has too many values - it has {} values.".format(len(numbers)))
+        parse_number = self.layout.parse_number
+        for index, x in enumerate(numbers):
+            if isinstance(x, basestring):
+                number = parse_number(x)
+                if number is None:
+                    raise BoardParseError("Invalid value {!r} in cell {}.".format(x, index))
+                x = number
+            self.cells[index] = x or 0
+        self.masks = None
+        self.pending = []
+
+    def _populate_from_numdata(self, numdata):
+        """
+        Populate the board from BRD/CSV line data.
+        """
+        numbers = []
+        size = None
+        row_num = 0
+        for row in numdata:
+            if isinstance(row, basestring):
+                row = list(row.strip())
+            if len(row) == 0:
+                continue
+            if size is None:
+                # The first row sets the board size.
+                try:
+                    layout = layout_for_size(len(row))
+                except ValueError:
+                    layout = self.layout
+                if layout is not self.layout:
+                    self._set_layout(layout)
+                size = layout.size
+            if len(row) != size:
+                raise BoardParseError(
+                    "Row number {} does not have {} values - it has {} values. Row: {}".format(
+                    row_num, size, len(row), row
+                ))
+            numbers.extend(row)
+            row_num += 1
+        self.populate(numbers)
+
+    def populate_from_csvfile(self, filename):
+        """
+        Populate the board from a CSV file - see SudokuBoard.populate_from_csvfile.
+        """
+        with open(filename, 'rb') as csvfile:
+            self._populate_from_numdata(csv.reader(csvfile))
+
+    def populate_from_brdfile(self, filename):
+        """
+        Populate the board from a BRD file - see SudokuBoard.populate_from_brdfile.
+        """
+        with open(filename, 'r') as brdfile:
+            self._populate_from_numdata(brdfile.readlines())
+
+    def populate_from_csvstring(self, csvstring):
+        """
+        Populate the board from a CSV string - see SudokuBoard.populate_from_csvstring.
+        """
+        self._populate_from_numdata(csv.reader(csvstring.split(os.linesep)))
+
+    def populate_from_brdstring(self, brdstring):
+        """
+        Populate the board from BRD lines - see SudokuBoard.populate_from_brdstring.
+        """
+        self._populate_from_numdata(brdstring)
+
+    def possible_numbers(self, index):
+        """
+        Returns a list of the possible numbers for a cell - or None if the cell is filled.
+        """
+        if self.cells[index]:
+            return None
+        return self.layout.mask_numbers[self.possibles[index]]
+
+    def reset_possibles(self):
+        """
+        Reset the possible values of each empty cell to the full set.
+        """
+        cells = self.cells
+        layout = self.layout
+        full_mask = layout.full_mask
+        self.possibles = array(layout.mask_type, [0 if number else full_mask for number in cells])
+
+    def set_possibles(self):
+        """
+        Eliminate the impossible values in each block, row, and column.
+        """
+        cells = self.cells
+        possibles = self.possibles
+        layout = self.layout
+        number_bits = layout.number_bits
+        for house in layout.houses:
+            used = 0
+            for index in house:
+                used |= number_bits[cells[index]]
+            if used:
+                for index in house:
+                    possibles[index] &= ~used
+        _eliminate_naked_subsets(cells, possibles, layout)
+
+    def verify(self):
+        """
+        Check that no number appears more than once in any block, row, or column.
+        """
+        cells = self.cells
+        layout = self.layout
+        number_bits = layout.number_bits
+        for house_num, house in enumerate(layout.houses):
+            seen = 0
+            for index in house:
+                bit = number_bits[cells[index]]
+                if seen & bit:
+                    raise InvalidBoard('{} {} has duplicate values.\nBoard:\n{}'.format(
+                        layout.house_names[house_num], house_num % layout.size, self
+                    ))
+                seen |= bit
+
+    def set_obvious(self):
+        """
+        If any cells have only one possible number, set the cell to that number.
+        """
+        cells = self.cells
+        possibles = self.possibles
+        mask_counts = self.layout.mask_counts
+        mask_singles = self.layout.mask_singles
+        cells_set = False
+        for index in range(len(cells)):
+            if not cells[index] and mask_counts[possibles[index]] == 1:
+                cells[index] = mask_singles[possibles[index]]
+                possibles[index] = 0
+                cells_set = True
+        return cells_set
+
+    def place(self, index, number):
+        """
+        Set a number in a cell.
+        If the board has been analyzed, the number is queued to be propagated
+        to the cell's peers by the next analyze().
+        """
+        self.cells[index] = number
+        if self.masks is not None:
+            self.pending.append(index)
+
+    def _start_propagation(self):
+        """
+        Compute the possibles of every cell from scratch.
+        """
+        self.verify()
+        cells = self.cells
+        layout = self.layout
+        number_bits = layout.number_bits
+        full_mask = layout.full_mask
+        masks = array(layout.mask_type, [0 if number else full_mask for number in cells])
+        for house in layout.houses:
+            used = 0
+            for index in house:
+                used |= number_bits[cells[index]]
+            if used:
+                for index in house:
+                    masks[index] &= ~used
+        self.masks = masks
+        self.pending = []
+
+    def assign(self, index, number):
+        """
+        Set a cell's number of an analyzed board and eliminate it from the possibles
+        of the cell's 20 peers right away.
+        Raises InvalidBoard if the number is not possible or a peer is left without possibles.
+        """
+        masks = self.masks
+        bit = 1 << (number - 1)
+        if not masks[index] & bit:
+            raise InvalidBoard('Cell {} cannot be {}.\nBoard:\n{}'.format(index, number, self))
+        self.cells[index] = number
+        masks[index] = 0
+        for peer in self.layout.peers[index]:
+            mask = masks[peer]
+            if mask & bit:
+                mask ^= bit
+                masks[peer] = mask
+                if not mask:
+                    raise InvalidBoard('Cell {} has no possible values.\nBoard:\n{}'.format(peer, self))
+
+    def eliminate(self, index, mask):
+        """
+        Eliminate the numbers in a bitmask from the possibles of an analyzed board's empty cell.
+        Returns the number of possibles eliminated.
+        Raises InvalidBoard if the cell is left without possibles.
+        """
+        old_mask = self.masks[index]
+        mask = old_mask & ~mask
+        if mask == old_mask:
+            return 0
+        if not mask:
+            raise InvalidBoard('Cell {} has no possible values.\nBoard:\n{}'.format(index, self))
+        self.masks[index] = mask
+        mask_counts = self.layout.mask_counts
+        return mask_counts[old_mask] - mask_counts[mask]
+
+    def conflict(self, moves):
+        """
+        Place the numbers of moves - (index, number) pairs - on a copy of an analyzed grid,
+        eliminating each number from its peers and filling in each cell left with one
+        possible number. Returns the moves which the first contradiction reached depends on,
+        in their order - or None if no contradiction is reached this way.
+        """
+        cells = self.cells[:]
+        masks = self.possibles[:]
+        peers = self.layout.peers
+        mask_counts = self.layout.mask_counts
+        mask_singles = self.layout.mask_singles
+        # The moves each number placed and each cell's eliminations depend on, as bitmasks
+        # over the positions of moves - 0 for the grid's own numbers and possibles.
+        reasons = [0] * len(cells)
+        eliminated = [0] * len(cells)
+        queue = [(index, number, 1 << position) for position, (index, number) in enumerate(moves)]
+        queue.reverse()
+        depends = None
+        while queue and depends is None:
+            index, number, reason = queue.pop()
+            if cells[index]:
+                if cells[index] != number:
+                    depends = reason | reasons[index]
+                continue
+            bit = 1 << (number - 1)
+            if not masks[index] & bit:
+                depends = reason | eliminated[index]
+                continue
+            cells[index] = number
+            reasons[index] = reason
+            masks[index] = 0
+            for peer in peers[index]:
+                mask = masks[peer]
+                if mask & bit:
+                    mask ^= bit
+                    masks[peer] = mask
+                    eliminated[peer] |= reason
+                    if not mask:
+                        depends = eliminated[peer]
+                        break
+                    if mask_counts[mask] == 1:
+                        queue.append((peer, mask_singles[mask], eliminated[peer]))
+        if depends is None:
+            return None
+        return [move for position, move in enumerate(moves) if depends >> position & 1]
+
+    def analyze(self, incremental=True, pipeline=None):
+        """
+        Update the possible numbers for each empty cell and fill in the obvious ones.
+        Reaches the same board as SudokuBoard.analyze, but raises InvalidBoard as soon
+        as any cell is left without a possible number.
+
+        The first analyze() computes the possibles of the whole board. After that, each
+        number set - with place() or because it is obvious - is only eliminated from
+        the 20 peers of its cell. With incremental=False, the whole board is verified
+        and recomputed each time obvious numbers are set.
+
+        If a DeductionPipeline is passed, its rules are run to a fixpoint instead of the
+        SudokuBoard rules - see sudoku.rules. Their eliminations are kept for the next analyze().
+        """
+        if not incremental:
+            self.verify()
+            self.reset_possibles()
+            self.set_possibles()
+            while self.set_obvious():
+                self.verify()
+                self.reset_possibles()
+                self.set_possibles()
+            self.masks = None
+            self.pending = []
+            return
+
+        if self.masks is None:
+            self._start_propagation()
+        cells = self.cells
+        layout = self.layout
+        pending = self.pending
+        while pending:
+            index = pending.pop()
+            if self.masks[index]:
+                self.assign(index, cells[index])
+        if pipeline is not None:
+            pipeline.run(self)
+            self.possibles = self.masks[:]
+            return
+        while True:
+            # The naked subset rule works on a copy, as SudokuBoard recomputes it each time.
+            possibles = self.masks[:]
+            _eliminate_naked_subsets(cells, possibles, layout)
+            mask_counts = layout.mask_counts
+            obvious = [index for index in range(len(cells)) if not cells[index] and mask_counts[possibles[index]] == 1]
+            if not obvious:
+                self.possibles = possibles
+                return
+            for index in obvious:
+                self.assign(index, layout.mask_singles[possibles[index]])
+
+    def filled(self):
+        """
+        Returns whether all cells are filled.
+        """
+        return 0 not in self.cells
+
+    def solved(self):
+        """
+        Returns whether a board has been completely filled with a valid solution.
+        """
+        if not self.filled():
+            return False
+
+        try:
+            self.verify()
+        except InvalidBoard:
+            return False
+
+        return True
+
+    def copy(self):
+        """
+        Returns a copy of the board - a copy of the two flat arrays.
+        """
+        grid = SudokuGrid.__new__(SudokuGrid)
+        grid.layout = self.layout
+        grid.cells = self.cells[:]
+        grid.possibles = self.possibles[:]
+        grid.masks = None if self.masks is None else self.masks[:]
+        grid.pending = self.pending[:]
+        return grid
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def branch_cells(self):
+        """
+        Returns a list of all empty cells in block order, each as an (index, possibles) pair.
+        """
+        cells = self.cells
+        possibles = self.possibles
+        mask_numbers = self.layout.mask_numbers
+        return [(index, mask_numbers[possibles[index]]) for index in self.layout.block_order if not cells[index]]
+
+    def moves(self, ordering=min_remaining):
+        """
+        Returns a list of the possible next moves in sequence, each as an (index, number) pair.
+        The ordering strategy chooses the cells to branch on - see sudoku.ordering.
+        """
+        return [
+            (index, possible)
+            for index, possibles in ordering(self.branch_cells())
+            for possible in possibles
+        ]
+
+    def branch(self, index, number):
+        """
+        Returns a copy of the board with the number placed in the cell.
+        The copy is a snapshot of the flat arrays, and an analyzed board only
+        propagates the new number when the copy is analyzed.
+        """
+        grid = self.copy()
+        grid.place(index, number)
+        return grid
+
+    def next_moves(self, ordering=min_remaining):
+        """
+        Return an iterator that yields SudokuGrid objects that represent
+        the possible next moves in sequence.
+        """
+        for index, number in self.moves(ordering):
+            yield self.branch(index, number)
+
+    def key(self):
+        """
+        Returns a canonical key for the board's numbers - an 81-byte string holding
+        each cell's number (0 for empty) in row-major order, as SudokuBoard.key does
+        (one byte per cell for other sizes).
+        """
+        return self.cells.tostring()
+
+    def __getitem__(self, index):
+        """
+        Returns the number in a cell - or None if the cell is empty.
+        """
+        return self.cells[index] or None
+
+    def __eq__(self, other):
+        """
+        Boards are equal when all cells are equal.
+        """
+        return self.cells == other.cells
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """
+        Hash by value, consistent with equality - see SudokuBoard.__hash__.
+        """
+        return hash(self.cells.tostring())
+
+    def __unicode__(self):
+        layout = self.layout
+        box_size = layout.box_size
+        chars = '-' + layout.cell_chars[1:]
+        separator = '+'.join(['-' * (box_size * 2 + 1)] * box_size)[1:-1] + '\n'
+        board = ""
+        for row_num, row in enumerate(layout.rows):
+            numbers = [chars[self.cells[index]] for index in row]
+            board += '{}\n'.format(' | '.join(
+                ' '.join(numbers[start:start + box_size]) for start in range(0, layout.size, box_size)
+            ))
+            if row_num % box_size == box_size - 1 and row_num < layout.size - 1:
+                board += separator
+        return board
+
+    def __repr__(self):
+        return unicode(self)
@@ -0,0 +1,161 @@
+"""
+Board layouts by box size - the index tables of boards made of box_size x box_size boxes.
+
+A box size of 3 is the standard 9x9 board. A box size of 2 gives 4x4 boards, 4 gives
+16x16 boards and 5 gives 25x25 boards. Cells are referenced using a single index in
+row-major order, and numbers above 9 are written as letters - 'A' for 10 up to 'P' for 25.
+
+The tables of each size are computed once, the first time the size is used.
+"""
+
+from array import array
+
+from cell import POSSIBLE_NUMBERS, NUMBER_CHARS, MASK_NUMBERS, MASK_COUNTS, MASK_SINGLES, mask_numbers, mask_count, \
+    mask_single
+
+# Characters for empty cells in board strings.
+BLANKS = '.0-'
+MAX_BOX_SIZE = 5
+
+# The smallest array type holding 32-bit masks - 'L' is 64 bits on many platforms.
+WIDE_MASK_TYPE = 'I' if array('I').itemsize >= 4 else 'L'
+
+
+class _MaskTable(object):
+    """
+    A lookup "table" indexed by mask which computes each entry - for masks too wide
+    to tabulate.
+    """
+    __slots__ = ['function']
+
+    def __init__(self, function):
+        self.function = function
+
+    def __getitem__(self, mask):
+        return self.function(mask)
+
+
+class Layout(object):
+    """
+    The index tables of one board size.
+    """
+
+    def __init__(self, box_size):
+        if not 2 <= box_size <= MAX_BOX_SIZE:
+            raise ValueError("Box size must be from 2 to {} - not {}.".format(MAX_BOX_SIZE, box_size))
+        self.box_size = box_size
+        size = self.size = box_size * box_size
+        self.cell_count = size * size
+
+        self.numbers = POSSIBLE_NUMBERS if size == 9 else range(1, size + 1)
+        self.number_bits = [0] + [1 << (n - 1) for n in self.numbers]
+        self.full_mask = (1 << size) - 1
+        # Masks of up to 16 numbers fit in an unsigned short - wider ones need at least 32 bits.
+        self.mask_type = 'H' if size <= 16 else WIDE_MASK_TYPE
+        if size <= 9:
+            self.mask_numbers = MASK_NUMBERS
+            self.mask_counts = MASK_COUNTS
+            self.mask_singles = MASK_SINGLES
+        else:
+            self.mask_numbers = _MaskTable(mask_numbers)
+            self.mask_counts = _MaskTable(mask_count)
+            self.mask_singles = _MaskTable(mask_single)
+
+        self.rows = tuple(tuple(row * size + col for col in range(size)) for row in range(size))
+        self.cols = tuple(tuple(row * size + col for row in range(size)) for col in range(size))
+        self.boxes = tuple(
+            tuple(
+                (box // box_size) * box_size * size + (box % box_size) * box_size +
+                (minor // box_size) * size + minor % box_size
+                for minor in range(size)
+            )
+            for box in range(size)
+        )
+        # All houses, in the order SudokuBoard walks them: blocks, rows, then columns.
+        self.houses = self.boxes + self.rows + self.cols
+        self.house_names = ['Block'] * size + ['Row'] * size + ['Column'] * size
+
+        cells = range(self.cell_count)
+        self.cell_row = tuple(index // size for index in cells)
+        self.cell_col = tuple(index % size for index in cells)
+        self.cell_box = tuple((index // (size * box_size)) * box_size + (index % size) // box_size for index in cells)
+        # The numbers of the three houses of each cell, as indexes into houses.
+        self.cell_houses = tuple(
+            (self.cell_box[index], size + self.cell_row[index], 2 * size + self.cell_col[index]) for index in cells
+        )
+        # The other cells which share a row, column or box with each cell.
+        self.peers = tuple(
+            tuple(sorted(
+                set(self.rows[self.cell_row[index]] + self.cols[self.cell_col[index]] +
+                    self.boxes[self.cell_box[index]]) - set([index])
+            ))
+            for index in cells
+        )
+        # Cell indexes in SudokuBoard (major, minor) order.
+        self.block_order = tuple(index for box in self.boxes for index in box)
+
+        # The character for each number, with '.' for an empty cell, and the number for each character.
+        self.cell_chars = '.' + NUMBER_CHARS[:size]
+        self.char_numbers = dict((char, number) for number, char in enumerate(self.cell_chars) if number)
+        self.char_numbers.update((char.lower(), number) for char, number in self.char_numbers.items())
+
+    def parse_number(self, token):
+        """
+        Returns the number of a board file token - a number, a digit string, a letter
+        for numbers above 9 or a blank. Returns 0 for an empty cell, and None for a token
+        which is not a number of this size.
+        """
+        if not isinstance(token, basestring):
+            number = token or 0
+        else:
+            token = token.strip()
+            if not token or token in BLANKS:
+                return 0
+            if token.isdigit():
+                number = int(token)
+            else:
+                number = self.char_numbers.get(token)
+                if number is None:
+                    return None
+        return number if 0 <= number <= self.size else None
+
+    def __repr__(self):
+        return "Layout({}) - {}x{} board".format(self.box_size, self.size, self.size)
+
+
+_LAYOUTS = {}
+
+
+def get_layout(box_size=3):
+    """
+    Returns the layout of a box size, computing its tables the first time.
+    """
+    layout = _LAYOUTS.get(box_size)
+    if layout is None:
+        layout = _LAYOUTS[box_size] = Layout(box_size)
+    return layout
+
+
+def layout_for_size(size):
+    """
+    Returns the layout of boards with size numbers in each row - 4, 9, 16 or 25.
+    Raises ValueError for any other size.
+    """
+    box_size = int(round(size ** 0.5))
+    if box_size * box_size != size or not 2 <= box_size <= MAX_BOX_SIZE:
+        raise ValueError("No board has {} cells in a row.".format(size))
+    return get_layout(box_size)
+
+
+def layout_for_cells(cell_count):
+    """
+    Returns the layout of boards with cell_count cells - 16, 81, 256 or 625.
+    Raises ValueError for any other count.
+    """
+    size = int(round(cell_count ** 0.5))
+    if size * size != cell_count:
+        raise ValueError("No board has {} cells.".format(cell_count))
+    return layout_for_size(size)
+
+
+STANDARD = get_layout(3)
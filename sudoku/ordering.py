@@ -0,0 +1,30 @@
+"""
+Strategies for choosing the cells to branch on in the search.
+
+A strategy takes the empty cells of a board as a list of (position, possibles)
+pairs in block order, and returns the pairs to branch on in the order to try them.
+Every possible number of each returned cell becomes a next move.
+"""
+
+
+def block_order(cells):
+    """
+    Branch on every empty cell, in block order.
+    """
+    return cells
+
+
+def min_remaining(cells):
+    """
+    Branch only on the first cell with the fewest possibles (minimum remaining values).
+    One cell is enough - each of its possibles starts a separate part of the search.
+    """
+    best = None
+    for cell in cells:
+        if best is None or len(cell[1]) < len(best[1]):
+            best = cell
+            if len(best[1]) <= 1:
+                break
+    if best is None:
+        return []
+    return [best]
@@ -0,0 +1,199 @@
+"""
+Searching one board on several cores by splitting its search tree.
+
+The top of the tree is expanded breadth-first until it has a frontier of sub-boards -
+several per worker, so the work stays balanced when some subtrees are much larger than
+others. The sub-boards are then searched by worker processes sharing a queue, each taking
+the next sub-board as soon as it is idle.
+
+This is work sharing over a fixed frontier, not work stealing: a worker never splits the
+subtree it is searching, so once the queue runs dry idle workers stay idle, and the
+longest search is bounded below by the largest subtree however many cores there are.
+The engines search a sub-board in one call, with no way to hand back the unexplored
+moves of their stack - several sub-boards per worker keep the largest subtree small
+instead.
+
+As soon as any worker finds a solution, the workers are terminated, stopping the
+searches of the other subtrees. The workers are checked while waiting for results:
+a worker dying before posting its result raises WorkerError, and a search still
+waiting at its deadline stops as out of budget.
+
+Sub-boards cross the process boundary as strings (see SudokuGrid.to_string), and are
+searched by any engine - see sudoku.engines. The frontier branches on cells as the search
+engine does, which suits Dancing Links less: its own column choice can make a sub-board
+slower to search than the whole board.
+"""
+
+import multiprocessing
+import Queue
+import time
+from collections import deque
+from timeit import default_timer
+
+from batch import BatchResult, solve_string
+from board import SudokuBoard, InvalidBoard
+from engines import DEFAULT_ENGINE
+from grid import SudokuGrid
+from ordering import min_remaining
+from solver import SolveResult
+
+# Sub-boards in the frontier for each worker.
+SUBTREES_PER_WORKER = 8
+
+# Seconds between checks of the workers while waiting for a result.
+POLL_INTERVAL = 0.1
+
+
+class WorkerError(Exception):
+    pass
+
+
+def expand_frontier(board, size, ordering=min_remaining):
+    """
+    Expand the search tree of a board breadth-first until it has at least size leaves.
+    Returns a solution found on the way (or None), the unanalyzed leaves in search order,
+    and the number of boards analyzed. The passed-in board is not changed.
+    """
+    frontier = deque([board.copy()])
+    nodes = 0
+    while frontier and len(frontier) < size:
+        node = frontier.popleft()
+        nodes += 1
+        try:
+            node.analyze()
+        except InvalidBoard:
+            continue
+        if node.solved():
+            return node, [], nodes
+        frontier.extend(node.next_moves(ordering))
+    return None, list(frontier), nodes
+
+
+def _search_subtree(task):
+    """
+    Search one sub-board.
+    """
+    puzzle, engine, max_nodes, deadline = task
+    time_limit = None
+    if deadline is not None:
+        time_limit = deadline - time.time()
+        if time_limit <= 0:
+            return BatchResult(0, puzzle, None, 0, 0.0, True)
+    return solve_string(puzzle, engine=engine, max_nodes=max_nodes, time_limit=time_limit)
+
+
+def _worker(tasks, results):
+    """
+    Search sub-boards from the tasks queue until it gives None, putting each BatchResult
+    in the results queue.
+    """
+    for task in iter(tasks.get, None):
+        results.put(_search_subtree(task))
+
+
+class ParallelSolver(object):
+    """
+    Searches for a solution on several cores - with the same solve() API as sudoku.solver.Solver.
+    Worth it for boards whose search takes long: the frontier and the workers cost some time.
+    """
+
+    def __init__(self, workers=None, engine=DEFAULT_ENGINE, frontier_size=None, max_nodes=None, time_limit=None,
+                 ordering=min_remaining):
+        """
+        workers is the number of processes - None for one per CPU. Each sub-board is searched
+        by the named engine. frontier_size is the number of sub-boards to split the search
+        into - SUBTREES_PER_WORKER per worker if None. max_nodes bounds the search of each
+        sub-board, and time_limit (in seconds) the whole search - None means no limit.
+        The ordering strategy chooses the cells to branch on while expanding the frontier.
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.engine = engine
+        self.frontier_size = frontier_size or self.workers * SUBTREES_PER_WORKER
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.ordering = ordering
+        # The boards searched and whether the budget ran out, in the last search. Nodes of
+        # subtrees whose search was stopped by the solution are not counted.
+        self.nodes = 0
+        self.budget_exhausted = False
+        # The number of sub-boards of the last search.
+        self.subtrees = 0
+
+    def solve(self, board):
+        """
+        Search for a solution of the board and return a SolveResult.
+        The solution is the same board type as the passed-in board, which is not changed.
+        """
+        start = default_timer()
+        deadline = None if self.time_limit is None else time.time() + self.time_limit
+        grid = SudokuGrid.from_board(board) if isinstance(board, SudokuBoard) else board
+        solution, frontier, self.nodes = expand_frontier(grid, self.frontier_size, self.ordering)
+        self.subtrees = len(frontier)
+        self.budget_exhausted = False
+        if solution is None and frontier:
+            solution = self._search(frontier, deadline)
+        if solution is not None and isinstance(board, SudokuBoard):
+            solution = solution.to_board()
+        return SolveResult(
+            solution, solution is not None, self.nodes, default_timer() - start, self.budget_exhausted
+        )
+
+    def _search(self, frontier, deadline):
+        """
+        Search the sub-boards in worker processes and return the first solution found - or None.
+        """
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        for node in frontier:
+            tasks.put((node.to_string(), self.engine, self.max_nodes, deadline))
+        workers = [
+            multiprocessing.Process(target=_worker, args=(tasks, results))
+            for __ in range(min(self.workers, len(frontier)))
+        ]
+        for worker in workers:
+            tasks.put(None)
+            worker.start()
+        try:
+            for __ in frontier:
+                result = self._next_result(results, workers, deadline)
+                if result is None:
+                    self.budget_exhausted = True
+                    return None
+                self.nodes += result.nodes
+                if result.solution is not None:
+                    return SudokuGrid.from_string(result.solution)
+                self.budget_exhausted = self.budget_exhausted or result.budget_exhausted
+        finally:
+            # Stops the searches of the other subtrees once a solution is found.
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
+        return None
+
+    def _next_result(self, results, workers, deadline):
+        """
+        Waits for the next BatchResult of the workers - or None once the deadline passes.
+        Raises WorkerError if a worker dies, or all workers exit, before posting it.
+        """
+        while True:
+            timeout = POLL_INTERVAL
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.time())
+                if timeout <= 0:
+                    return None
+            try:
+                return results.get(timeout=timeout)
+            except Queue.Empty:
+                pass
+            for worker in workers:
+                if worker.exitcode:
+                    raise WorkerError("Worker {} exited with code {} before posting its result.".format(
+                        worker.pid, worker.exitcode
+                    ))
+            if not any(worker.is_alive() for worker in workers):
+                # Results put by a worker are flushed before it exits.
+                try:
+                    return results.get(False)
+                except Queue.Empty:
+                    raise WorkerError("All workers exited before posting every result.")
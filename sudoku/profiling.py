@@ -0,0 +1,251 @@
+"""
+Opt-in profiling of the phases of a search - call counts and cumulative time for each
+board method (verify, reset_possibles, set_possibles, set_obvious, copy, next_moves,
+branch, ...) and for each deduction rule.
+
+Profiling wraps the methods of the board classes only while a PhaseProfiler is enabled,
+so there is no overhead at all when it is off:
+
+    with PhaseProfiler() as profiler:
+        result, summary = profiler.profile_solve(board)
+    print profiler.report()
+
+Phases nest - analyze() includes the verify() and set_possibles() it calls, and
+next_moves() the copies of branching - so the times of different phases do not add up
+to the total.
+
+A profiler counts only the calls made by the thread which enabled it - other threads
+call through the wrapped methods untimed. Nor does it see other processes: the worker
+processes of sudoku.batch.solve_batch and sudoku.parallel are not profiled, so profile
+inside a worker to cover them - as benchmarks.suite does for each tier.
+"""
+
+from collections import defaultdict
+from inspect import isgeneratorfunction
+from thread import get_ident
+from timeit import default_timer
+
+from board import SudokuBoard
+from engines import DEFAULT_ENGINE, make_solver
+from grid import SudokuGrid
+from rules import Rule
+
+# The methods profiled by default, as (class, method name) pairs.
+DEFAULT_PHASES = [
+    (SudokuBoard, 'analyze'),
+    (SudokuBoard, 'verify'),
+    (SudokuBoard, 'reset_possibles'),
+    (SudokuBoard, 'set_possibles'),
+    (SudokuBoard, 'set_obvious'),
+    (SudokuBoard, 'copy'),
+    (SudokuBoard, 'branch_cells'),
+    (SudokuBoard, 'next_moves'),
+    (SudokuGrid, 'analyze'),
+    (SudokuGrid, 'verify'),
+    (SudokuGrid, 'reset_possibles'),
+    (SudokuGrid, 'set_possibles'),
+    (SudokuGrid, 'set_obvious'),
+    (SudokuGrid, '_start_propagation'),
+    (SudokuGrid, 'assign'),
+    (SudokuGrid, 'copy'),
+    (SudokuGrid, 'branch_cells'),
+    (SudokuGrid, 'branch'),
+    (SudokuGrid, 'next_moves'),
+]
+
+# The profiler currently enabled - only one can wrap the methods at a time.
+_enabled = None
+
+
+class PhaseProfiler(object):
+    """
+    Counts the calls and cumulative time of each phase while enabled.
+    """
+
+    def __init__(self, phases=None, rules=True):
+        """
+        phases is a list of (class, method name) pairs to profile - DEFAULT_PHASES if None.
+        With rules=True, each deduction rule of a DeductionPipeline is also a phase.
+        """
+        self.phases = DEFAULT_PHASES if phases is None else list(phases)
+        self.rules = rules
+        self.originals = []
+        # The thread whose calls are counted, while enabled.
+        self.thread = None
+        # Phase name -> [calls, seconds].
+        self.stats = defaultdict(lambda: [0, 0.0])
+
+    def reset(self):
+        """
+        Clear the counters - the wrapped methods keep counting into the same dictionary.
+        """
+        self.stats.clear()
+
+    @property
+    def enabled(self):
+        return _enabled is self
+
+    def enable(self):
+        """
+        Wrap the profiled methods, counting the calls of the calling thread.
+        Raises RuntimeError if another profiler is enabled.
+        """
+        global _enabled
+        if _enabled is self:
+            return
+        if _enabled is not None:
+            raise RuntimeError("Another PhaseProfiler is already enabled.")
+        self.thread = get_ident()
+        for owner, name in self.phases:
+            self._wrap(owner, name, '{}.{}'.format(owner.__name__, name))
+        if self.rules:
+            self._wrap(Rule, 'apply', None)
+        _enabled = self
+
+    def disable(self):
+        """
+        Restore the profiled methods.
+        """
+        global _enabled
+        if _enabled is not self:
+            return
+        for owner, name, original in reversed(self.originals):
+            setattr(owner, name, original)
+        self.originals = []
+        self.thread = None
+        _enabled = None
+
+    def _wrap(self, owner, name, phase):
+        """
+        Replace a method with one which times it when called by the profiled thread.
+        A phase of None names the phase after the rule the method is called on.
+        A generator method - such as next_moves() - counts one call and the time of
+        every step of its generator.
+        """
+        method = owner.__dict__[name]
+        stats = self.stats
+        timer = default_timer
+        thread = self.thread
+
+        def timed(self, *args, **kwargs):
+            if get_ident() != thread:
+                return method(self, *args, **kwargs)
+            start = timer()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                entry = stats[phase or 'rule: {}'.format(self.name)]
+                entry[0] += 1
+                entry[1] += timer() - start
+
+        def timed_steps(generator, entry):
+            while True:
+                start = timer()
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    entry[1] += timer() - start
+                    return
+                entry[1] += timer() - start
+                yield item
+
+        def timed_generator(self, *args, **kwargs):
+            generator = method(self, *args, **kwargs)
+            if get_ident() != thread:
+                return generator
+            entry = stats[phase or 'rule: {}'.format(self.name)]
+            entry[0] += 1
+            return timed_steps(generator, entry)
+
+        if isgeneratorfunction(method):
+            timed = timed_generator
+        timed.__name__ = method.__name__
+        timed.__doc__ = method.__doc__
+        self.originals.append((owner, name, method))
+        setattr(owner, name, timed)
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+
+    def summary(self):
+        """
+        Returns the counters of each phase as a dictionary of phase name to
+        {'calls': ..., 'seconds': ...} - ready to be saved as JSON.
+        """
+        return dict(
+            (phase, {'calls': calls, 'seconds': seconds}) for phase, (calls, seconds) in self.stats.items()
+        )
+
+    def _snapshot(self):
+        return dict((phase, tuple(entry)) for phase, entry in self.stats.items())
+
+    def _since(self, snapshot):
+        """
+        Returns the counters of the phases called since a snapshot, as in summary().
+        """
+        phases = {}
+        for phase, (calls, seconds) in self.stats.items():
+            old_calls, old_seconds = snapshot.get(phase, (0, 0.0))
+            if calls != old_calls:
+                phases[phase] = {'calls': calls - old_calls, 'seconds': seconds - old_seconds}
+        return phases
+
+    def profile_solve(self, board, engine=DEFAULT_ENGINE, **options):
+        """
+        Solve a board with the profiler enabled and return the SolveResult and the
+        summary of this solve alone. The options are passed to make_solver().
+        """
+        before = self._snapshot()
+        was_enabled = self.enabled
+        self.enable()
+        try:
+            result = make_solver(engine, **options).solve(board)
+        finally:
+            if not was_enabled:
+                self.disable()
+        return result, {
+            'nodes': result.nodes,
+            'elapsed': result.elapsed,
+            'solved': result.solved,
+            'phases': self._since(before),
+        }
+
+    def profile_batch(self, boards, engine=DEFAULT_ENGINE, **options):
+        """
+        Solve boards one by one in this process with the profiler enabled.
+        Returns the SolveResults, the summary of each solve and the summary of the batch.
+        This profiles the in-process search only - not the workers of solve_batch.
+        """
+        results = []
+        summaries = []
+        before = self._snapshot()
+        start = default_timer()
+        for board in boards:
+            result, summary = self.profile_solve(board, engine, **options)
+            results.append(result)
+            summaries.append(summary)
+        return results, summaries, {
+            'boards': len(results),
+            'solved': sum(1 for result in results if result.solved),
+            'nodes': sum(result.nodes for result in results),
+            'elapsed': default_timer() - start,
+            'phases': self._since(before),
+        }
+
+    def report(self, summary=None):
+        """
+        Returns a table of the phases of a summary - by default all those counted so far -
+        slowest first.
+        """
+        phases = self.summary() if summary is None else summary.get('phases', summary)
+        lines = ['{:>32} {:>10} {:>12} {:>12}'.format('phase', 'calls', 'total ms', 'per call us')]
+        for phase, counters in sorted(phases.items(), key=lambda item: -item[1]['seconds']):
+            calls, seconds = counters['calls'], counters['seconds']
+            lines.append('{:>32} {:>10} {:>12.2f} {:>12.2f}'.format(
+                phase, calls, seconds * 1000, seconds * 1e6 / calls if calls else 0.0
+            ))
+        return '\n'.join(lines)
@@ -0,0 +1,146 @@
+"""
+Sample Sudoku boards in BRD string form, boards which are hard for the search engine,
+known solutions and a corpus of boards made from them, and shuffled solved boards of any size.
+"""
+
+import random
+
+from layout import get_layout
+
+DEMO_BOARDS = [
+"""
+2-3--4-7-
+19-73-8--
+-7--2-943
+96------8
+--2---5--
+8------21
+539-4--1-
+--8-17-59
+-1-3--2-4
+""",
+"""
+5---4---7
+--6--5--4
+2---1-695
+--8----6-
+-6--7--1-
+-9----5--
+873-5---9
+6--9--7--
+1---3---6
+""",
+# "Evil" board: http://www.websudoku.com/?level=4&set_id=9074109009
+"""
+5----91-8
+-----8--7
+--82---56
+-----3-2-
+3-------1
+-2-1-----
+94---18--
+2--6-----
+1-53----4
+""",
+# http://www.websudoku.com/?level=4&set_id=9074109009
+"""
+----5-42-
+---6-----
+91-3-7---
+--71----5
+-8-----9-
+6----23--
+---5-9-71
+-----6---
+-65-3----
+""",
+"""
+---------
+---------
+---------
+---------
+----1----
+---------
+---------
+---------
+---------
+""",
+"""
+---------
+---------
+---------
+---------
+---------
+---------
+---------
+---------
+---------
+"""
+]
+
+# Boards which take the search engine over a thousand nodes - one to solve, one to find
+# without a solution - as 81-character strings.
+HARD_BOARD = '..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9'
+NO_SOLUTION_BOARD = '..............3.857.1.2.......5.7.....4...1...9.......5......73..2.1........4...9'
+
+HARD_BOARDS = [
+    ('hard', HARD_BOARD),
+    ('no solution', NO_SOLUTION_BOARD),
+]
+
+# Solved boards as 81-character strings.
+SOLUTIONS = [
+    '283964175194735862675821943961572438342186597857493621539248716428617359716359284',
+    '581649327936725184247318695718593462365274918492861573873156249654982731129437856',
+    '572469138691538247438217956814973625359826471726145389943751862287694513165382794',
+    '376851429528694713914327856497183265283465197651972384832549671749216538165738942',
+]
+
+
+def corpus(seed=1234, per_solution=25):
+    """
+    Returns the demo boards plus boards made by removing clues from SOLUTIONS, some of
+    them with a few random (possibly conflicting) numbers added - as 81-character strings.
+    """
+    rng = random.Random(seed)
+    puzzles = [''.join(brdstring.split()).replace('-', '.') for brdstring in DEMO_BOARDS]
+    for solution in SOLUTIONS:
+        for __ in range(per_solution):
+            numbers = [int(char) for char in solution]
+            for index in rng.sample(range(81), rng.randint(45, 64)):
+                numbers[index] = 0
+            puzzles.append(''.join(str(number) if number else '.' for number in numbers))
+            for index in rng.sample(range(81), 3):
+                numbers[index] = rng.randint(1, 9)
+            puzzles.append(''.join(str(number) if number else '.' for number in numbers))
+    return puzzles
+
+
+def shuffled_solution(box_size=3, rng=None):
+    """
+    Returns a solved board of a box size as a string - see SudokuGrid.from_string.
+    The board is a fixed pattern with its numbers relabelled and its rows and columns
+    shuffled within and between bands, so every call gives a different valid board.
+    """
+    rng = rng or random.Random()
+    layout = get_layout(box_size)
+    size = layout.size
+
+    def shuffled_lines():
+        bands = range(box_size)
+        rng.shuffle(bands)
+        lines = []
+        for band in bands:
+            offsets = range(box_size)
+            rng.shuffle(offsets)
+            lines.extend(band * box_size + offset for offset in offsets)
+        return lines
+
+    numbers = range(1, size + 1)
+    rng.shuffle(numbers)
+    rows = shuffled_lines()
+    cols = shuffled_lines()
+    return ''.join(
+        layout.cell_chars[numbers[(box_size * (row % box_size) + row // box_size + col) % size]]
+        for row in rows for col in cols
+    )
@@ -0,0 +1,304 @@
+"""
+Deduction rules which eliminate possible numbers from an analyzed SudokuGrid.
+
+A DeductionPipeline runs its rules in a configurable order until none of them can
+make progress. Each rule counts its calls, the possibles it eliminated and the time
+it took, so the order can be tuned for throughput.
+"""
+
+from itertools import combinations
+from timeit import default_timer
+
+from board import InvalidBoard
+from cell import POSSIBLE_NUMBERS, FULL_MASK, NUMBER_BITS, MASK_NUMBERS, MASK_COUNTS, MASK_SINGLES
+from grid import HOUSES, HOUSE_NAMES, BOXES, ROWS, COLS
+from layout import STANDARD
+
+SUBSET_NAMES = {2: 'pairs', 3: 'triples', 4: 'quads'}
+
+# Each intersection of a box with a row or column, as the three cells in both,
+# the other cells of the row or column, and the other cells of the box.
+INTERSECTIONS = tuple(
+    (
+        tuple(index for index in box if index in line),
+        tuple(index for index in line if index not in box),
+        tuple(index for index in box if index not in line),
+    )
+    for box in BOXES for line in ROWS + COLS if set(box) & set(line)
+)
+
+
+def _union(masks, indexes):
+    """
+    Returns the union of the possibles of the cells.
+    """
+    mask = 0
+    for index in indexes:
+        mask |= masks[index]
+    return mask
+
+
+class Rule(object):
+    """
+    A deduction rule. Subclasses implement deduce(), which works on the possibles of
+    the grid's masks and returns the number of possibles eliminated - each number
+    placed counts as one.
+    """
+    name = None
+
+    def __init__(self):
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.calls = 0
+        self.eliminations = 0
+        self.elapsed = 0.0
+
+    def apply(self, grid):
+        """
+        Run the rule once over the grid, updating the rule's counters.
+        """
+        start = default_timer()
+        try:
+            eliminated = self.deduce(grid)
+        finally:
+            self.calls += 1
+            self.elapsed += default_timer() - start
+        self.eliminations += eliminated
+        return eliminated
+
+    def deduce(self, grid):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return "{} - {} calls, {} eliminations, {:.3f} ms".format(
+            self.name, self.calls, self.eliminations, self.elapsed * 1000
+        )
+
+
+class NakedSingles(Rule):
+    """
+    A cell with a single possible number is set to it.
+    """
+    name = 'naked singles'
+
+    def deduce(self, grid):
+        cells = grid.cells
+        masks = grid.masks
+        placed = 0
+        for index in range(81):
+            if not cells[index]:
+                number = MASK_SINGLES[masks[index]]
+                if number is not None:
+                    grid.assign(index, number)
+                    placed += 1
+        return placed
+
+
+class HiddenSingles(Rule):
+    """
+    A number which is possible in only one cell of a house is set in that cell.
+    """
+    name = 'hidden singles'
+
+    def deduce(self, grid):
+        cells = grid.cells
+        masks = grid.masks
+        placed = 0
+        for house_num, house in enumerate(HOUSES):
+            used = once = twice = 0
+            for index in house:
+                if cells[index]:
+                    used |= NUMBER_BITS[cells[index]]
+                else:
+                    twice |= once & masks[index]
+                    once |= masks[index]
+            if once | used != FULL_MASK:
+                raise InvalidBoard('{} {} has no place for a number.\nBoard:\n{}'.format(
+                    HOUSE_NAMES[house_num], house_num % 9, grid
+                ))
+            hidden = once & ~twice & ~used
+            if not hidden:
+                continue
+            for index in house:
+                mask = masks[index] & hidden
+                if mask and not cells[index]:
+                    number = MASK_SINGLES[mask]
+                    if number is None:
+                        raise InvalidBoard('Cell {} is the only place for several numbers.\nBoard:\n{}'.format(
+                            index, grid
+                        ))
+                    grid.assign(index, number)
+                    placed += 1
+        return placed
+
+
+class NakedSubsets(Rule):
+    """
+    When N cells of a house have only N possible numbers between them, those numbers
+    are eliminated from the other cells of the house.
+    """
+
+    def __init__(self, size=2):
+        self.size = size
+        self.name = 'naked {}'.format(SUBSET_NAMES.get(size, size))
+        super(NakedSubsets, self).__init__()
+
+    def deduce(self, grid):
+        cells = grid.cells
+        masks = grid.masks
+        size = self.size
+        eliminated = 0
+        for house in HOUSES:
+            candidates = [index for index in house if not cells[index] and MASK_COUNTS[masks[index]] <= size]
+            if len(candidates) < size:
+                continue
+            for subset in combinations(candidates, size):
+                union = 0
+                for index in subset:
+                    union |= masks[index]
+                if MASK_COUNTS[union] < size:
+                    raise InvalidBoard('{} cells share fewer than {} possible values.\nBoard:\n{}'.format(
+                        size, size, grid
+                    ))
+                if MASK_COUNTS[union] == size:
+                    for index in house:
+                        if not cells[index] and index not in subset:
+                            eliminated += grid.eliminate(index, union)
+        return eliminated
+
+
+class HiddenSubsets(Rule):
+    """
+    When N numbers are possible in only N cells of a house between them, the other
+    possible numbers of those cells are eliminated.
+    """
+
+    def __init__(self, size=2):
+        self.size = size
+        self.name = 'hidden {}'.format(SUBSET_NAMES.get(size, size))
+        super(HiddenSubsets, self).__init__()
+
+    def deduce(self, grid):
+        masks = grid.masks
+        size = self.size
+        eliminated = 0
+        for house in HOUSES:
+            # The positions within the house where each number is possible, as a bitmask.
+            positions = [0] * 10
+            for position, index in enumerate(house):
+                for number in MASK_NUMBERS[masks[index]]:
+                    positions[number] |= 1 << position
+            numbers = [number for number in POSSIBLE_NUMBERS if 2 <= MASK_COUNTS[positions[number]] <= size]
+            for subset in combinations(numbers, size):
+                union = 0
+                for number in subset:
+                    union |= positions[number]
+                if MASK_COUNTS[union] == size:
+                    keep = 0
+                    for number in subset:
+                        keep |= NUMBER_BITS[number]
+                    for position, index in enumerate(house):
+                        if union & (1 << position):
+                            eliminated += grid.eliminate(index, FULL_MASK & ~keep)
+        return eliminated
+
+
+class PointingPairs(Rule):
+    """
+    When a number's possible cells within a box all lie in one row or column,
+    the number is eliminated from the rest of that row or column.
+    """
+    name = 'pointing pairs'
+
+    def deduce(self, grid):
+        masks = grid.masks
+        eliminated = 0
+        for inside, line_rest, box_rest in INTERSECTIONS:
+            pointing = _union(masks, inside) & ~_union(masks, box_rest)
+            if pointing:
+                for index in line_rest:
+                    eliminated += grid.eliminate(index, pointing)
+        return eliminated
+
+
+class BoxLineReduction(Rule):
+    """
+    When a number's possible cells within a row or column all lie in one box,
+    the number is eliminated from the rest of that box.
+    """
+    name = 'box/line reduction'
+
+    def deduce(self, grid):
+        masks = grid.masks
+        eliminated = 0
+        for inside, line_rest, box_rest in INTERSECTIONS:
+            claimed = _union(masks, inside) & ~_union(masks, line_rest)
+            if claimed:
+                for index in box_rest:
+                    eliminated += grid.eliminate(index, claimed)
+        return eliminated
+
+
+def default_rules():
+    """
+    Returns new instances of all the rules, cheapest first.
+    """
+    return [
+        NakedSingles(),
+        HiddenSingles(),
+        NakedSubsets(2),
+        PointingPairs(),
+        BoxLineReduction(),
+        HiddenSubsets(2),
+        NakedSubsets(3),
+        HiddenSubsets(3),
+    ]
+
+
+class DeductionPipeline(object):
+    """
+    Runs deduction rules in order until none of them can make progress.
+    Whenever a rule eliminates anything, the pipeline starts again from the first rule,
+    so cheap rules should come first.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = default_rules() if rules is None else list(rules)
+
+    def run(self, grid):
+        """
+        Apply the rules to an analyzed grid until a fixpoint.
+        Returns the total number of possibles eliminated.
+        Raises InvalidBoard if a rule finds a contradiction, and ValueError for boards
+        other than 9x9.
+        """
+        if grid.layout is not STANDARD:
+            raise ValueError("The deduction rules only work on 9x9 boards.")
+        rules = self.rules
+        total = 0
+        position = 0
+        while position < len(rules):
+            eliminated = rules[position].apply(grid)
+            if eliminated:
+                total += eliminated
+                position = 0
+            else:
+                position += 1
+        return total
+
+    def stats(self):
+        """
+        Returns the counters of each rule as a list of (name, calls, eliminations, elapsed) tuples.
+        """
+        return [(rule.name, rule.calls, rule.eliminations, rule.elapsed) for rule in self.rules]
+
+    def reset_stats(self):
+        for rule in self.rules:
+            rule.reset_stats()
+
+    def __unicode__(self):
+        return '\n'.join(repr(rule) for rule in self.rules)
+
+    def __repr__(self):
+        return unicode(self)
@@ -0,0 +1,384 @@
+"""
+A local solving service - line-delimited JSON over TCP on localhost or a Unix socket.
+
+Each request is a line holding a JSON object, with optional id, timeout (seconds),
+max_nodes and engine:
+
+    {"id": 1, "puzzle": "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79", "timeout": 2}
+
+and each response a line sent as soon as the board is solved. A connection's requests
+are solved concurrently, so responses can come in any order - match them by id:
+
+    {"id": 1, "status": "solved", "solution": "534678912...", "nodes": 4, "elapsed": 0.003, "latency": 0.004}
+
+status is "solved", "unsolvable", "timeout" (the deadline passed), "budget_exhausted"
+(the node budget ran out), "cancelled" or "error" (with an "error" message). elapsed is
+the search time and latency the time from receiving the request to sending the response.
+{"cancel": 1} cancels request 1, which is answered as cancelled at once.
+
+Connections are served by threads and boards are solved in a pool of worker processes,
+so a long search never holds up other requests. Each connection's thread writes its own
+responses - the pool only hands results over to it - so a client which stops reading
+holds up nobody else. The timeout is a deadline counted from when the request is
+received: the connection answers "timeout" as soon as it passes, whether the request is
+running, still queued or lost with a worker which died. A running search stops itself
+at the deadline, and a request still queued by then is not searched at all. A cancelled
+request - or one whose client disconnected - is stopped the same way: it is not searched
+if still queued, and a running search gives up at its next node, freeing its worker.
+
+    python -m sudoku.service --port 8765 --workers 4
+    python -m sudoku.service --unix /tmp/sudoku.sock
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import SocketServer
+import threading
+import time
+from collections import deque, namedtuple
+from itertools import count
+
+from batch import solve_string
+from board import BoardParseError
+from engines import ENGINES, DEFAULT_ENGINE
+from grid import SudokuGrid
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 10.0
+
+# The number of cancelled tickets the workers can see - the oldest are forgotten first.
+CANCEL_SLOTS = 4096
+
+# Seconds between checks of a connection's pending requests while it waits for results.
+POLL_INTERVAL = 0.1
+
+# A request sent to the pool:
+# - ticket: the number to cancel it with.
+# - deadline: the time.time() at which it times out.
+# - result: the AsyncResult of its search.
+Submission = namedtuple('Submission', ['ticket', 'deadline', 'result'])
+
+# The cancelled tickets shared with the service, in a worker process - ticket t is
+# cancelled when slot t % CANCEL_SLOTS holds t. Set once by _init_worker.
+_cancelled = None
+
+
+def _init_worker(cancelled):
+    """
+    Keep the shared cancelled tickets in a worker process.
+    """
+    global _cancelled
+    _cancelled = cancelled
+
+
+def _is_cancelled(ticket):
+    return _cancelled[ticket % CANCEL_SLOTS] == ticket
+
+
+def _solve_request(ticket, puzzle, engine, max_nodes, deadline):
+    """
+    Solve one request's board in a worker process and return the fields of its response -
+    an error response for any exception, so that a response is always sent back.
+    """
+    try:
+        if _is_cancelled(ticket):
+            return {'status': 'cancelled'}
+        time_limit = deadline - time.time()
+        if time_limit <= 0:
+            # Answered as timed out by its connection already.
+            return {'status': 'timeout'}
+        result = solve_string(
+            puzzle, engine=engine, max_nodes=max_nodes, time_limit=time_limit, stop=lambda: _is_cancelled(ticket)
+        )
+        if result.solution is not None:
+            status = 'solved'
+        elif result.budget_exhausted and _is_cancelled(ticket):
+            status = 'cancelled'
+        elif result.budget_exhausted and time.time() >= deadline:
+            status = 'timeout'
+        elif result.budget_exhausted:
+            status = 'budget_exhausted'
+        else:
+            status = 'unsolvable'
+        return {'status': status, 'solution': result.solution, 'nodes': result.nodes, 'elapsed': result.elapsed}
+    except Exception as error:
+        return {'status': 'error', 'error': str(error)}
+
+
+class SolvingService(object):
+    """
+    Solves the requests of any number of connections in a pool of worker processes.
+    """
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT, max_nodes=None, engine=DEFAULT_ENGINE):
+        """
+        workers is the number of processes - None for one per CPU. timeout, max_nodes
+        and engine are the defaults of requests which don't give their own.
+        """
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.engine = engine
+        # Written by cancel() and read by the workers at each search node, without locking -
+        # a slot only ever holds one whole ticket.
+        self.cancelled = multiprocessing.RawArray('l', CANCEL_SLOTS)
+        self.tickets = count(1)
+        self.pool = multiprocessing.Pool(workers, _init_worker, (self.cancelled,))
+
+    def submit(self, request, received, respond):
+        """
+        Check a request and send it to the pool. respond(fields) is called with the fields
+        of the response - from the pool's result thread, so it must not block, unless the
+        request is rejected at once. It is not called at all if the worker dies.
+        Returns the Submission of the request - or None if it was rejected.
+        """
+        try:
+            puzzle = request['puzzle']
+            if not isinstance(puzzle, basestring) or len(puzzle) != 81:
+                raise ValueError("The puzzle must be an 81-character string.")
+            SudokuGrid.from_string(str(puzzle))
+            engine = request.get('engine', self.engine)
+            if engine not in ENGINES:
+                raise ValueError("Unknown engine '{}' - expected one of {}.".format(engine, ', '.join(sorted(ENGINES))))
+            timeout = float(request.get('timeout', self.timeout))
+            max_nodes = request.get('max_nodes', self.max_nodes)
+            if max_nodes is not None:
+                max_nodes = int(max_nodes)
+        except KeyError:
+            respond({'status': 'error', 'error': "The request has no puzzle."})
+            return None
+        except (TypeError, ValueError, BoardParseError) as error:
+            respond({'status': 'error', 'error': str(error)})
+            return None
+        ticket = next(self.tickets)
+        deadline = received + timeout
+        result = self.pool.apply_async(
+            _solve_request, (ticket, str(puzzle), str(engine), max_nodes, deadline), callback=respond
+        )
+        return Submission(ticket, deadline, result)
+
+    def cancel(self, ticket):
+        """
+        Stop the search of a submitted request - at once if it is still queued, otherwise
+        at its next search node. Its response is still sent, with status "cancelled"
+        unless it finished first.
+        """
+        self.cancelled[ticket % CANCEL_SLOTS] = ticket
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        self.pool.terminate()
+        self.pool.join()
+
+
+class _ConnectionHandler(SocketServer.StreamRequestHandler):
+    """
+    Reads the requests of one connection on a reader thread, and writes their responses
+    as they complete on the connection's own thread.
+    """
+
+    def handle(self):
+        self.lock = threading.Condition()
+        self.reading = True
+        self.connected = True
+        # Request number -> [id, time received, Submission] of each request not answered
+        # yet - the Submission is None while the request is being submitted.
+        self.pending = {}
+        # The (id, time received, fields) of the responses to write.
+        self.outbox = deque()
+        reader = threading.Thread(target=self.read_requests)
+        reader.daemon = True
+        reader.start()
+        try:
+            self.write_responses()
+        finally:
+            with self.lock:
+                self.connected = False
+                # Nobody is left to answer - stop the searches of the client which disconnected.
+                abandoned = self.pending.values()
+                self.pending.clear()
+            for __, __, submission in abandoned:
+                if submission is not None:
+                    self.server.service.cancel(submission.ticket)
+
+    def finish(self):
+        try:
+            SocketServer.StreamRequestHandler.finish(self)
+        except socket.error:
+            # The client is gone - the responses not written yet are dropped.
+            pass
+
+    def read_requests(self):
+        """
+        Read the requests of the connection until the client stops sending.
+        """
+        request_num = 0
+        while True:
+            try:
+                line = self.rfile.readline()
+            except socket.error:
+                with self.lock:
+                    self.connected = False
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+            received = time.time()
+            request_num += 1
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A request must be a JSON object.")
+            except ValueError as error:
+                self.respond(None, received, {'status': 'error', 'error': str(error)})
+                continue
+            if 'cancel' in request:
+                self.cancel(request['cancel'])
+                continue
+            with self.lock:
+                self.pending[request_num] = [request.get('id'), received, None]
+            submission = self.server.service.submit(request, received, self._responder(request_num))
+            with self.lock:
+                if request_num in self.pending:
+                    self.pending[request_num][2] = submission
+        # The client has stopped sending - its requests are answered before closing.
+        with self.lock:
+            self.reading = False
+            self.lock.notify_all()
+
+    def write_responses(self):
+        """
+        Write the responses as they come, answering the requests past their deadline as
+        timed out, until every request is answered or the client is gone.
+        """
+        while True:
+            with self.lock:
+                self._expire(time.time())
+                while not self.outbox and self.connected and (self.reading or self.pending):
+                    self.lock.wait(POLL_INTERVAL)
+                    self._expire(time.time())
+                if not self.connected or not self.outbox:
+                    return
+                responses = list(self.outbox)
+                self.outbox.clear()
+            for request_id, received, fields in responses:
+                response = {'id': request_id}
+                response.update(fields)
+                response['latency'] = time.time() - received
+                try:
+                    self.wfile.write(json.dumps(response) + '\n')
+                except socket.error:
+                    return
+            try:
+                self.wfile.flush()
+            except socket.error:
+                return
+
+    def _expire(self, now):
+        """
+        Answer the pending requests whose deadline has passed as timed out, and those
+        whose search failed without a result as errors. Called holding the lock.
+        """
+        for request_num, (request_id, received, submission) in sorted(self.pending.items()):
+            if submission is None:
+                continue
+            if now >= submission.deadline:
+                fields = {'status': 'timeout', 'solution': None}
+                self.server.service.cancel(submission.ticket)
+            elif submission.result.ready() and not submission.result.successful():
+                fields = {'status': 'error', 'error': "The search failed."}
+            else:
+                continue
+            del self.pending[request_num]
+            self.outbox.append((request_id, received, fields))
+
+    def _responder(self, request_num):
+        def respond(fields):
+            with self.lock:
+                entry = self.pending.pop(request_num, None)
+                if entry is not None:
+                    self.outbox.append((entry[0], entry[1], fields))
+                    self.lock.notify_all()
+        return respond
+
+    def cancel(self, request_id):
+        """
+        Answer the pending requests with an id as cancelled and stop their searches -
+        their results are dropped.
+        """
+        with self.lock:
+            cancelled = [(request_num, entry) for request_num, entry in self.pending.items() if entry[0] == request_id]
+            for request_num, (__, received, submission) in sorted(cancelled):
+                del self.pending[request_num]
+                if submission is not None:
+                    self.server.service.cancel(submission.ticket)
+                self.outbox.append((request_id, received, {'status': 'cancelled'}))
+            self.lock.notify_all()
+
+    def respond(self, request_id, received, fields):
+        """
+        Queue a response for the connection's thread to write.
+        """
+        with self.lock:
+            self.outbox.append((request_id, received, fields))
+            self.lock.notify_all()
+
+
+class SolvingServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    """
+    Serves a SolvingService over TCP - bind it to localhost only.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, service):
+        self.service = service
+        SocketServer.TCPServer.__init__(self, address, _ConnectionHandler)
+
+
+if hasattr(SocketServer, 'UnixStreamServer'):
+    class UnixSolvingServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+        """
+        Serves a SolvingService over a Unix socket.
+        """
+        daemon_threads = True
+
+        def __init__(self, path, service):
+            self.service = service
+            SocketServer.UnixStreamServer.__init__(self, path, _ConnectionHandler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve solving requests as line-delimited JSON.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument('--unix', help="Unix socket path to listen on instead of TCP")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE, help="default solving engine")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="default timeout per request, in seconds")
+    parser.add_argument('--max-nodes', type=int, default=None, help="default node budget per request")
+    args = parser.parse_args(argv)
+
+    service = SolvingService(args.workers, timeout=args.timeout, max_nodes=args.max_nodes, engine=args.engine)
+    if args.unix:
+        if os.path.exists(args.unix):
+            os.remove(args.unix)
+        server = UnixSolvingServer(args.unix, service)
+    else:
+        server = SolvingServer((args.host, args.port), service)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+An interactive solving session - a board edited one number at a time, as in an editor.
+
+The session keeps, for every cell, the mask of numbers not yet placed among its peers.
+Placing a number only clears its bit from the masks of the cell's 20 peers, and the
+peers actually changed are pushed on a trail with the move, so undo() restores exactly
+those masks. Counts of conflicting placements and of empty cells left without
+candidates, and the set of empty cells with a single candidate, are kept up to date
+along the way - so candidates(), is_consistent() and most hint() calls never walk the
+board.
+
+    session = SolvingSession(SudokuGrid.from_string(puzzle))
+    session.place(0, 5)
+    session.candidates(1)
+    session.hint()
+    session.undo()
+
+Placed numbers may conflict with their peers, as a player's can: the session records the
+conflict instead of refusing the move.
+"""
+
+from array import array
+
+from board import SudokuBoard
+from grid import SudokuGrid
+
+
+class SolvingSession(object):
+    """
+    The state of a board being solved interactively, with undo.
+    Cells are referenced by index in row-major order - see sudoku.grid.
+    """
+
+    def __init__(self, board):
+        """
+        Start a session on a SudokuBoard or SudokuGrid, whose numbers are the givens.
+        The passed-in board is not changed.
+        """
+        grid = SudokuGrid.from_board(board) if isinstance(board, SudokuBoard) else board
+        layout = self.layout = grid.layout
+        self.peers = layout.peers
+        self.mask_counts = layout.mask_counts
+        self.cells = array('B', [0]) * layout.cell_count
+        # The numbers not placed among the peers of each cell - filled cells included.
+        self.masks = array(layout.mask_type, [layout.full_mask]) * layout.cell_count
+        # Placements whose number was already placed among the cell's peers.
+        self.conflicts = 0
+        # Empty cells without candidates.
+        self.dead = 0
+        # Empty cells with a single candidate.
+        self.singles = set()
+        self.filled = 0
+        # The moves placed since the givens, each as an (index, number, changed peers) tuple.
+        self.trail = []
+        for index, number in enumerate(grid.cells):
+            if number:
+                self._place(index, number)
+
+    def _place(self, index, number):
+        """
+        Place a number in an empty cell and return the peers whose mask lost its bit.
+        """
+        cells = self.cells
+        masks = self.masks
+        mask_counts = self.mask_counts
+        singles = self.singles
+        bit = 1 << (number - 1)
+        mask = masks[index]
+        if not mask & bit:
+            self.conflicts += 1
+        if not mask:
+            self.dead -= 1
+        singles.discard(index)
+        cells[index] = number
+        self.filled += 1
+        changed = []
+        for peer in self.peers[index]:
+            mask = masks[peer]
+            if mask & bit:
+                mask ^= bit
+                masks[peer] = mask
+                changed.append(peer)
+                if not cells[peer]:
+                    if not mask:
+                        self.dead += 1
+                        singles.discard(peer)
+                    elif mask_counts[mask] == 1:
+                        singles.add(peer)
+        return changed
+
+    def place(self, index, number):
+        """
+        Place a number in an empty cell.
+        Raises ValueError if the cell is filled or the number is not one of the board's.
+        """
+        if self.cells[index]:
+            raise ValueError("Cell {} is already filled.".format(index))
+        if not 0 < number <= self.layout.size:
+            raise ValueError("Invalid number {} for a {}x{} board.".format(number, self.layout.size, self.layout.size))
+        self.trail.append((index, number, self._place(index, number)))
+
+    def undo(self):
+        """
+        Take back the last move placed and return it as an (index, number) pair - or
+        None if no move is left. The givens cannot be taken back.
+        """
+        if not self.trail:
+            return None
+        index, number, changed = self.trail.pop()
+        cells = self.cells
+        masks = self.masks
+        mask_counts = self.mask_counts
+        singles = self.singles
+        bit = 1 << (number - 1)
+        for peer in changed:
+            mask = masks[peer]
+            masks[peer] = mask | bit
+            if not cells[peer]:
+                if not mask:
+                    self.dead -= 1
+                    singles.add(peer)
+                elif mask_counts[mask] == 1:
+                    singles.discard(peer)
+        cells[index] = 0
+        self.filled -= 1
+        mask = masks[index]
+        if not mask & bit:
+            self.conflicts -= 1
+        if not mask:
+            self.dead += 1
+        elif mask_counts[mask] == 1:
+            singles.add(index)
+        return index, number
+
+    def candidates(self, index):
+        """
+        Returns a list of the numbers not placed among a cell's peers - or None if the cell is filled.
+        """
+        if self.cells[index]:
+            return None
+        return self.layout.mask_numbers[self.masks[index]]
+
+    def is_consistent(self):
+        """
+        Returns whether no number is placed twice in a block, row or column, and every
+        empty cell has a candidate left.
+        """
+        return not self.conflicts and not self.dead
+
+    def solved(self):
+        """
+        Returns whether every cell is filled without conflicts.
+        """
+        return self.filled == self.layout.cell_count and not self.conflicts
+
+    def hint(self):
+        """
+        Returns a move which follows from the numbers placed, as an (index, number) pair:
+        a cell with a single candidate, or else the only cell of a block, row or column
+        where a number can go. Returns None if there is none, or the board is not consistent.
+        """
+        if not self.is_consistent():
+            return None
+        if self.singles:
+            index = min(self.singles)
+            return index, self.layout.mask_singles[self.masks[index]]
+        cells = self.cells
+        masks = self.masks
+        for house in self.layout.houses:
+            once = twice = 0
+            for index in house:
+                if not cells[index]:
+                    mask = masks[index]
+                    twice |= once & mask
+                    once |= mask
+            hidden = once & ~twice
+            if hidden:
+                for index in house:
+                    if not cells[index] and masks[index] & hidden:
+                        bit = masks[index] & hidden
+                        return index, self.layout.mask_singles[bit & -bit]
+        return None
+
+    def to_grid(self):
+        """
+        Returns a SudokuGrid with the numbers of the session.
+        """
+        grid = SudokuGrid(box_size=self.layout.box_size)
+        grid.cells = self.cells[:]
+        return grid
+
+    def __len__(self):
+        """
+        The number of moves which can be taken back.
+        """
+        return len(self.trail)
+
+    def __repr__(self):
+        return "SolvingSession({} moves, {}/{} cells filled)".format(
+            len(self.trail), self.filled, self.layout.cell_count
+        )
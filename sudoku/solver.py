@@ -0,0 +1,334 @@
+"""
+Depth-first search for the solution of a Sudoku board.
+
+The search works on any board type with the SudokuBoard search interface -
+analyze(), solved(), next_moves(), copy() and key() - such as SudokuBoard or SudokuGrid.
+
+With a NogoodStore, the search learns from each invalid board: the moves which led to it
+are placed on the analyzed starting board and followed through naked singles, in one pass,
+until they clash - the moves the clash depends on are a nogood, and any later move
+completing a stored nogood is pruned before its board is even made. When the singles
+reach no clash, nothing is learned - no board is analyzed again to find one.
+Learning also needs the moves() and branch() of the board type.
+"""
+
+from collections import namedtuple
+from timeit import default_timer
+
+from board import InvalidBoard
+from grid import SudokuGrid
+from ordering import min_remaining
+
+
+# The result of a search:
+# - board: the solved board, or None if no solution was found.
+# - solved: whether a solution was found.
+# - nodes: the number of boards searched.
+# - elapsed: the time taken in seconds.
+# - budget_exhausted: whether the search stopped because it ran out of nodes or time.
+SolveResult = namedtuple('SolveResult', ['board', 'solved', 'nodes', 'elapsed', 'budget_exhausted'])
+
+
+class SolverListener(object):
+    """
+    Receives the events of a search - subclass and override the events of interest.
+    Each event gets the board concerned and its depth in the search (0 for the starting board).
+    """
+
+    def node_entered(self, board, depth):
+        """
+        A board is about to be analyzed.
+        """
+
+    def already_visited(self, board, depth):
+        """
+        A board was skipped because it is known to lead to no solution.
+        """
+
+    def contradiction(self, board, depth):
+        """
+        Analyzing a board showed it to be invalid.
+        """
+
+    def backtrack(self, board, depth):
+        """
+        All the next moves of a board were tried without finding a solution.
+        """
+
+    def solved(self, board, depth):
+        """
+        A solution was found.
+        """
+
+    def pruned(self, board, depth):
+        """
+        A next move of a board was skipped because the moves to it hold a nogood.
+        """
+
+
+class EventRecorder(SolverListener):
+    """
+    Records the events of a search as (event, depth, board key) tuples.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def node_entered(self, board, depth):
+        self.events.append(('node_entered', depth, board.key()))
+
+    def already_visited(self, board, depth):
+        self.events.append(('already_visited', depth, board.key()))
+
+    def contradiction(self, board, depth):
+        self.events.append(('contradiction', depth, board.key()))
+
+    def backtrack(self, board, depth):
+        self.events.append(('backtrack', depth, board.key()))
+
+    def solved(self, board, depth):
+        self.events.append(('solved', depth, board.key()))
+
+    def pruned(self, board, depth):
+        self.events.append(('pruned', depth, board.key()))
+
+
+class PrintListener(SolverListener):
+    """
+    Prints each board tried during a search - for debugging.
+    """
+
+    def node_entered(self, board, depth):
+        print "TRYING BOARD (depth {}):".format(depth)
+        print board
+
+    def already_visited(self, board, depth):
+        print "ALREADY VISITED:"
+        print board
+
+    def contradiction(self, board, depth):
+        print "PATH TO INVALID BOARD:"
+        print board
+
+    def backtrack(self, board, depth):
+        print "NO SOLUTION ON THIS PATH:"
+        print board
+
+    def pruned(self, board, depth):
+        print "MOVE PRUNED BY A NOGOOD FROM:"
+        print board
+
+
+class Solver(object):
+    """
+    Searches for a solution with an explicit stack of next moves instead of recursion,
+    so the depth of the search is not limited by Python's recursion limit.
+    """
+
+    def __init__(self, max_nodes=None, time_limit=None, ordering=min_remaining, visited=None, listeners=None,
+                 pipeline=None, nogoods=None, stop=None):
+        """
+        max_nodes and time_limit (in seconds) bound the search - None means no limit.
+        stop is a callable checked with the budget at each node - the search gives up,
+        as if out of budget, once it returns True.
+        The ordering strategy chooses the cells to branch on - see sudoku.ordering.
+        If a visited set or TranspositionTable is passed, the keys of boards which lead
+        to no solution are added to it and those boards are skipped when seen again.
+        Listeners receive the events of the search - see SolverListener. Without listeners,
+        no events are built at all.
+        A DeductionPipeline replaces the default rules when analyzing each board -
+        this needs SudokuGrid boards. See sudoku.rules.
+        If a NogoodStore is passed, nogoods are learned from the invalid boards and the
+        branches holding them are pruned - see sudoku.cache.NogoodStore. Only the invalid
+        boards whose moves clash by naked singles alone teach a nogood.
+        """
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.stop = stop
+        self.ordering = ordering
+        self.visited = visited
+        self.listeners = list(listeners or [])
+        self.pipeline = pipeline
+        self.nogoods = nogoods
+        # The number of boards searched and whether the budget ran out, in the last search.
+        self.nodes = 0
+        self.budget_exhausted = False
+        # The number of boards pruned by nogoods in the last search.
+        self.pruned = 0
+
+    def add_listener(self, listener):
+        """
+        Register a SolverListener to receive the events of following searches.
+        """
+        self.listeners.append(listener)
+
+    def solve(self, board):
+        """
+        Search for a solution of the board and return a SolveResult.
+        The passed-in board is not changed.
+        """
+        start = default_timer()
+        solution = next(self._search(board, self.ordering, self.visited), None)
+        return SolveResult(solution, solution is not None, self.nodes, default_timer() - start, self.budget_exhausted)
+
+    def solutions(self, board):
+        """
+        Yields each solution of the board, until the search space or the budget is exhausted.
+        Solutions are found lazily, so memory stays flat however many there are.
+
+        The search branches only on the first cell the ordering returns, so that no solution
+        is reached twice, and the visited table is not used - a board with solutions below it
+        is not a dead end. After the search, the nodes and budget_exhausted attributes tell
+        how far it went.
+        """
+        ordering = self.ordering
+        return self._search(board, lambda cells: ordering(cells)[:1], None)
+
+    def count_solutions(self, board, limit=None):
+        """
+        Returns the number of solutions of the board, stopping early once limit are found -
+        limit=2 is enough to tell whether a board has a unique solution.
+        """
+        count = 0
+        for __ in self.solutions(board):
+            count += 1
+            if count == limit:
+                break
+        return count
+
+    def _search(self, board, ordering, visited):
+        """
+        Yields the solutions of the board, counting the boards searched in self.nodes.
+        """
+        start = default_timer()
+        deadline = None if self.time_limit is None else start + self.time_limit
+        max_nodes = self.max_nodes
+        stop = self.stop
+        listeners = self.listeners
+        pipeline = self.pipeline
+        nogoods = self.nogoods
+        self.nodes = 0
+        self.budget_exhausted = False
+        self.pruned = 0
+        if nogoods is not None:
+            nogoods.clear()
+
+        # Each entry is a board being searched, its key and an iterator over its next boards -
+        # over its next moves when learning nogoods, as a move is only made once it is
+        # checked against the nogoods.
+        stack = []
+        # The moves from the starting board to the current board, when learning nogoods,
+        # and the starting board as an analyzed SudokuGrid, to find the nogoods on.
+        path = []
+        conflicts = []
+        node = board.copy()
+        while node is not None:
+            if (max_nodes is not None and self.nodes >= max_nodes) or \
+                    (deadline is not None and default_timer() >= deadline) or \
+                    (stop is not None and stop()):
+                self.budget_exhausted = True
+                return
+            self.nodes += 1
+            key = node.key()
+            if visited is not None and key in visited:
+                if listeners:
+                    for listener in listeners:
+                        listener.already_visited(node, len(stack))
+            else:
+                if listeners:
+                    for listener in listeners:
+                        listener.node_entered(node, len(stack))
+                try:
+                    if pipeline is None:
+                        node.analyze()
+                    else:
+                        node.analyze(pipeline=pipeline)
+                except InvalidBoard:
+                    # This path leads to an invalid board.
+                    if listeners:
+                        for listener in listeners:
+                            listener.contradiction(node, len(stack))
+                    if path:
+                        if not conflicts:
+                            conflicts.append(_conflict_grid(stack[0][0]))
+                        nogood = _find_nogood(conflicts[0], path)
+                        if nogood:
+                            nogoods.add(nogood)
+                else:
+                    if node.solved():
+                        if listeners:
+                            for listener in listeners:
+                                listener.solved(node, len(stack))
+                        yield node
+                    elif nogoods is None:
+                        stack.append((node, key, node.next_moves(ordering)))
+                    else:
+                        stack.append((node, key, iter(node.moves(ordering))))
+
+            # Move on to the next move of the deepest board which still has one.
+            node = None
+            while stack:
+                if nogoods is None:
+                    node = next(stack[-1][2], None)
+                else:
+                    node = self._next_branch(stack, path)
+                if node is not None:
+                    break
+                parent, key, __ = stack.pop()
+                if listeners:
+                    for listener in listeners:
+                        listener.backtrack(parent, len(stack))
+                if visited is not None:
+                    visited.add(key)
+
+    def _next_branch(self, stack, path):
+        """
+        Returns the board of the next move of the deepest board on the stack whose moves
+        hold no nogood - or None if it has no such move left - and updates the path of moves.
+        """
+        parent, __, moves = stack[-1]
+        depth = len(stack) - 1
+        del path[depth:]
+        for move in moves:
+            path.append(move)
+            if not self.nogoods.prunes(path):
+                return parent.branch(*move)
+            path.pop()
+            self.pruned += 1
+            if self.listeners:
+                for listener in self.listeners:
+                    listener.pruned(parent, depth)
+        return None
+
+
+def _conflict_grid(root):
+    """
+    Returns the analyzed starting board of a search as a SudokuGrid - None if it can't be
+    analyzed as one - and the grid's boxes if the board is a SudokuBoard, to map its moves.
+    """
+    if isinstance(root, SudokuGrid):
+        return root, None
+    grid = SudokuGrid.from_board(root)
+    try:
+        grid.analyze()
+    except InvalidBoard:
+        return None, None
+    return grid, grid.layout.boxes
+
+
+def _find_nogood(conflict_grid, moves):
+    """
+    Returns the moves to an invalid board which clash on the starting board by naked
+    singles - a nogood - or None if they don't. See SudokuGrid.conflict.
+    """
+    grid, boxes = conflict_grid
+    if grid is None:
+        return None
+    if boxes is None:
+        return grid.conflict(moves)
+    grid_moves = [(boxes[block_num][cell_num], number) for (block_num, cell_num), number in moves]
+    clash = grid.conflict(grid_moves)
+    if clash is None:
+        return None
+    kept = set(clash)
+    return [move for move, grid_move in zip(moves, grid_moves) if grid_move in kept]
@@ -0,0 +1,244 @@
+"""
+Binary puzzle store - a file of fixed-size board records read through mmap,
+so a worker can open the store and read board N without parsing or copying the file.
+
+File layout (all integers little-endian):
+- Header: magic "SDKS", version (uint16), flags (uint16), board count (uint32),
+  record size (uint32) and the offset of the index (uint64).
+- Records: one per board, either 81 bytes holding each cell's number (0 for empty)
+  in row-major order, or - with the PACKED flag - 41 bytes holding two cells per byte,
+  the first cell in the high nibble.
+- Index: the file offset of each record (uint64), after the records so that
+  boards can be written as a stream.
+
+Existing .brd/.csv boards and puzzle-per-line files can be converted with:
+
+    python -m sudoku.store boards.sdk board1.brd board2.csv puzzles.txt [--packed]
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import struct
+from array import array
+
+from batch import BatchResult, to_string
+from grid import SudokuGrid
+from engines import make_solver
+
+MAGIC = 'SDKS'
+VERSION = 1
+PACKED = 0x1
+
+HEADER = struct.Struct('<4sHHIIQ')
+OFFSET = struct.Struct('<Q')
+RECORD_SIZES = {0: 81, PACKED: 41}
+
+
+class StoreError(Exception):
+    pass
+
+
+def pack_key(key):
+    """
+    Packs an 81-byte board key into 41 bytes - two cells per byte.
+    """
+    numbers = array('B')
+    numbers.fromstring(key)
+    numbers.append(0)
+    return array('B', [(numbers[i] << 4) | numbers[i + 1] for i in range(0, 82, 2)]).tostring()
+
+
+def unpack_key(record):
+    """
+    Unpacks a 41-byte packed record into an 81-byte board key.
+    """
+    numbers = array('B')
+    for byte in bytearray(record):
+        numbers.append(byte >> 4)
+        numbers.append(byte & 0xf)
+    return numbers[:81].tostring()
+
+
+def write_store(filename, boards, packed=False):
+    """
+    Write an iterable of boards (strings, SudokuGrids or SudokuBoards) to a store file.
+    Returns the number of boards written.
+    """
+    flags = PACKED if packed else 0
+    offsets = []
+    with open(filename, 'wb') as outfile:
+        outfile.write(HEADER.pack(MAGIC, VERSION, flags, 0, RECORD_SIZES[flags], 0))
+        offset = HEADER.size
+        for board in boards:
+            key = SudokuGrid.from_string(to_string(board)).key()
+            if len(key) != 81:
+                raise StoreError("Puzzle stores only hold 9x9 boards.")
+            outfile.write(pack_key(key) if packed else key)
+            offsets.append(offset)
+            offset += RECORD_SIZES[flags]
+        for record_offset in offsets:
+            outfile.write(OFFSET.pack(record_offset))
+        outfile.seek(0)
+        outfile.write(HEADER.pack(MAGIC, VERSION, flags, len(offsets), RECORD_SIZES[flags], offset))
+    return len(offsets)
+
+
+def read_board_file(filename):
+    """
+    Returns the board of a .brd or .csv file (or each board of a puzzle-per-line file)
+    as 81-character strings.
+    """
+    from stream import read_puzzles
+
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in ('.brd', '.csv'):
+        return read_puzzles(filename)
+    grid = SudokuGrid()
+    if extension == '.csv':
+        grid.populate_from_csvfile(filename)
+    else:
+        grid.populate_from_brdfile(filename)
+    return [grid.to_string()]
+
+
+def convert_files(filenames, target, packed=False):
+    """
+    Write the boards of .brd, .csv and puzzle-per-line files to a store file.
+    Returns the number of boards written.
+    """
+    return write_store(target, (board for filename in filenames for board in read_board_file(filename)), packed)
+
+
+class PuzzleStore(object):
+    """
+    Read-only access to a store file through mmap.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as infile:
+            if os.fstat(infile.fileno()).st_size < HEADER.size:
+                raise StoreError("{} is too short to be a puzzle store.".format(filename))
+            self.map = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.flags, self.count, self.record_size, self.index_offset = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise StoreError("{} is not a version {} puzzle store.".format(filename, VERSION))
+        if self.record_size != RECORD_SIZES.get(self.flags & PACKED):
+            self.map.close()
+            raise StoreError("{} has records of {} bytes - expected {}.".format(
+                filename, self.record_size, RECORD_SIZES.get(self.flags & PACKED)
+            ))
+        if self.index_offset + self.count * OFFSET.size > len(self.map):
+            size = len(self.map)
+            self.map.close()
+            raise StoreError("{} is truncated - its index of {} boards ends past its {} bytes.".format(
+                filename, self.count, size
+            ))
+        self.packed = bool(self.flags & PACKED)
+
+    def record(self, board_num):
+        """
+        Returns a read-only view of a board's record, without copying it.
+        """
+        if not 0 <= board_num < self.count:
+            raise IndexError("Board {} is not in the store - it has {} boards.".format(board_num, self.count))
+        offset, = OFFSET.unpack_from(self.map, self.index_offset + board_num * OFFSET.size)
+        if offset + self.record_size > len(self.map):
+            raise StoreError("Board {} of {} ends past the end of the file.".format(board_num, self.filename))
+        return buffer(self.map, offset, self.record_size)
+
+    def key(self, board_num):
+        """
+        Returns a board's key - its 81 cell numbers as a string.
+        """
+        record = self.record(board_num)
+        return unpack_key(record) if self.packed else str(record)
+
+    def string(self, board_num):
+        """
+        Returns a board as an 81-character string.
+        """
+        return SudokuGrid.from_key(self.key(board_num)).to_string()
+
+    def __getitem__(self, board_num):
+        """
+        Returns a board as a SudokuGrid.
+        """
+        return SudokuGrid.from_key(self.key(board_num))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for board_num in range(self.count):
+            yield self[board_num]
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Stores opened by this worker process, by filename.
+_worker_stores = {}
+
+
+def _solve_range(task):
+    """
+    Solve a range of boards of a store in a worker process.
+    """
+    filename, start, stop, options = task
+    store = _worker_stores.get(filename)
+    if store is None:
+        store = _worker_stores[filename] = PuzzleStore(filename)
+    results = []
+    for board_num in range(start, stop):
+        grid = store[board_num]
+        result = make_solver(**options).solve(grid)
+        solution = result.board.to_string() if result.solved else None
+        results.append(BatchResult(
+            board_num, grid.to_string(), solution, result.nodes, result.elapsed, result.budget_exhausted
+        ))
+    return results
+
+
+def solve_store(filename, workers=None, chunksize=16, ordered=True, **options):
+    """
+    Solve every board of a store in a pool of worker processes and return an iterator
+    of BatchResults - see sudoku.batch.solve_batch. Only board numbers cross the process
+    boundary: each worker reads its boards straight from the mapped file.
+    """
+    with PuzzleStore(filename) as store:
+        count = len(store)
+    tasks = [(filename, start, min(start + chunksize, count), options) for start in range(0, count, chunksize)]
+    pool = multiprocessing.Pool(workers)
+    try:
+        results = pool.imap(_solve_range, tasks) if ordered else pool.imap_unordered(_solve_range, tasks)
+        for chunk in results:
+            for result in chunk:
+                yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert board files to a binary puzzle store.")
+    parser.add_argument('target', help="store file to write")
+    parser.add_argument('sources', nargs='+', help=".brd, .csv or puzzle-per-line files")
+    parser.add_argument('--packed', action='store_true', help="store 41-byte packed records")
+    args = parser.parse_args(argv)
+    count = convert_files(args.sources, args.target, packed=args.packed)
+    print "{} boards written to {}".format(count, args.target)
+
+
+if __name__ == '__main__':
+    main()
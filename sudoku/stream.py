@@ -0,0 +1,137 @@
+"""
+Streaming reader and writer for puzzle collections with one 81-character board per line,
+using '.', '0' or '-' for empty cells.
+
+Files are processed one line at a time, so collections of any size can be pushed
+through the solver in constant memory:
+
+    python -m sudoku.stream puzzles.txt solutions.txt --workers 4
+"""
+
+import argparse
+import sys
+
+from board import BoardParseError
+from batch import solve_batch, to_string
+from engines import ENGINES, DEFAULT_ENGINE
+from layout import BLANKS, STANDARD
+
+# The characters a board line may hold.
+VALID_CHARS = frozenset(BLANKS) | frozenset(STANDARD.char_numbers)
+
+
+def _open(target, mode):
+    """
+    Returns a file object for a filename or file object, and whether it must be closed.
+    """
+    if isinstance(target, basestring):
+        return open(target, mode), True
+    return target, False
+
+
+def read_puzzles(source):
+    """
+    Yield each board of a file (a filename or file object) as an 81-character string.
+    Blank lines and lines starting with '#' are skipped. A line of the wrong length or
+    with an invalid character raises BoardParseError as it is read.
+    """
+    infile, close = _open(source, 'r')
+    try:
+        for line_num, line in enumerate(infile, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if len(line) != 81:
+                raise BoardParseError("Line {} does not have 81 values - it has {} values. Line: {}".format(
+                    line_num, len(line), line
+                ))
+            if not VALID_CHARS.issuperset(line):
+                index, char = next((index, char) for index, char in enumerate(line) if char not in VALID_CHARS)
+                raise BoardParseError("Line {} has an invalid value {!r} in cell {}. Line: {}".format(
+                    line_num, char, index, line
+                ))
+            yield line
+    finally:
+        if close:
+            infile.close()
+
+
+class SolutionWriter(object):
+    """
+    Writes solved boards to a file (a filename or file object), one 81-character line each.
+    A board without a solution (None) is written as an empty line, so line N of the
+    output always belongs to puzzle N of the input.
+    """
+
+    def __init__(self, target):
+        self.outfile, self._close = _open(target, 'w')
+        self.count = 0
+
+    def write(self, solution):
+        """
+        Write a solution - a string, SudokuGrid, SudokuBoard or None.
+        """
+        if solution is not None:
+            self.outfile.write(to_string(solution))
+        self.outfile.write('\n')
+        self.count += 1
+
+    def close(self):
+        if self._close:
+            self.outfile.close()
+        else:
+            self.outfile.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_solutions(target, solutions):
+    """
+    Write an iterable of solutions to a file. Returns the number written.
+    """
+    with SolutionWriter(target) as writer:
+        for solution in solutions:
+            writer.write(solution)
+    return writer.count
+
+
+def solve_file(source, target, **options):
+    """
+    Solve every board of a puzzle file and write the solutions, in order, to another file.
+    The options are passed to solve_batch. Returns the number of boards solved.
+    """
+    results = solve_batch(read_puzzles(source), ordered=True, **options)
+    solved = 0
+    with SolutionWriter(target) as writer:
+        for result in results:
+            writer.write(result.solution)
+            if result.solution is not None:
+                solved += 1
+    return solved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of 81-character puzzles, one per line.")
+    parser.add_argument('source', help="puzzle file, or - for stdin")
+    parser.add_argument('target', help="solution file, or - for stdout")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--chunksize', type=int, default=16, help="boards sent to a worker at a time")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE, help="solving engine")
+    parser.add_argument('--max-nodes', type=int, default=None, help="node budget per board")
+    parser.add_argument('--time-limit', type=float, default=None, help="time budget per board, in seconds")
+    args = parser.parse_args(argv)
+    source = sys.stdin if args.source == '-' else args.source
+    target = sys.stdout if args.target == '-' else args.target
+    solved = solve_file(
+        source, target, workers=args.workers, chunksize=args.chunksize, engine=args.engine,
+        max_nodes=args.max_nodes, time_limit=args.time_limit
+    )
+    sys.stderr.write("{} boards solved\n".format(solved))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import unittest
+from itertools import count, islice
+from sudoku.batch import solve_batch, solve_string, to_string
+from sudoku.board import BoardParseError
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.solver import Solver
+
+
+def _grid(brdstring):
+    grid = SudokuGrid()
+    grid.populate_from_brdstring(brdstring.split('\n'))
+    return grid
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.grids = [_grid(brdstring) for brdstring in DEMO_BOARDS]
+        self.solutions = [Solver().solve(grid).board.to_string() for grid in self.grids]
+
+    def test_string_round_trip(self):
+        for grid in self.grids:
+            string = grid.to_string()
+            self.assertEqual(len(string), 81)
+            self.assertEqual(SudokuGrid.from_string(string), grid)
+        self.assertEqual(SudokuGrid.from_string('0-.' + '.' * 78), SudokuGrid())
+        with self.assertRaises(BoardParseError):
+            SudokuGrid.from_string('x' * 81)
+        with self.assertRaises(BoardParseError):
+            SudokuGrid.from_string('1' * 80)
+
+    def test_to_string(self):
+        grid = self.grids[0]
+        self.assertEqual(to_string(grid), grid.to_string())
+        self.assertEqual(to_string(grid.to_board()), grid.to_string())
+        self.assertEqual(to_string(grid.to_string()), grid.to_string())
+
+    def test_solve_string(self):
+        result = solve_string(self.grids[3].to_string())
+        self.assertEqual(result.solution, self.solutions[3])
+        result = solve_string(self.grids[5].to_string(), max_nodes=2)
+        self.assertIsNone(result.solution)
+        self.assertTrue(result.budget_exhausted)
+
+    def test_ordered(self):
+        results = list(solve_batch(self.grids, workers=2, chunksize=1))
+        self.assertEqual([result.index for result in results], range(len(self.grids)))
+        self.assertEqual([result.solution for result in results], self.solutions)
+
+    def test_unordered(self):
+        boards = [grid.to_string() for grid in self.grids] * 3
+        results = list(solve_batch(boards, workers=2, chunksize=2, ordered=False))
+        self.assertEqual(sorted(result.index for result in results), range(len(boards)))
+        for result in results:
+            self.assertEqual(result.puzzle, boards[result.index])
+            self.assertEqual(result.solution, self.solutions[result.index % len(self.grids)])
+
+    def test_bounded_read_ahead(self):
+        boards = [grid.to_string() for grid in self.grids]
+        read = []
+
+        def stream():
+            for index in count():
+                read.append(index)
+                yield boards[index % len(boards)]
+
+        results = list(islice(solve_batch(stream(), workers=1, chunksize=1), 10))
+        self.assertEqual([result.index for result in results], range(10))
+        # The window of one worker with chunksize 1 is four boards.
+        self.assertLessEqual(len(read), 10 + 4 + 1)
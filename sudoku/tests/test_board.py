@@ -3,6 +3,7 @@ import unittest
 import copy
 from path import Path as path
 from sudoku.board import SudokuBoard, InvalidBoard
+from sudoku.cell import BitmaskCell
 
 DATA_DIR = path(__file__).dirname()
 
@@ -88,6 +89,16 @@ class TestSudokuBoard(unittest.TestCase):
         board.analyze()
         self.assertItemsEqual(board[4][5].possibles, [1, 3, 7, 9])
 
+    def test_possibles_bitmask(self):
+        board = SudokuBoard(self.board_nums[1])
+        board.analyze()
+        mask_board = SudokuBoard(self.board_nums[1], cell_class=BitmaskCell)
+        mask_board.analyze()
+        self.assertEqual(mask_board, board)
+        for block_num in range(9):
+            for cell_num in range(9):
+                self.assertEqual(mask_board[block_num][cell_num].possibles, board[block_num][cell_num].possibles)
+
     def _verify_board(self, board):
         self.assertEqual(board[4].row(1), [None, None, None])
         self.assertEqual(board[2].row(2), [9, 4, 3])
@@ -128,6 +139,16 @@ class TestSudokuBoard(unittest.TestCase):
         self.assertEqual(board2, board3)
         self.assertTrue(board2 in [board3])
 
+    def test_board_hash(self):
+        board1 = SudokuBoard(self.board_nums[0])
+        board2 = SudokuBoard(self.board_nums[1])
+        board3 = SudokuBoard(self.board_nums[1])
+        self.assertEqual(hash(board2), hash(board3))
+        self.assertEqual(board2.key(), board3.key())
+        self.assertNotEqual(board1.key(), board2.key())
+        self.assertEqual(len(board1.key()), 81)
+        self.assertTrue(board3 in set([board1, board2]))
+
     def test_board_analyze_invalid(self):
         board = SudokuBoard()
         board.populate_from_brdstring(self.brd_nums[0].split('\n'))
@@ -139,6 +160,84 @@ class TestSudokuBoard(unittest.TestCase):
         # Ensure that a deepcopy can be done without raising an exception.
         board_copy = copy.deepcopy(board)
 
+    def test_board_copy(self):
+        board = SudokuBoard(self.board_nums[1])
+        board.analyze()
+        board_copy = board.copy()
+        self.assertEqual(board_copy, board)
+        board_copy[0][0].number = 5
+        self.assertIsNone(board[0][0].number)
+        self.assertEqual(board_copy[4][5].possibles, board[4][5].possibles)
+
+    def test_next_moves(self):
+        board = SudokuBoard(self.board_nums[1])
+        board.analyze()
+        moves = board.moves()
+        children = list(board.next_moves())
+        self.assertEqual(len(children), len(moves))
+        for ((block_num, cell_num), number), child in zip(moves, children):
+            self.assertIsNone(board[block_num][cell_num].number)
+            self.assertEqual(child[block_num][cell_num].number, number)
+
+    def test_set_number(self):
+        board = SudokuBoard()
+        board.populate_from_brdstring(self.brd_nums[1].split('\n'))
+        # Row 4 has a 5 in column 6 - no other house of block 3, cell 4 has one.
+        self.assertFalse(board.set_number((3, 4), 5))
+        with self.assertRaises(InvalidBoard) as context:
+            board.verify()
+        self.assertTrue(str(context.exception).startswith('Row 4 has duplicate values.'))
+        board.set_number((3, 4), None)
+        board.verify()
+        self.assertTrue(board.set_number((3, 4), 4))
+        self.assertEqual(board[3][4].number, 4)
+        # Emptying one of two duplicates keeps the number in the house.
+        board.set_number((3, 5), 4)
+        board.set_number((3, 5), None)
+        self.assertFalse(board.set_number((4, 4), 4))
+
+    def test_verify_column(self):
+        board = SudokuBoard()
+        board.populate_from_brdstring(self.brd_nums[2].split('\n'))
+        board[0][0].number = 3
+        with self.assertRaises(InvalidBoard) as context:
+            board.verify()
+        self.assertTrue(str(context.exception).startswith('Column 0 has duplicate values.'))
+
+    def test_verify_cells_set_directly(self):
+        board = SudokuBoard()
+        board.populate_from_brdstring(self.brd_nums[1].split('\n'))
+        board.verify()
+        # Block 0 already has a 2 in cell 0.
+        board[0][1].number = 2
+        with self.assertRaises(InvalidBoard) as context:
+            board.verify()
+        self.assertTrue(str(context.exception).startswith('Block 0 has duplicate values.'))
+        board[0][1].number = None
+        board.verify()
+        self.assertEqual(board.copy(), board)
+        # A copy counts its own cells - setting them leaves the original board alone.
+        board_copy = board.copy()
+        board_copy[0][1].number = 2
+        self.assertFalse(board_copy.set_number((0, 5), 9))
+        with self.assertRaises(InvalidBoard):
+            board_copy.verify()
+        board.verify()
+
+    def test_solved(self):
+        board = SudokuBoard()
+        board.populate_from_brdstring(self.brd_nums[2].split('\n'))
+        self.assertFalse(board.solved())
+        board.analyze()
+        self.assertTrue(board.solved())
+        board_copy = board.copy()
+        board_copy.set_number((0, 0), 1)
+        self.assertFalse(board_copy.solved())
+        self.assertTrue(board.solved())
+        board[0][0].number = None
+        self.assertFalse(board.filled())
+        self.assertFalse(board.solved())
+
     def test_set_possibles(self):
         board = SudokuBoard()
         board.populate_from_brdstring(self.brd_nums[2].split('\n'))
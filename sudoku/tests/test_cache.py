@@ -0,0 +1,54 @@
+import unittest
+from sudoku.cache import NogoodStore, TranspositionTable
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        table = TranspositionTable(capacity=10)
+        self.assertFalse('a' in table)
+        table.add('a')
+        self.assertTrue('a' in table)
+        self.assertTrue('a' in table)
+        self.assertEqual((table.hits, table.misses), (2, 1))
+
+    def test_eviction(self):
+        table = TranspositionTable(capacity=2)
+        table.add('a')
+        table.add('b')
+        # Using 'a' makes 'b' the least recently used key.
+        self.assertTrue('a' in table)
+        table.add('c')
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.evictions, 1)
+        self.assertTrue('a' in table)
+        self.assertFalse('b' in table)
+        self.assertTrue('c' in table)
+
+
+class TestNogoodStore(unittest.TestCase):
+
+    def test_prunes(self):
+        store = NogoodStore()
+        store.add([(3, 1), (40, 5)])
+        self.assertTrue(store.prunes([(40, 5), (7, 2), (3, 1)]))
+        # Only nogoods holding the last move are checked.
+        self.assertFalse(store.prunes([(40, 5), (3, 1), (7, 2)]))
+        self.assertFalse(store.prunes([(7, 2), (3, 1)]))
+        self.assertEqual((store.learned, store.pruned), (1, 1))
+        store.clear()
+        self.assertFalse(store.prunes([(40, 5), (3, 1)]))
+
+    def test_eviction(self):
+        store = NogoodStore(capacity=2)
+        store.add([(0, 1), (1, 2)])
+        store.add([(0, 1), (2, 3)])
+        # Pruning with the first nogood makes the second the least recently used.
+        self.assertTrue(store.prunes([(1, 2), (0, 1)]))
+        store.add([(5, 6)])
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.evictions, 1)
+        self.assertTrue(store.prunes([(1, 2), (0, 1)]))
+        self.assertFalse(store.prunes([(2, 3), (0, 1)]))
+        self.assertTrue(store.prunes([(5, 6)]))
+        self.assertNotIn((2, 3), store.move_nogoods)
@@ -0,0 +1,89 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from sudoku.board import SudokuBoard
+from sudoku.canonical import Transform, SolutionCache, canonical_form
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+
+
+def _equivalent(grid, rng):
+    """
+    Returns a random board equivalent to the grid.
+    """
+    rows = [band * 3 + row for band in rng.sample(range(3), 3) for row in rng.sample(range(3), 3)]
+    cols = [stack * 3 + col for stack in rng.sample(range(3), 3) for col in rng.sample(range(3), 3)]
+    labels = tuple([0] + rng.sample(range(1, 10), 9))
+    return SudokuGrid.from_key(Transform(rng.random() < 0.5, rows, cols, labels).apply(grid.key()))
+
+
+class TestCanonical(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.rng = random.Random(7)
+        self.grids = []
+        for brdstring in DEMO_BOARDS:
+            grid = SudokuGrid()
+            grid.populate_from_brdstring(brdstring.split('\n'))
+            self.grids.append(grid)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_equivalent_boards(self):
+        for grid in self.grids:
+            canonical, transform = canonical_form(grid)
+            self.assertEqual(transform.apply(grid.key()), canonical)
+            self.assertEqual(transform.invert(canonical), grid.key())
+            for __ in range(3):
+                self.assertEqual(canonical_form(_equivalent(grid, self.rng))[0], canonical)
+        self.assertEqual(canonical_form(self.grids[1].to_board())[0], canonical_form(self.grids[1])[0])
+        self.assertNotEqual(canonical_form(self.grids[0])[0], canonical_form(self.grids[1])[0])
+
+    def test_minimal(self):
+        canonical = canonical_form(self.grids[3])[0]
+        for __ in range(20):
+            self.assertLessEqual(canonical, _equivalent(self.grids[3], self.rng).key())
+        self.assertEqual(canonical_form(SudokuGrid())[0], '\0' * 81)
+
+    def test_other_sizes(self):
+        with self.assertRaises(ValueError):
+            canonical_form(SudokuGrid(box_size=2))
+
+    def test_solution_cache(self):
+        filename = os.path.join(self.directory, 'solutions.db')
+        grid = self.grids[3]
+        equivalent = _equivalent(grid, self.rng)
+        with SolutionCache(filename) as cache:
+            result = cache.solve(grid)
+            self.assertTrue(result.solved)
+            self.assertEqual(len(cache), 1)
+            cached = cache.solve(equivalent)
+            self.assertEqual(cached.nodes, 0)
+            self.assertTrue(cached.board.solved())
+            for index, number in enumerate(bytearray(equivalent.key())):
+                if number:
+                    self.assertEqual(cached.board.cells[index], number)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # The cache persists, and returns the board type passed in.
+        with SolutionCache(filename) as cache:
+            self.assertEqual(len(cache), 1)
+            solution = cache.get(grid.to_board())
+            self.assertIsInstance(solution, SudokuBoard)
+            self.assertEqual(solution.key(), result.board.key())
+
+    def test_eviction(self):
+        with SolutionCache(os.path.join(self.directory, 'solutions.db'), capacity=2) as cache:
+            for grid in self.grids[:3]:
+                cache.solve(grid)
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.evictions, 1)
+            self.assertIsNone(cache.get(self.grids[0]))
+            self.assertIsNotNone(cache.get(self.grids[2]))
+            cache.solve(self.grids[0])
+            # Using grids[2] made grids[1] the least recently used.
+            self.assertIsNone(cache.get(self.grids[1]))
+            self.assertIsNotNone(cache.get(self.grids[2]))
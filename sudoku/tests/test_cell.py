@@ -0,0 +1,38 @@
+import unittest
+from sudoku.cell import SudokuCell, BitmaskCell, POSSIBLE_NUMBERS, FULL_MASK, numbers_to_mask
+
+
+class TestBitmaskCell(unittest.TestCase):
+
+    def test_empty(self):
+        cell = BitmaskCell()
+        self.assertTrue(cell.empty)
+        self.assertEqual(cell.mask, FULL_MASK)
+        self.assertEqual(cell.possibles, POSSIBLE_NUMBERS)
+        self.assertEqual(cell.count, 9)
+        self.assertIsNone(cell.single)
+
+    def test_eliminate(self):
+        cell = BitmaskCell()
+        cell.eliminate_possibles(set([1, 3, 5, 7, 9]))
+        self.assertEqual(cell.possibles, [2, 4, 6, 8])
+        cell.eliminate_mask(numbers_to_mask([2, 4, 8]))
+        self.assertEqual(cell.possibles, [6])
+        self.assertEqual(cell.count, 1)
+        self.assertEqual(cell.single, 6)
+
+    def test_possibles_view(self):
+        cell = BitmaskCell()
+        cell.possibles = [3, 1]
+        self.assertEqual(cell.mask, 0b101)
+        self.assertEqual(cell.possibles, [1, 3])
+        cell.possibles = None
+        self.assertIsNone(cell.possibles)
+
+    def test_matches_list_cell(self):
+        list_cell = SudokuCell()
+        mask_cell = BitmaskCell()
+        for impossibles in ([4], [1, 9], [2, 4, 6]):
+            list_cell.eliminate_possibles(set(impossibles))
+            mask_cell.eliminate_possibles(set(impossibles))
+            self.assertEqual(list_cell.possibles, mask_cell.possibles)
@@ -0,0 +1,72 @@
+import unittest
+from sudoku.batch import solve_string
+from sudoku.board import SudokuBoard
+from sudoku.dlx import DLXSolver
+from sudoku.engines import make_solver, solve, solutions, count_solutions
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.solver import Solver
+
+
+def _grid(brdstring):
+    grid = SudokuGrid()
+    grid.populate_from_brdstring(brdstring.split('\n'))
+    return grid
+
+
+class TestDLX(unittest.TestCase):
+
+    def test_demo_boards(self):
+        for board_num, brdstring in enumerate(DEMO_BOARDS):
+            grid = _grid(brdstring)
+            result = DLXSolver().solve(grid)
+            self.assertTrue(result.solved)
+            self.assertTrue(result.board.solved())
+            for index in range(81):
+                if grid.cells[index]:
+                    self.assertEqual(result.board.cells[index], grid.cells[index])
+            if board_num < 4:
+                # These boards have a single solution.
+                self.assertEqual(result.board, Solver().solve(grid).board)
+
+    def test_board_type(self):
+        board = SudokuBoard()
+        board.populate_from_brdstring(DEMO_BOARDS[0].split('\n'))
+        result = DLXSolver().solve(board)
+        self.assertIsInstance(result.board, SudokuBoard)
+        self.assertTrue(result.board.solved())
+
+    def test_no_solution(self):
+        for brdstring in ('-23456789\n1--------', '11-------'):
+            result = DLXSolver().solve(_grid(brdstring))
+            self.assertFalse(result.solved)
+            self.assertFalse(result.budget_exhausted)
+            self.assertIsNone(result.board)
+
+    def test_node_budget(self):
+        result = DLXSolver(max_nodes=10).solve(_grid(DEMO_BOARDS[3]))
+        self.assertFalse(result.solved)
+        self.assertTrue(result.budget_exhausted)
+        self.assertEqual(result.nodes, 10)
+
+    def test_engines(self):
+        self.assertIsInstance(make_solver(), Solver)
+        self.assertIsInstance(make_solver('dlx', max_nodes=5), DLXSolver)
+        with self.assertRaises(ValueError):
+            make_solver('guess')
+        grid = _grid(DEMO_BOARDS[1])
+        self.assertEqual(solve(grid, engine='dlx').board, solve(grid).board)
+        puzzle = grid.to_string()
+        self.assertEqual(solve_string(puzzle, engine='dlx').solution, solve_string(puzzle).solution)
+
+    def test_solutions(self):
+        puzzle = SudokuGrid.from_string('.' * 27 + Solver().solve(_grid(DEMO_BOARDS[0])).board.to_string()[27:])
+        expected = sorted(board.to_string() for board in solutions(puzzle))
+        self.assertEqual(sorted(board.to_string() for board in solutions(puzzle, engine='dlx')), expected)
+        self.assertEqual(count_solutions(puzzle, engine='dlx', limit=2), 2)
+        self.assertEqual(count_solutions(_grid(DEMO_BOARDS[2]), engine='dlx', limit=2), 1)
+        self.assertEqual(count_solutions(SudokuGrid(), engine='dlx', limit=500), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+from sudoku.board import SudokuBoard
+from sudoku.engines import count_solutions
+from sudoku.generator import GenerationError, generate, make_puzzle, random_solution, rate, remove_clues
+from sudoku.grid import SudokuGrid
+
+
+class TestGenerator(unittest.TestCase):
+
+    def assertUnique(self, puzzle):
+        self.assertEqual(count_solutions(SudokuGrid.from_string(puzzle), 2, engine='dlx'), 1)
+
+    def test_random_solution(self):
+        rng = random.Random(3)
+        solutions = set(random_solution(rng) for __ in range(5))
+        self.assertEqual(len(solutions), 5)
+        for solution in solutions:
+            self.assertTrue(SudokuGrid.from_string(solution).solved())
+
+    def test_remove_clues(self):
+        rng = random.Random(3)
+        solution = random_solution(rng)
+        puzzle = remove_clues(solution, rng=rng)
+        self.assertUnique(puzzle)
+        for index, char in enumerate(puzzle):
+            self.assertIn(char, ('.', solution[index]))
+        # The puzzle is minimal - no other clue can go.
+        for index, char in enumerate(puzzle):
+            if char != '.':
+                self.assertEqual(count_solutions(
+                    SudokuGrid.from_string(puzzle[:index] + '.' + puzzle[index + 1:]), 2, engine='dlx'
+                ), 2)
+        self.assertEqual(81 - remove_clues(solution, 40, rng).count('.'), 40)
+
+    def test_generate(self):
+        puzzles = list(generate(3, clues=28, seed=5))
+        self.assertEqual(puzzles, list(generate(3, clues=28, seed=5, workers=2)))
+        self.assertNotEqual(puzzles, list(generate(3, clues=28, seed=6)))
+        for puzzle in puzzles:
+            self.assertEqual(81 - puzzle.count('.'), 28)
+            self.assertUnique(puzzle)
+        boards = list(generate(1, clues=28, seed=5, as_boards=True))
+        self.assertIsInstance(boards[0], SudokuBoard)
+        self.assertEqual(SudokuGrid.from_board(boards[0]).to_string(), puzzles[0])
+
+    def test_difficulty(self):
+        puzzle = make_puzzle(random.Random(5), difficulty='hard')
+        self.assertEqual(rate(puzzle)[0], 'hard')
+        self.assertUnique(puzzle)
+        with self.assertRaises(ValueError):
+            make_puzzle(difficulty='impossible')
+        # Puzzles with every clue left are never hard.
+        with self.assertRaises(GenerationError):
+            make_puzzle(random.Random(5), clues=81, difficulty='hard', attempts=2)
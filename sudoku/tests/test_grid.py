@@ -0,0 +1,165 @@
+import unittest
+from path import Path as path
+from sudoku.board import SudokuBoard, InvalidBoard
+from sudoku.grid import SudokuGrid, PEERS, BLOCK_ORDER
+from sudoku.ordering import block_order
+from sudoku.puzzles import DEMO_BOARDS, corpus
+
+DATA_DIR = path(__file__).dirname()
+
+
+def _corpus():
+    return [SudokuGrid.from_string(puzzle) for puzzle in corpus()]
+
+
+def _fixpoint(grid, **kwargs):
+    """
+    Returns the numbers and possibles left by analyze(), or None if the board is dead -
+    either invalid or with a cell left without any possible number.
+    """
+    try:
+        grid.analyze(**kwargs)
+    except InvalidBoard:
+        return None
+    possibles = [grid.possible_numbers(index) for index in range(81)]
+    if [] in possibles:
+        return None
+    return grid.cells.tostring(), possibles
+
+
+def _load(brdstring):
+    board = SudokuBoard()
+    board.populate_from_brdstring(brdstring.split('\n'))
+    grid = SudokuGrid()
+    grid.populate_from_brdstring(brdstring.split('\n'))
+    return board, grid
+
+
+class TestSudokuGrid(unittest.TestCase):
+
+    def test_peers(self):
+        for index, peers in enumerate(PEERS):
+            self.assertEqual(len(peers), 20)
+            self.assertNotIn(index, peers)
+        self.assertEqual(sorted(BLOCK_ORDER), range(81))
+
+    def test_empty_repr(self):
+        self.assertEqual(unicode(SudokuGrid()), unicode(SudokuBoard()))
+
+    def test_repr(self):
+        for brdstring in DEMO_BOARDS:
+            board, grid = _load(brdstring)
+            self.assertEqual(unicode(grid), unicode(board))
+
+    def test_board_conversion(self):
+        board, grid = _load(DEMO_BOARDS[1])
+        self.assertEqual(SudokuGrid.from_board(board), grid)
+        self.assertEqual(grid.to_board(), board)
+        self.assertEqual(grid.key(), board.key())
+        self.assertEqual(hash(grid), hash(board))
+
+    def test_load_from_files(self):
+        brd_grid = SudokuGrid()
+        brd_grid.populate_from_brdfile(DATA_DIR / 'board1.brd')
+        csv_grid = SudokuGrid()
+        csv_grid.populate_from_csvfile(DATA_DIR / 'board1.csv')
+        self.assertEqual(brd_grid, csv_grid)
+        self.assertEqual(brd_grid[2], 3)
+        self.assertIsNone(brd_grid[1])
+
+    def test_equality(self):
+        __, grid1 = _load(DEMO_BOARDS[0])
+        __, grid2 = _load(DEMO_BOARDS[0])
+        __, grid3 = _load(DEMO_BOARDS[1])
+        self.assertEqual(grid1, grid2)
+        self.assertNotEqual(grid1, grid3)
+
+    def test_analyze_matches_board(self):
+        for brdstring in DEMO_BOARDS:
+            board, grid = _load(brdstring)
+            board.analyze()
+            grid.analyze()
+            self.assertEqual(grid.to_board(), board)
+            for block_num, index in enumerate(BLOCK_ORDER):
+                cell = board[block_num // 9][block_num % 9]
+                self.assertEqual(grid.possible_numbers(index), cell.possibles)
+
+    def test_analyze_invalid(self):
+        __, grid = _load('11-------')
+        with self.assertRaises(InvalidBoard):
+            grid.analyze()
+
+    def test_next_moves_match_board(self):
+        board, grid = _load(DEMO_BOARDS[3])
+        board.analyze()
+        grid.analyze()
+        board_moves = list(board.next_moves(block_order))
+        grid_moves = list(grid.next_moves(block_order))
+        self.assertEqual(len(grid_moves), len(board_moves))
+        for grid_move, board_move in zip(grid_moves, board_moves):
+            self.assertEqual(grid_move.to_board(), board_move)
+
+    def test_incremental_matches_full(self):
+        for grid in _corpus():
+            incremental = _fixpoint(grid.copy())
+            full = _fixpoint(grid.copy(), incremental=False)
+            self.assertEqual(incremental, full)
+            if full is not None:
+                board = grid.to_board()
+                board.analyze()
+                self.assertEqual(SudokuGrid.from_board(board).cells.tostring(), full[0])
+
+    def test_branch(self):
+        __, grid = _load(DEMO_BOARDS[3])
+        grid.analyze()
+        index, number = grid.moves()[0]
+        child = grid.branch(index, number)
+        self.assertIsNone(grid[index])
+        self.assertEqual(child[index], number)
+        self.assertEqual(child.pending, [index])
+        self.assertEqual(grid.pending, [])
+
+    def test_conflict(self):
+        grid = SudokuGrid()
+        grid.analyze()
+        # Cells 0-7 of row 0 leave 9 as cell 8's only possible, so column 8 can't have it.
+        row = [(index, index + 1) for index in range(8)]
+        self.assertIsNone(grid.conflict(row + [(50, 5)]))
+        self.assertEqual(grid.conflict(row + [(50, 5), (80, 9)]), row + [(80, 9)])
+        self.assertEqual(grid.conflict([(0, 1), (50, 5), (1, 1)]), [(0, 1), (1, 1)])
+        self.assertEqual(grid.conflict([(0, 1), (50, 5), (0, 2)]), [(0, 1), (0, 2)])
+        self.assertEqual(grid.cells.tostring(), SudokuGrid().cells.tostring())
+
+    def test_min_remaining(self):
+        __, grid = _load(DEMO_BOARDS[3])
+        grid.analyze()
+        moves = grid.moves()
+        index = moves[0][0]
+        self.assertEqual(set(i for i, __ in moves), set([index]))
+        fewest = min(len(possibles) for __, possibles in grid.branch_cells())
+        self.assertEqual(len(moves), fewest)
+        self.assertEqual([number for __, number in moves], grid.possible_numbers(index))
+
+    def test_incremental_place(self):
+        __, grid = _load(DEMO_BOARDS[3])
+        grid.analyze()
+        child = grid.copy()
+        child.place(0, 3)
+        child.analyze()
+        expected = child.copy()
+        expected.analyze(incremental=False)
+        self.assertEqual(child, expected)
+        self.assertEqual(child.possibles, expected.possibles)
+
+    def test_incremental_place_invalid(self):
+        __, grid = _load(DEMO_BOARDS[3])
+        grid.analyze()
+        grid.place(0, 5)
+        with self.assertRaises(InvalidBoard):
+            grid.analyze()
+        __, grid = _load(DEMO_BOARDS[3])
+        grid.analyze()
+        grid.place(0, 3)
+        grid.place(1, 3)
+        with self.assertRaises(InvalidBoard):
+            grid.analyze()
@@ -0,0 +1,120 @@
+import random
+import unittest
+from sudoku.board import SudokuBoard, BoardParseError
+from sudoku.cell import BitmaskCell
+from sudoku.grid import SudokuGrid, PEERS, BOXES
+from sudoku.layout import get_layout, layout_for_cells, STANDARD
+from sudoku.puzzles import shuffled_solution
+from sudoku.solver import Solver
+
+
+def _keeps_clues(solution, puzzle):
+    return all(char == '.' or char == solution[index] for index, char in enumerate(puzzle))
+
+
+def _puzzle(box_size, emptied, seed=1234):
+    """
+    Returns a shuffled solution of a box size and a copy with a fraction of its cells emptied.
+    """
+    rng = random.Random(seed)
+    solution = shuffled_solution(box_size, rng)
+    cells = list(solution)
+    for index in rng.sample(range(len(cells)), int(len(cells) * emptied)):
+        cells[index] = '.'
+    return solution, ''.join(cells)
+
+
+class TestLayout(unittest.TestCase):
+
+    def test_tables(self):
+        self.assertEqual(STANDARD.boxes, BOXES)
+        self.assertEqual(STANDARD.peers, PEERS)
+        for box_size in (2, 3, 4, 5):
+            layout = get_layout(box_size)
+            size = box_size * box_size
+            self.assertEqual(layout.cell_count, size * size)
+            self.assertEqual(len(layout.houses), size * 3)
+            for house in layout.houses:
+                self.assertEqual(sorted(house), sorted(set(house)))
+                self.assertEqual(len(house), size)
+            for peers in layout.peers:
+                self.assertEqual(len(peers), 3 * (size - 1) - 2 * (box_size - 1))
+            self.assertEqual(sorted(layout.block_order), range(size * size))
+        self.assertIs(layout_for_cells(256), get_layout(4))
+        with self.assertRaises(ValueError):
+            layout_for_cells(100)
+
+    def test_wide_masks(self):
+        layout = get_layout(5)
+        self.assertGreaterEqual(SudokuGrid(box_size=5).possibles.itemsize, 4)
+        mask = layout.number_bits[25] | layout.number_bits[12]
+        self.assertEqual(layout.mask_numbers[mask], [12, 25])
+        self.assertEqual(layout.mask_counts[mask], 2)
+        self.assertIsNone(layout.mask_singles[mask])
+        self.assertEqual(layout.mask_singles[layout.number_bits[25]], 25)
+        cell = BitmaskCell(layout.numbers)
+        cell.eliminate_possibles(range(1, 25))
+        self.assertEqual(cell.single, 25)
+
+    def test_parse_tokens(self):
+        layout = get_layout(4)
+        self.assertEqual([layout.parse_number(token) for token in ('12', 'C', 'c', ' 7 ', '', '-', 0, 16)],
+                         [12, 12, 12, 7, 0, 0, 0, 16])
+        self.assertIsNone(layout.parse_number('17'))
+        self.assertIsNone(layout.parse_number('Z'))
+
+    def test_solve_sizes(self):
+        for box_size, emptied in ((2, 0.6), (3, 0.5), (4, 0.45), (5, 0.3)):
+            __, puzzle = _puzzle(box_size, emptied)
+            grid = SudokuGrid.from_string(puzzle)
+            self.assertIs(grid.layout, get_layout(box_size))
+            result = Solver().solve(grid)
+            self.assertTrue(result.solved)
+            self.assertTrue(result.board.solved())
+            self.assertTrue(_keeps_clues(result.board.to_string(), puzzle))
+            board = grid.to_board()
+            self.assertEqual(board.key(), grid.key())
+            self.assertEqual(SudokuGrid.from_board(board), grid)
+            result = Solver().solve(board)
+            self.assertTrue(result.solved)
+            self.assertTrue(result.board.solved())
+            self.assertTrue(_keeps_clues(SudokuGrid.from_board(result.board).to_string(), puzzle))
+
+    def test_csv_tokens(self):
+        __, puzzle = _puzzle(4, 0.5)
+        layout = get_layout(4)
+        rows = []
+        for row in layout.rows:
+            rows.append(','.join(str(layout.parse_number(puzzle[index])) if puzzle[index] != '.' else ''
+                                 for index in row))
+        csvstring = '\n'.join(rows)
+        grid = SudokuGrid()
+        grid.populate_from_csvstring(csvstring)
+        self.assertEqual(grid.to_string(), puzzle)
+        board = SudokuBoard(cell_class=BitmaskCell)
+        board.populate_from_csvstring(csvstring)
+        self.assertEqual(board.size, 16)
+        self.assertEqual(board.key(), grid.key())
+        brdstring = [puzzle[start:start + 16].replace('.', '-') for start in range(0, 256, 16)]
+        board = SudokuBoard()
+        board.populate_from_brdstring(brdstring)
+        self.assertEqual(board.key(), grid.key())
+        self.assertIs(board.layout, layout)
+        # The resized board still notices numbers set on its cells directly.
+        self.assertEqual(board.filled_count, 256 - puzzle.count('.'))
+        board[0][0].number = None if board[0][0].number else 1
+        self.assertNotEqual(board.key(), grid.key())
+        board.filled()
+        self.assertNotEqual(board.filled_count, 256 - puzzle.count('.'))
+        with self.assertRaises(BoardParseError):
+            SudokuGrid().populate_from_csvstring(csvstring.replace('', '17', 1))
+
+    def test_print(self):
+        __, puzzle = _puzzle(2, 0.5)
+        grid = SudokuGrid.from_string(puzzle)
+        self.assertEqual(repr(grid), repr(grid.to_board()))
+        self.assertEqual(repr(grid).split('\n')[2], '----+----')
+
+
+if __name__ == '__main__':
+    unittest.main()
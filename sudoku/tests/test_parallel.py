@@ -0,0 +1,67 @@
+import os
+import unittest
+from sudoku import parallel
+from sudoku.board import SudokuBoard
+from sudoku.grid import SudokuGrid
+from sudoku.parallel import ParallelSolver, WorkerError, expand_frontier
+from sudoku.puzzles import DEMO_BOARDS, NO_SOLUTION_BOARD
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.grids = []
+        for brdstring in DEMO_BOARDS:
+            grid = SudokuGrid()
+            grid.populate_from_brdstring(brdstring.split('\n'))
+            self.grids.append(grid)
+
+    def assertSolves(self, solution, board):
+        self.assertTrue(solution.solved())
+        for index, number in enumerate(bytearray(board.key())):
+            if number:
+                self.assertEqual(bytearray(solution.key())[index], number)
+
+    def test_expand_frontier(self):
+        grid = self.grids[5]
+        solution, frontier, nodes = expand_frontier(grid, 16)
+        self.assertIsNone(solution)
+        self.assertGreaterEqual(len(frontier), 16)
+        self.assertGreater(nodes, 0)
+        self.assertEqual(grid.key(), self.grids[5].key())
+        # An easy board is solved while expanding.
+        solution, frontier, nodes = expand_frontier(self.grids[0], 16)
+        self.assertSolves(solution, self.grids[0])
+        self.assertEqual(frontier, [])
+
+    def test_solve(self):
+        for engine in ('search', 'dlx'):
+            solver = ParallelSolver(workers=2, engine=engine)
+            for grid in self.grids[3:]:
+                result = solver.solve(grid)
+                self.assertTrue(result.solved)
+                self.assertSolves(result.board, grid)
+                self.assertGreater(result.nodes, 0)
+        result = ParallelSolver(workers=2).solve(self.grids[4].to_board())
+        self.assertIsInstance(result.board, SudokuBoard)
+        self.assertTrue(result.board.solved())
+
+    def test_no_solution(self):
+        result = ParallelSolver(workers=2, engine='dlx').solve(SudokuGrid.from_string(NO_SOLUTION_BOARD))
+        self.assertFalse(result.solved)
+        self.assertFalse(result.budget_exhausted)
+        result = ParallelSolver(workers=2, time_limit=0.1).solve(SudokuGrid.from_string(NO_SOLUTION_BOARD))
+        self.assertFalse(result.solved)
+        self.assertTrue(result.budget_exhausted)
+        self.assertLess(result.elapsed, 5)
+
+    def test_worker_dies(self):
+        # The workers are forked, so they search with the replaced function.
+        search_subtree = parallel._search_subtree
+        parallel._search_subtree = lambda task: os._exit(3)
+        try:
+            with self.assertRaises(WorkerError) as context:
+                ParallelSolver(workers=2).solve(SudokuGrid.from_string(NO_SOLUTION_BOARD))
+        finally:
+            parallel._search_subtree = search_subtree
+        self.assertIn('exited with code 3', str(context.exception))
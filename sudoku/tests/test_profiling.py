@@ -0,0 +1,80 @@
+import threading
+import unittest
+from sudoku.grid import SudokuGrid
+from sudoku.profiling import PhaseProfiler
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.rules import DeductionPipeline
+
+
+def _grid(brdstring):
+    grid = SudokuGrid()
+    grid.populate_from_brdstring(brdstring.split('\n'))
+    return grid
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_methods_restored(self):
+        analyze = SudokuGrid.__dict__['analyze']
+        with PhaseProfiler() as profiler:
+            self.assertTrue(profiler.enabled)
+            self.assertIsNot(SudokuGrid.__dict__['analyze'], analyze)
+            with self.assertRaises(RuntimeError):
+                PhaseProfiler().enable()
+        self.assertFalse(profiler.enabled)
+        self.assertIs(SudokuGrid.__dict__['analyze'], analyze)
+
+    def test_profile_solve(self):
+        profiler = PhaseProfiler()
+        result, summary = profiler.profile_solve(_grid(DEMO_BOARDS[3]))
+        self.assertFalse(profiler.enabled)
+        self.assertTrue(summary['solved'])
+        self.assertEqual(summary['phases']['SudokuGrid.analyze']['calls'], result.nodes)
+        # Branching is a phase of its own - the time of next_moves() covers its steps,
+        # each a branch() with its copy.
+        branching = summary['phases']['SudokuGrid.next_moves']
+        self.assertGreater(branching['calls'], 0)
+        self.assertEqual(summary['phases']['SudokuGrid.branch']['calls'], result.nodes - 1)
+        self.assertGreaterEqual(branching['seconds'], summary['phases']['SudokuGrid.branch']['seconds'])
+        result, summary = profiler.profile_solve(_grid(DEMO_BOARDS[3]).to_board())
+        self.assertEqual(summary['phases']['SudokuBoard.analyze']['calls'], result.nodes)
+        self.assertGreater(summary['phases']['SudokuBoard.next_moves']['calls'], 0)
+        self.assertNotIn('SudokuGrid.analyze', summary['phases'])
+        # The profiler's own counters cover both solves.
+        self.assertEqual(profiler.summary()['SudokuGrid.analyze']['calls'], result.nodes)
+        self.assertIn('SudokuBoard.set_possibles', profiler.report())
+
+    def test_rules(self):
+        profiler = PhaseProfiler()
+        __, summary = profiler.profile_solve(_grid(DEMO_BOARDS[3]), pipeline=DeductionPipeline())
+        self.assertIn('rule: naked singles', summary['phases'])
+        __, summary = PhaseProfiler(rules=False).profile_solve(_grid(DEMO_BOARDS[3]), pipeline=DeductionPipeline())
+        self.assertNotIn('rule: naked singles', summary['phases'])
+
+    def test_other_threads_not_counted(self):
+        grids = [_grid(DEMO_BOARDS[3]), _grid(DEMO_BOARDS[3])]
+        with PhaseProfiler() as profiler:
+            thread = threading.Thread(target=grids[0].analyze)
+            thread.start()
+            thread.join()
+            self.assertEqual(profiler.summary(), {})
+            grids[1].analyze()
+        self.assertEqual(profiler.summary()['SudokuGrid.analyze']['calls'], 1)
+
+    def test_profile_batch(self):
+        profiler = PhaseProfiler()
+        boards = [_grid(brdstring) for brdstring in DEMO_BOARDS[:4]]
+        with profiler:
+            profiler.reset()
+            results, summaries, batch = profiler.profile_batch(boards)
+            self.assertTrue(profiler.enabled)
+        self.assertEqual(batch['boards'], 4)
+        self.assertEqual(batch['nodes'], sum(result.nodes for result in results))
+        for phase, counters in batch['phases'].items():
+            self.assertEqual(counters['calls'], sum(summary['phases'].get(phase, {}).get('calls', 0)
+                                                    for summary in summaries))
+        self.assertEqual(profiler.summary()['SudokuGrid.analyze']['calls'], batch['nodes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from sudoku.board import InvalidBoard
+from sudoku.cell import numbers_to_mask
+from sudoku.grid import SudokuGrid, ROWS, BOXES
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.rules import (
+    DeductionPipeline, NakedSingles, HiddenSingles, NakedSubsets, HiddenSubsets, PointingPairs, BoxLineReduction
+)
+from sudoku.solver import Solver
+
+
+def _grid(brdstring):
+    grid = SudokuGrid()
+    grid.populate_from_brdstring(brdstring.split('\n'))
+    return grid
+
+
+def _empty_analyzed():
+    grid = SudokuGrid()
+    grid.analyze(pipeline=DeductionPipeline([]))
+    return grid
+
+
+class TestRules(unittest.TestCase):
+
+    def test_hidden_single(self):
+        grid = _empty_analyzed()
+        # 5 is only possible in the first cell of row 0.
+        for index in ROWS[0][1:]:
+            grid.eliminate(index, numbers_to_mask([5]))
+        self.assertEqual(HiddenSingles().apply(grid), 1)
+        self.assertEqual(grid[0], 5)
+
+    def test_naked_pair(self):
+        grid = _empty_analyzed()
+        pair = numbers_to_mask([1, 2])
+        grid.masks[0] = grid.masks[1] = pair
+        rule = NakedSubsets(2)
+        # Both numbers go from the 13 other cells of row 0 and box 0.
+        self.assertEqual(rule.apply(grid), 2 * 13)
+        self.assertEqual(grid.masks[8] & pair, 0)
+        self.assertEqual(grid.masks[18] & pair, 0)
+        self.assertEqual(grid.masks[0], pair)
+        self.assertEqual(rule.calls, 1)
+
+    def test_hidden_pair(self):
+        grid = _empty_analyzed()
+        # 1 and 2 are only possible in the first two cells of row 0.
+        for index in ROWS[0][2:]:
+            grid.eliminate(index, numbers_to_mask([1, 2]))
+        HiddenSubsets(2).apply(grid)
+        self.assertEqual(grid.masks[0], numbers_to_mask([1, 2]))
+        self.assertEqual(grid.masks[1], numbers_to_mask([1, 2]))
+
+    def test_pointing_pair(self):
+        grid = _empty_analyzed()
+        # Within box 0, 7 is only possible in row 0.
+        for index in BOXES[0][3:]:
+            grid.eliminate(index, numbers_to_mask([7]))
+        self.assertEqual(PointingPairs().apply(grid), 6)
+        for index in ROWS[0][3:]:
+            self.assertFalse(grid.masks[index] & numbers_to_mask([7]))
+
+    def test_box_line_reduction(self):
+        grid = _empty_analyzed()
+        # Within row 0, 7 is only possible in box 0.
+        for index in ROWS[0][3:]:
+            grid.eliminate(index, numbers_to_mask([7]))
+        self.assertEqual(BoxLineReduction().apply(grid), 6)
+        for index in BOXES[0][3:]:
+            self.assertFalse(grid.masks[index] & numbers_to_mask([7]))
+
+    def test_contradiction(self):
+        grid = _empty_analyzed()
+        for index in ROWS[0]:
+            grid.eliminate(index, numbers_to_mask([9]))
+        with self.assertRaises(InvalidBoard):
+            HiddenSingles().apply(grid)
+
+    def test_pipeline_solves_with_fewer_nodes(self):
+        pipeline = DeductionPipeline()
+        for brdstring in DEMO_BOARDS:
+            grid = _grid(brdstring)
+            plain = Solver().solve(grid)
+            deduced = Solver(pipeline=pipeline).solve(grid)
+            self.assertTrue(deduced.solved)
+            self.assertTrue(deduced.board.solved())
+            self.assertLessEqual(deduced.nodes, plain.nodes)
+        stats = dict((name, (calls, eliminations)) for name, calls, eliminations, __ in pipeline.stats())
+        self.assertGreater(stats['naked singles'][1], 0)
+        self.assertGreater(stats['hidden singles'][1], 0)
+
+    def test_pipeline_order(self):
+        pipeline = DeductionPipeline([HiddenSingles(), NakedSingles()])
+        grid = _grid(DEMO_BOARDS[0])
+        grid.analyze(pipeline=pipeline)
+        self.assertTrue(grid.solved())
+        self.assertEqual([name for name, __, __, __ in pipeline.stats()], ['hidden singles', 'naked singles'])
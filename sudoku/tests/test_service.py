@@ -0,0 +1,186 @@
+import json
+import os
+import Queue
+import socket
+import threading
+import time
+import unittest
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS, NO_SOLUTION_BOARD
+from sudoku import service as service_module
+from sudoku.service import SolvingService, SolvingServer, Submission
+
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        self.puzzles = []
+        for brdstring in DEMO_BOARDS:
+            grid = SudokuGrid()
+            grid.populate_from_brdstring(brdstring.split('\n'))
+            self.puzzles.append(grid.to_string())
+        self.service = SolvingService(workers=2)
+        self.server = SolvingServer(('127.0.0.1', 0), self.service)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.service.close()
+
+    def exchange(self, requests, count=None):
+        """
+        Send requests on one connection and return the responses by id.
+        """
+        connection = socket.create_connection(self.server.server_address, timeout=10)
+        try:
+            connection.sendall(''.join(json.dumps(request) + '\n' for request in requests))
+            connection.shutdown(socket.SHUT_WR)
+            lines = connection.makefile().read().splitlines()
+        finally:
+            connection.close()
+        return dict((response['id'], response) for response in map(json.loads, lines))
+
+    def test_solve(self):
+        responses = self.exchange([
+            {'id': board_num, 'puzzle': puzzle, 'engine': 'dlx' if board_num % 2 else 'search'}
+            for board_num, puzzle in enumerate(self.puzzles)
+        ])
+        self.assertEqual(sorted(responses), range(len(self.puzzles)))
+        for board_num, response in responses.items():
+            self.assertEqual(response['status'], 'solved')
+            self.assertTrue(SudokuGrid.from_string(response['solution']).solved())
+            self.assertGreater(response['nodes'], 0)
+            self.assertGreaterEqual(response['latency'], response['elapsed'])
+
+    def test_budgets(self):
+        responses = self.exchange([
+            {'id': 'nodes', 'puzzle': self.puzzles[5], 'max_nodes': 1},
+            {'id': 'timeout', 'puzzle': self.puzzles[5], 'timeout': 0},
+            {'id': 'unsolvable', 'puzzle': '11' + '.' * 79},
+        ])
+        self.assertEqual(responses['nodes']['status'], 'budget_exhausted')
+        self.assertEqual(responses['nodes']['nodes'], 1)
+        self.assertEqual(responses['timeout']['status'], 'timeout')
+        self.assertLess(responses['timeout']['latency'], 1)
+        self.assertEqual(responses['unsolvable']['status'], 'unsolvable')
+        self.assertIsNone(responses['unsolvable']['solution'])
+
+    def test_errors(self):
+        responses = self.exchange([
+            {'id': 1, 'puzzle': '123'},
+            {'id': 2, 'puzzle': self.puzzles[0], 'engine': 'guess'},
+            {'id': 3},
+            {'id': 4, 'puzzle': self.puzzles[0], 'timeout': 'soon'},
+        ])
+        for request_id in range(1, 5):
+            self.assertEqual(responses[request_id]['status'], 'error')
+            self.assertIn('error', responses[request_id])
+
+    def test_cancel(self):
+        # Hold the requests instead of solving them, then answer them after they are cancelled.
+        held = []
+        self.server.service = service = _HoldingService(held)
+        responses = self.exchange([
+            {'id': 'held', 'puzzle': self.puzzles[0]},
+            {'id': 'other', 'puzzle': self.puzzles[0]},
+            {'cancel': 'held'},
+            {'cancel': 'other'},
+        ])
+        self.assertEqual(len(held), 2)
+        self.assertEqual(responses['held']['status'], 'cancelled')
+        self.assertEqual(responses['other']['status'], 'cancelled')
+        self.assertEqual(service.cancelled, [0, 1])
+        # A late result of a cancelled request is dropped.
+        held[0]({'status': 'solved'})
+
+    def test_client_not_reading(self):
+        # Results handed over for a client which doesn't read its responses must not block
+        # the pool's result thread, which serves every connection.
+        held = []
+        self.server.service = _HoldingService(held)
+        connection = socket.create_connection(self.server.server_address, timeout=10)
+        try:
+            connection.sendall(''.join(
+                json.dumps({'id': request_num, 'puzzle': self.puzzles[0]}) + '\n' for request_num in range(20)
+            ))
+            start = time.time()
+            while len(held) < 20 and time.time() - start < 5:
+                time.sleep(0.01)
+            start = time.time()
+            for respond in held:
+                respond({'status': 'error', 'error': 'x' * 1000000})
+            self.assertLess(time.time() - start, 2)
+        finally:
+            connection.close()
+
+    def test_cancel_frees_worker(self):
+        service = SolvingService(workers=1, timeout=60)
+        try:
+            responses = Queue.Queue()
+            received = time.time()
+            # Four searches of about a second each, one running and three queued - cancelled,
+            # they give up the only worker at once.
+            tickets = [service.submit({'puzzle': NO_SOLUTION_BOARD}, received, responses.put).ticket
+                       for __ in range(4)]
+            time.sleep(0.1)
+            for ticket in tickets:
+                service.cancel(ticket)
+            service.submit({'puzzle': self.puzzles[0]}, received, responses.put)
+            statuses = [responses.get(timeout=10)['status'] for __ in range(5)]
+            self.assertLess(time.time() - received, 2)
+            self.assertEqual(statuses, ['cancelled'] * 4 + ['solved'])
+        finally:
+            service.close()
+
+    def test_queued_timeout(self):
+        # The only worker is busy with the first board - the second times out while queued.
+        self.server.service = service = SolvingService(workers=1)
+        try:
+            responses = self.exchange([
+                {'id': 'long', 'puzzle': NO_SOLUTION_BOARD, 'timeout': 5},
+                {'id': 'queued', 'puzzle': self.puzzles[0], 'timeout': 0.3},
+            ])
+        finally:
+            service.close()
+        self.assertEqual(responses['queued']['status'], 'timeout')
+        self.assertLess(responses['queued']['latency'], 0.9)
+        self.assertEqual(responses['long']['status'], 'unsolvable')
+
+    def test_worker_dies(self):
+        # The pool's worker is forked with a search which kills it - the request is never
+        # answered by the pool, and times out.
+        solve_string = service_module.solve_string
+        service_module.solve_string = lambda *args, **kwargs: os._exit(1)
+        try:
+            self.server.service = service = SolvingService(workers=1)
+        finally:
+            service_module.solve_string = solve_string
+        try:
+            responses = self.exchange([{'id': 1, 'puzzle': self.puzzles[0], 'timeout': 0.5}])
+        finally:
+            service.close()
+        self.assertEqual(responses[1]['status'], 'timeout')
+        self.assertLess(responses[1]['latency'], 2)
+
+
+class _HoldingService(object):
+
+    def __init__(self, held):
+        self.held = held
+        self.cancelled = []
+
+    def submit(self, request, received, respond):
+        self.held.append(respond)
+        return Submission(len(self.held) - 1, received + 60, _HeldResult())
+
+    def cancel(self, ticket):
+        self.cancelled.append(ticket)
+
+
+class _HeldResult(object):
+
+    def ready(self):
+        return False
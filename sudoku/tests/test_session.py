@@ -0,0 +1,81 @@
+import random
+import unittest
+from sudoku.engines import solve
+from sudoku.grid import SudokuGrid, PEERS
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.session import SolvingSession
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = SudokuGrid()
+        self.grid.populate_from_brdstring(DEMO_BOARDS[3].split('\n'))
+        self.session = SolvingSession(self.grid)
+        self.empty = [index for index, number in enumerate(self.grid.cells) if not number]
+
+    def assertCandidates(self, session):
+        # The incremental candidates match the ones computed from scratch.
+        for index in range(81):
+            if session.cells[index]:
+                self.assertIsNone(session.candidates(index))
+            else:
+                used = set(session.cells[peer] for peer in PEERS[index])
+                self.assertEqual(session.candidates(index), [n for n in range(1, 10) if n not in used])
+
+    def test_place_undo(self):
+        session = self.session
+        start = session.cells[:]
+        rng = random.Random(3)
+        moves = []
+        for index in rng.sample(self.empty, 20):
+            number = rng.randint(1, 9)
+            session.place(index, number)
+            moves.append((index, number))
+            self.assertCandidates(session)
+        self.assertEqual(len(session), 20)
+        while moves:
+            self.assertEqual(session.undo(), moves.pop())
+            self.assertCandidates(session)
+        self.assertIsNone(session.undo())
+        self.assertEqual(session.cells, start)
+        self.assertTrue(session.is_consistent())
+        with self.assertRaises(ValueError):
+            session.place(self.empty[0], 10)
+        with self.assertRaises(ValueError):
+            session.place(self.grid.cells.index(max(self.grid.cells)), 1)
+
+    def test_is_consistent(self):
+        session = self.session
+        index = self.empty[0]
+        peer = [peer for peer in PEERS[index] if session.cells[peer]][0]
+        session.place(index, session.cells[peer])
+        self.assertFalse(session.is_consistent())
+        session.undo()
+        self.assertTrue(session.is_consistent())
+        # A cell left without candidates.
+        session = SolvingSession(SudokuGrid.from_string('12345678' + '.' * 73))
+        self.assertTrue(session.is_consistent())
+        session.place(17, 9)
+        self.assertFalse(session.is_consistent())
+        self.assertIsNone(session.hint())
+        session.undo()
+        self.assertEqual(session.hint(), (8, 9))
+
+    def test_hint(self):
+        session = SolvingSession(self.grid.to_board())
+        solution = solve(self.grid.copy()).board
+        while True:
+            move = session.hint()
+            if move is None:
+                break
+            index, number = move
+            self.assertEqual(solution.cells[index], number)
+            session.place(index, number)
+        self.assertGreater(len(session), 0)
+        # The rest of the solution can be placed.
+        for index, number in enumerate(solution.cells):
+            if not session.cells[index]:
+                session.place(index, number)
+        self.assertTrue(session.solved())
+        self.assertEqual(session.to_grid(), solution)
@@ -0,0 +1,132 @@
+import unittest
+from sudoku.board import SudokuBoard
+from sudoku.cache import NogoodStore, TranspositionTable
+from sudoku.grid import SudokuGrid
+from sudoku.ordering import block_order, min_remaining
+from sudoku.puzzles import DEMO_BOARDS, HARD_BOARD
+from sudoku.solver import Solver, EventRecorder
+
+
+def _grid(brdstring):
+    grid = SudokuGrid()
+    grid.populate_from_brdstring(brdstring.split('\n'))
+    return grid
+
+
+class TestSolver(unittest.TestCase):
+
+    def assertSolves(self, puzzle, result):
+        self.assertTrue(result.solved)
+        self.assertFalse(result.budget_exhausted)
+        self.assertTrue(result.board.solved())
+        for index in range(81):
+            if puzzle[index] is not None:
+                self.assertEqual(result.board[index], puzzle[index])
+
+    def test_demo_boards(self):
+        for brdstring in DEMO_BOARDS:
+            grid = _grid(brdstring)
+            result = Solver().solve(grid)
+            self.assertSolves(grid, result)
+            self.assertGreater(result.nodes, 0)
+            # The passed-in board is not changed.
+            self.assertEqual(grid, _grid(brdstring))
+
+    def test_sudoku_board(self):
+        board = SudokuBoard()
+        board.populate_from_brdstring(DEMO_BOARDS[3].split('\n'))
+        result = Solver().solve(board)
+        self.assertTrue(result.solved)
+        self.assertTrue(result.board.solved())
+
+    def test_block_order_with_visited(self):
+        grid = _grid(DEMO_BOARDS[3])
+        visited = TranspositionTable()
+        result = Solver(ordering=block_order, visited=visited).solve(grid)
+        self.assertSolves(grid, result)
+
+    def test_no_solution(self):
+        # Row 0 needs a 1 in its first cell, which block 0 already has.
+        grid = _grid('-23456789\n1--------')
+        result = Solver().solve(grid)
+        self.assertFalse(result.solved)
+        self.assertFalse(result.budget_exhausted)
+        self.assertIsNone(result.board)
+
+    def test_node_budget(self):
+        result = Solver(max_nodes=3).solve(_grid(DEMO_BOARDS[5]))
+        self.assertFalse(result.solved)
+        self.assertTrue(result.budget_exhausted)
+        self.assertEqual(result.nodes, 3)
+
+    def test_time_budget(self):
+        result = Solver(time_limit=0).solve(_grid(DEMO_BOARDS[5]))
+        self.assertTrue(result.budget_exhausted)
+        self.assertEqual(result.nodes, 0)
+
+    def test_events(self):
+        grid = _grid(DEMO_BOARDS[3])
+        recorder = EventRecorder()
+        result = Solver(listeners=[recorder]).solve(grid)
+        events = [event for event, __, __ in recorder.events]
+        self.assertEqual(events.count('node_entered'), result.nodes)
+        self.assertEqual(events[0], 'node_entered')
+        self.assertEqual(events[-1], 'solved')
+        self.assertEqual(recorder.events[0][2], grid.key())
+        self.assertEqual(recorder.events[-1][2], result.board.key())
+        self.assertIn('contradiction', events)
+
+    def test_backtrack_events(self):
+        recorder = EventRecorder()
+        Solver(listeners=[recorder]).solve(_grid(DEMO_BOARDS[3]))
+        depths = [depth for event, depth, __ in recorder.events if event == 'backtrack']
+        self.assertTrue(depths)
+        # The starting board is never backtracked from when a solution is found.
+        self.assertNotIn(0, depths)
+
+    def test_solutions(self):
+        solution = Solver().solve(_grid(DEMO_BOARDS[0])).board.to_string()
+        # With its first three rows emptied, the board has 288 solutions.
+        puzzle = '.' * 27 + solution[27:]
+        for ordering in (min_remaining, block_order):
+            boards = Solver(ordering=ordering).solutions(SudokuGrid.from_string(puzzle))
+            solutions = [board.to_string() for board in boards]
+            self.assertEqual(len(solutions), 288)
+            self.assertEqual(len(set(solutions)), 288)
+            self.assertIn(solution, solutions)
+            for board in solutions:
+                self.assertTrue(SudokuGrid.from_string(board).solved())
+                self.assertEqual(board[27:], solution[27:])
+
+    def test_count_solutions(self):
+        solver = Solver()
+        self.assertEqual(solver.count_solutions(_grid(DEMO_BOARDS[3]), limit=2), 1)
+        self.assertEqual(solver.count_solutions(_grid('-23456789\n1--------')), 0)
+        self.assertEqual(solver.count_solutions(SudokuGrid(), limit=1000), 1000)
+        self.assertFalse(solver.budget_exhausted)
+        solver = Solver(max_nodes=10)
+        self.assertLess(solver.count_solutions(SudokuGrid(), limit=1000), 1000)
+        self.assertTrue(solver.budget_exhausted)
+        self.assertEqual(solver.nodes, 10)
+
+    def test_nogoods(self):
+        grid = SudokuGrid.from_string(HARD_BOARD)
+        plain = Solver().solve(grid)
+        nogoods = NogoodStore()
+        recorder = EventRecorder()
+        solver = Solver(nogoods=nogoods, listeners=[recorder])
+        result = solver.solve(grid)
+        self.assertSolves(grid, result)
+        self.assertEqual(result.board, plain.board)
+        self.assertGreater(nogoods.learned, 0)
+        self.assertGreater(solver.pruned, 0)
+        self.assertLess(result.nodes, plain.nodes)
+        events = [event for event, __, __ in recorder.events]
+        self.assertEqual(events.count('pruned'), solver.pruned)
+        # Pruning never loses a solution, on either board type.
+        board = SudokuBoard()
+        board.populate_from_brdstring(DEMO_BOARDS[3].split('\n'))
+        self.assertTrue(Solver(nogoods=NogoodStore()).solve(board).solved)
+        solution = plain.board.to_string()
+        puzzle = SudokuGrid.from_string('.' * 27 + solution[27:])
+        self.assertEqual(Solver(nogoods=NogoodStore()).count_solutions(puzzle), Solver().count_solutions(puzzle))
@@ -0,0 +1,96 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.store import PuzzleStore, StoreError, write_store, convert_files, solve_store, pack_key, unpack_key
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.puzzles = []
+        for brdstring in DEMO_BOARDS[:4]:
+            grid = SudokuGrid()
+            grid.populate_from_brdstring(brdstring.split('\n'))
+            self.puzzles.append(grid.to_string())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def test_pack(self):
+        for puzzle in self.puzzles:
+            key = SudokuGrid.from_string(puzzle).key()
+            self.assertEqual(len(pack_key(key)), 41)
+            self.assertEqual(unpack_key(pack_key(key)), key)
+
+    def test_random_access(self):
+        for packed in (False, True):
+            filename = self.path('boards.sdk')
+            self.assertEqual(write_store(filename, self.puzzles, packed=packed), 4)
+            self.assertEqual(os.path.getsize(filename), 24 + 4 * (41 if packed else 81) + 4 * 8)
+            with PuzzleStore(filename) as store:
+                self.assertEqual(len(store), 4)
+                self.assertEqual(store.packed, packed)
+                for board_num in (2, 0, 3, 1):
+                    self.assertEqual(store.string(board_num), self.puzzles[board_num])
+                    self.assertEqual(store[board_num], SudokuGrid.from_string(self.puzzles[board_num]))
+                self.assertEqual([grid.to_string() for grid in store], self.puzzles)
+                with self.assertRaises(IndexError):
+                    store.record(4)
+
+    def test_not_a_store(self):
+        filename = self.path('boards.txt')
+        with open(filename, 'w') as outfile:
+            outfile.write('\n'.join(self.puzzles))
+        with self.assertRaises(StoreError):
+            PuzzleStore(filename)
+
+    def test_truncated(self):
+        filename = self.path('boards.sdk')
+        write_store(filename, self.puzzles)
+        with open(filename, 'rb') as infile:
+            data = infile.read()
+        # Empty, a part of the header, and the index cut off.
+        for size in (0, 10, len(data) - 8):
+            with open(filename, 'wb') as outfile:
+                outfile.write(data[:size])
+            with self.assertRaises(StoreError):
+                PuzzleStore(filename)
+        # A record offset past the end of the file.
+        with open(filename, 'wb') as outfile:
+            outfile.write(data[:-8] + struct.pack('<Q', len(data)))
+        with PuzzleStore(filename) as store:
+            self.assertEqual(store.string(0), self.puzzles[0])
+            with self.assertRaises(StoreError):
+                store.record(3)
+
+    def test_convert(self):
+        brdfile = self.path('board.brd')
+        with open(brdfile, 'w') as outfile:
+            outfile.write(DEMO_BOARDS[0])
+        linefile = self.path('puzzles.txt')
+        with open(linefile, 'w') as outfile:
+            outfile.write('\n'.join(self.puzzles[1:]))
+        self.assertEqual(convert_files([brdfile, linefile], self.path('boards.sdk'), packed=True), 4)
+        with PuzzleStore(self.path('boards.sdk')) as store:
+            self.assertEqual([store.string(board_num) for board_num in range(len(store))], self.puzzles)
+
+    def test_solve_store(self):
+        filename = self.path('boards.sdk')
+        write_store(filename, self.puzzles)
+        results = list(solve_store(filename, workers=2, chunksize=3))
+        self.assertEqual([result.index for result in results], range(4))
+        self.assertEqual([result.puzzle for result in results], self.puzzles)
+        for result in results:
+            self.assertTrue(SudokuGrid.from_string(result.solution).solved())
+
+
+if __name__ == '__main__':
+    unittest.main()
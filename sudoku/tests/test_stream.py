@@ -0,0 +1,52 @@
+import unittest
+from StringIO import StringIO
+from sudoku.board import BoardParseError
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS
+from sudoku.solver import Solver
+from sudoku.stream import read_puzzles, write_solutions, solve_file
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self):
+        self.puzzles = []
+        for brdstring in DEMO_BOARDS[:4]:
+            grid = SudokuGrid()
+            grid.populate_from_brdstring(brdstring.split('\n'))
+            self.puzzles.append(grid.to_string())
+
+    def test_read(self):
+        lines = ['# A comment', self.puzzles[0], '', self.puzzles[1].replace('.', '0'), self.puzzles[2].replace('.', '-')]
+        puzzles = list(read_puzzles(StringIO('\n'.join(lines) + '\n')))
+        self.assertEqual(len(puzzles), 3)
+        self.assertEqual([SudokuGrid.from_string(puzzle).to_string() for puzzle in puzzles], self.puzzles[:3])
+
+    def test_read_is_lazy(self):
+        infile = StringIO('\n'.join(self.puzzles + ['too short']))
+        puzzles = read_puzzles(infile)
+        self.assertEqual(next(puzzles), self.puzzles[0])
+        with self.assertRaises(BoardParseError):
+            list(puzzles)
+
+    def test_read_invalid_value(self):
+        puzzles = read_puzzles(StringIO('\n'.join([self.puzzles[0], '# A comment', 'x' * 81])))
+        self.assertEqual(next(puzzles), self.puzzles[0])
+        with self.assertRaises(BoardParseError) as context:
+            next(puzzles)
+        self.assertTrue(str(context.exception).startswith("Line 3 has an invalid value 'x' in cell 0."))
+
+    def test_write(self):
+        outfile = StringIO()
+        grid = SudokuGrid.from_string(self.puzzles[0])
+        self.assertEqual(write_solutions(outfile, [self.puzzles[1], grid, None, grid.to_board()]), 4)
+        self.assertEqual(outfile.getvalue().split('\n'), [self.puzzles[1], self.puzzles[0], '', self.puzzles[0], ''])
+
+    def test_solve_file(self):
+        outfile = StringIO()
+        solved = solve_file(StringIO('\n'.join(self.puzzles)), outfile, workers=2, chunksize=1)
+        self.assertEqual(solved, len(self.puzzles))
+        solutions = outfile.getvalue().split()
+        for puzzle, solution in zip(self.puzzles, solutions):
+            expected = Solver().solve(SudokuGrid.from_string(puzzle)).board.to_string()
+            self.assertEqual(solution, expected)
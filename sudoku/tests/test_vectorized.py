@@ -0,0 +1,111 @@
+import unittest
+from sudoku import vectorized
+from sudoku.board import InvalidBoard
+from sudoku.grid import SudokuGrid
+from sudoku.puzzles import DEMO_BOARDS, SOLUTIONS, corpus
+from sudoku.solver import Solver
+from sudoku.vectorized import HAVE_NUMPY, analyze_grids, solve_vectorized
+
+if HAVE_NUMPY:
+    from sudoku.vectorized import to_array, analyze_array
+
+
+def _corpus():
+    return [SudokuGrid.from_string(puzzle) for puzzle in corpus()]
+
+
+def _demo_puzzles():
+    puzzles = []
+    for brdstring in DEMO_BOARDS:
+        grid = SudokuGrid()
+        grid.populate_from_brdstring(brdstring.split('\n'))
+        puzzles.append(grid.to_string())
+    return puzzles
+
+
+@unittest.skipUnless(HAVE_NUMPY, "NumPy is not installed")
+class TestVectorized(unittest.TestCase):
+
+    def test_to_array(self):
+        grids = _corpus()[:5]
+        cells = to_array(grids)
+        self.assertEqual(cells.shape, (5, 81))
+        self.assertEqual([row.tostring() for row in cells], [grid.key() for grid in grids])
+
+    def test_same_as_analyze(self):
+        corpus = _corpus()
+        cells, possibles, dead = analyze_array(to_array(corpus))
+        for board_num, grid in enumerate(corpus):
+            expected = grid.copy()
+            try:
+                expected.analyze(incremental=False)
+            except InvalidBoard:
+                self.assertTrue(dead[board_num])
+                continue
+            if any(not expected.cells[index] and not expected.possibles[index] for index in range(81)):
+                self.assertTrue(dead[board_num])
+                continue
+            self.assertFalse(dead[board_num])
+            self.assertEqual(cells[board_num].tolist(), expected.cells.tolist())
+            self.assertEqual(possibles[board_num].tolist(), expected.possibles.tolist())
+
+    def test_analyze_grids(self):
+        grids = analyze_grids(['11' + '.' * 79, SOLUTIONS[0].replace('4', '.')])
+        self.assertIsNone(grids[0])
+        self.assertEqual(grids[1].to_string(), SOLUTIONS[0])
+
+    def test_solve_vectorized(self):
+        puzzles = _demo_puzzles()
+        puzzles.append(SOLUTIONS[1].replace('7', '.'))
+        results = list(solve_vectorized(puzzles, block_size=3))
+        self.assertEqual([result.index for result in results], range(len(puzzles)))
+        self.assertEqual([result.puzzle for result in results], puzzles)
+        self.assertEqual(results[-1].solution, SOLUTIONS[1])
+        self.assertEqual(results[-1].nodes, 1)
+        for puzzle, result in zip(puzzles, results):
+            expected = Solver().solve(SudokuGrid.from_string(puzzle))
+            self.assertEqual(result.solution, expected.board.to_string() if expected.solved else None)
+
+
+class TestWithoutNumpy(unittest.TestCase):
+
+    def setUp(self):
+        self.have_numpy = vectorized.HAVE_NUMPY
+        vectorized.HAVE_NUMPY = False
+
+    def tearDown(self):
+        vectorized.HAVE_NUMPY = self.have_numpy
+
+    def test_analyze_grids(self):
+        corpus = _corpus()
+        for grid, analyzed in zip(corpus, analyze_grids(corpus)):
+            board = grid.to_board()
+            try:
+                board.analyze()
+            except InvalidBoard:
+                self.assertIsNone(analyzed)
+                continue
+            if any(cell.empty and not cell.possibles for block in board.blocks for cell in block.cells):
+                self.assertIsNone(analyzed)
+                continue
+            self.assertEqual(analyzed.to_board(), board)
+            for block_num, block in enumerate(board.blocks):
+                for cell_num, cell in enumerate(block.cells):
+                    if cell.empty:
+                        index = grid.layout.boxes[block_num][cell_num]
+                        self.assertEqual(analyzed.possible_numbers(index), cell.possibles)
+
+    def test_solve_vectorized(self):
+        puzzles = _demo_puzzles() + [SOLUTIONS[1].replace('7', '.'), '11' + '.' * 79]
+        results = list(solve_vectorized(puzzles, block_size=3))
+        self.assertEqual([result.index for result in results], range(len(puzzles)))
+        self.assertEqual(results[-2].solution, SOLUTIONS[1])
+        self.assertEqual(results[-2].nodes, 1)
+        self.assertIsNone(results[-1].solution)
+        for puzzle, result in zip(puzzles, results):
+            expected = Solver().solve(SudokuGrid.from_string(puzzle))
+            self.assertEqual(result.solution, expected.board.to_string() if expected.solved else None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Analysis of many boards at once with NumPy - an optional backend for bulk work.
+
+Boards are held as an (N, 81) uint8 array of cell numbers in row-major order, with 0
+for an empty cell. analyze_array() runs the SudokuBoard.analyze rules on all of them
+together: house contents come from a (27, 81) membership matrix, the naked subset
+rule runs on all the boxes, then all the rows, then all the columns of every board,
+and obvious numbers are set in rounds until no board changes. Only the boards left
+unresolved need a per-board search - see solve_vectorized().
+
+NumPy is optional - HAVE_NUMPY is False when it is not installed. analyze_grids() and
+solve_vectorized() then analyze the boards one by one with SudokuGrid.analyze, which
+gives the same results more slowly. to_array() and analyze_array() need NumPy.
+"""
+
+from array import array
+from itertools import islice
+from timeit import default_timer
+
+try:
+    import numpy
+    HAVE_NUMPY = True
+except ImportError:
+    numpy = None
+    HAVE_NUMPY = False
+
+from batch import BatchResult, to_string, solve_string, solve_batch
+from board import InvalidBoard
+from cell import NUMBER_BITS, MASK_COUNTS, MASK_SINGLES
+from grid import SudokuGrid, BOXES, ROWS, COLS, HOUSES, CELL_ROW, CELL_COL, CELL_BOX
+
+
+if HAVE_NUMPY:
+    # MEMBERSHIP[house, index] is 1 if the cell is in the house - houses ordered as HOUSES.
+    MEMBERSHIP = numpy.zeros((27, 81), dtype=numpy.uint8)
+    for _house_num, _house in enumerate(HOUSES):
+        MEMBERSHIP[_house_num, list(_house)] = 1
+    # The three houses of each cell.
+    CELL_HOUSES = numpy.array([(CELL_BOX[index], 9 + CELL_ROW[index], 18 + CELL_COL[index]) for index in range(81)])
+    # The cell indexes of each house type, in the order the naked subset rule walks them.
+    HOUSE_TYPES = [numpy.array(houses) for houses in (BOXES, ROWS, COLS)]
+    # The bit of each number, for packing (N, 81, 9) booleans into (N, 81) masks.
+    BIT_VALUES = numpy.array(NUMBER_BITS[1:], dtype=numpy.uint16)
+    MASK_COUNT_TABLE = numpy.array(MASK_COUNTS, dtype=numpy.uint8)
+    MASK_SINGLE_TABLE = numpy.array([number or 0 for number in MASK_SINGLES], dtype=numpy.uint8)
+
+
+def _require_numpy():
+    if not HAVE_NUMPY:
+        raise ImportError("The vectorized backend needs NumPy.")
+
+
+def to_array(boards):
+    """
+    Returns an (N, 81) uint8 array of the numbers of boards (strings, SudokuGrids or SudokuBoards).
+    """
+    _require_numpy()
+    keys = [SudokuGrid.from_string(to_string(board)).key() for board in boards]
+    if any(len(key) != 81 for key in keys):
+        raise ValueError("The vectorized backend only analyzes 9x9 boards.")
+    keys = ''.join(keys)
+    return numpy.frombuffer(keys, dtype=numpy.uint8).reshape(-1, 81).copy()
+
+
+def _house_counts(cells):
+    """
+    Returns an (N, 27, 9) array of the number of times each number appears in each house.
+    """
+    numbers = (cells[:, :, None] == numpy.arange(1, 10, dtype=numpy.uint8)).astype(numpy.uint8)
+    return numpy.matmul(MEMBERSHIP, numbers)
+
+
+def _basic_possibles(cells, counts):
+    """
+    Returns an (N, 81) array of the numbers not set in any house of each empty cell, as bitmasks.
+    """
+    taken = (counts > 0)[:, CELL_HOUSES].any(axis=2)
+    masks = numpy.dot(~taken, BIT_VALUES).astype(numpy.uint16)
+    masks[cells != 0] = 0
+    return masks
+
+
+def _eliminate_naked_subsets(cells, possibles):
+    """
+    The naked subset rule of SudokuBoard.set_possibles, on every board at once.
+    The houses of one type never share a cell, so all of them are done together -
+    boxes first, then rows, then columns, as SudokuBoard does.
+    """
+    for houses in HOUSE_TYPES:
+        masks = possibles[:, houses]
+        empty = cells[:, houses] == 0
+        # same[n, house, i, j] - cells i and j of the house are empty with the same possibles.
+        same = (masks[:, :, :, None] == masks[:, :, None, :]) & empty[:, :, :, None] & empty[:, :, None, :]
+        naked = empty & (same.sum(axis=3) == MASK_COUNT_TABLE[masks])
+        # Each naked subset's numbers are eliminated from the cells with different possibles.
+        eliminate = numpy.where(
+            naked[:, :, None, :] & (masks[:, :, None, :] != masks[:, :, :, None]), masks[:, :, None, :], 0
+        )
+        eliminate = numpy.bitwise_or.reduce(eliminate, axis=3).astype(numpy.uint16)
+        possibles[:, houses] = numpy.where(empty, masks & ~eliminate, masks)
+
+
+def analyze_array(cells):
+    """
+    Analyze each board of an (N, 81) array of numbers as SudokuBoard.analyze does.
+    Returns a tuple of:
+    - the (N, 81) numbers after setting the obvious ones,
+    - the (N, 81) possibles of each cell as bitmasks (0 for a filled cell),
+    - an (N,) boolean array of the dead boards - those with a duplicate number in a house
+      or an empty cell without any possible number. Their numbers and possibles are
+      left as they were when that was found.
+    The passed-in array is not changed.
+    """
+    _require_numpy()
+    cells = numpy.array(cells, dtype=numpy.uint8).reshape(-1, 81)
+    possibles = numpy.zeros(cells.shape, dtype=numpy.uint16)
+    dead = numpy.zeros(len(cells), dtype=bool)
+    # The boards still changing - each round analyzes only these.
+    active = numpy.arange(len(cells))
+    while len(active):
+        round_cells = cells[active]
+        counts = _house_counts(round_cells)
+        invalid = (counts > 1).any(axis=(1, 2))
+        round_possibles = _basic_possibles(round_cells, counts)
+        _eliminate_naked_subsets(round_cells, round_possibles)
+        empty = round_cells == 0
+        invalid |= (empty & (round_possibles == 0)).any(axis=1)
+        obvious = empty & (MASK_COUNT_TABLE[round_possibles] == 1) & ~invalid[:, None]
+        round_cells[obvious] = MASK_SINGLE_TABLE[round_possibles[obvious]]
+        round_possibles[obvious] = 0
+        cells[active] = round_cells
+        possibles[active] = round_possibles
+        dead[active[invalid]] = True
+        active = active[obvious.any(axis=1)]
+    return cells, possibles, dead
+
+
+def _analyze_grid(board):
+    """
+    Analyze one board (a string, SudokuGrid or SudokuBoard) as analyze_array() does,
+    without NumPy. Returns the analyzed SudokuGrid - or None if the board is dead.
+    """
+    grid = SudokuGrid.from_string(to_string(board))
+    if grid.layout.cell_count != 81:
+        raise ValueError("The vectorized backend only analyzes 9x9 boards.")
+    try:
+        grid.analyze(incremental=False)
+    except InvalidBoard:
+        return None
+    if any(not grid.cells[index] and not grid.possibles[index] for index in range(81)):
+        return None
+    return grid
+
+
+def _analyze_keys(puzzles):
+    """
+    Analyze boards given as strings and return the key of each analyzed board - None
+    for each dead board.
+    """
+    if not HAVE_NUMPY:
+        return [grid and grid.key() for grid in map(_analyze_grid, puzzles)]
+    cells, __, dead = analyze_array(to_array(puzzles))
+    return [None if dead[board_num] else cells[board_num].tostring() for board_num in range(len(puzzles))]
+
+
+def analyze_grids(boards):
+    """
+    Analyze boards (strings, SudokuGrids or SudokuBoards) together and return them as
+    analyzed SudokuGrids - None for each dead board.
+    """
+    if not HAVE_NUMPY:
+        return map(_analyze_grid, boards)
+    cells, possibles, dead = analyze_array(to_array(boards))
+    grids = []
+    for board_num in range(len(cells)):
+        if dead[board_num]:
+            grids.append(None)
+            continue
+        grid = SudokuGrid.from_key(cells[board_num].tostring())
+        grid.possibles = array('H', possibles[board_num].tolist())
+        grids.append(grid)
+    return grids
+
+
+def solve_vectorized(boards, workers=1, chunksize=16, block_size=4096, **options):
+    """
+    Solve boards (strings, SudokuGrids or SudokuBoards) and return an iterator of BatchResults,
+    in the same order as the boards.
+
+    Boards are analyzed block_size at a time with analyze_array() - one by one without
+    NumPy. Boards solved or found dead by the analysis get a result with one node, and
+    the analysis time is shared between the boards of the block. The rest are searched
+    one by one - in this process if workers is 1, otherwise with solve_batch() - with
+    the options passed to make_solver().
+    """
+    boards = iter(boards)
+    first_index = 0
+    while True:
+        puzzles = [to_string(board) for board in islice(boards, block_size)]
+        if not puzzles:
+            break
+        start = default_timer()
+        keys = _analyze_keys(puzzles)
+        share = (default_timer() - start) / len(puzzles)
+
+        unresolved = [board_num for board_num, key in enumerate(keys) if key is not None and '\x00' in key]
+        partial = [SudokuGrid.from_key(keys[board_num]).to_string() for board_num in unresolved]
+        if workers == 1:
+            searched = (solve_string(puzzle, **options) for puzzle in partial)
+        else:
+            searched = solve_batch(partial, workers=workers, chunksize=chunksize, **options)
+        searched = dict(zip(unresolved, searched))
+
+        for board_num, puzzle in enumerate(puzzles):
+            index = first_index + board_num
+            if board_num in searched:
+                result = searched[board_num]
+                yield result._replace(index=index, puzzle=puzzle, elapsed=result.elapsed + share)
+            elif keys[board_num] is None:
+                yield BatchResult(index, puzzle, None, 1, share, False)
+            else:
+                solution = SudokuGrid.from_key(keys[board_num]).to_string()
+                yield BatchResult(index, puzzle, solution, 1, share, False)
+        first_index += len(puzzles)
+